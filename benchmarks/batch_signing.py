@@ -0,0 +1,48 @@
+"""Throughput of utils.sign_many with a growing number of worker processes."""
+
+import os
+import time
+
+from eospyo import utils
+
+KEY = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+ITEMS = 2000
+BATCH = 100
+
+
+def main():
+    bytes_list = [i.to_bytes(4, "big") for i in range(ITEMS)]
+    batches = [
+        [i.to_bytes(4, "big") for i in range(first, first + BATCH)]
+        for first in range(0, ITEMS, BATCH)
+    ]
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        utils.sign_many(bytes_list=bytes_list, key=KEY, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:3d} workers: {ITEMS / elapsed:8.1f} signatures/s")
+
+        start = time.perf_counter()
+        for batch in batches:
+            utils.sign_many(bytes_list=batch, key=KEY, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(
+            f"    batches of {BATCH}, new pool: {ITEMS / elapsed:8.1f} sig/s"
+        )
+
+        start = time.perf_counter()
+        with utils.SignerPool(KEY, workers=workers) as pool:
+            for batch in batches:
+                pool.sign_many(batch)
+        elapsed = time.perf_counter() - start
+        print(
+            f"    batches of {BATCH}, SignerPool: {ITEMS / elapsed:8.1f} sig/s"
+        )
+        workers *= 2
+
+
+# worker processes import this module again under the spawn start method
+if __name__ == "__main__":
+    main()
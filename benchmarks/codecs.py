@@ -0,0 +1,75 @@
+"""Base58 / base256 codecs in utils against the previous implementation."""
+
+import timeit
+
+from eospyo import utils
+
+NUMBER = 20000
+WIF = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+
+
+def legacy_encode(val, base, minlen=0):
+    code_string = utils.CODE_STRINGS[base]
+    result_bytes = bytes()
+    while val > 0:
+        curcode = code_string[val % base]
+        result_bytes = bytes([ord(curcode)]) + result_bytes
+        val //= base
+    pad_size = minlen - len(result_bytes)
+    if base == 256:
+        padding_element = b"\x00"
+    elif base == 58:
+        padding_element = b"1"
+    else:
+        padding_element = b"0"
+    if pad_size > 0:
+        result_bytes = padding_element * pad_size + result_bytes
+    result_string = "".join([chr(y) for y in result_bytes])
+    return result_bytes if base == 256 else result_string
+
+
+def legacy_decode(string, base):
+    code_string = utils.CODE_STRINGS[base]
+    result = 0
+    while len(string) > 0:
+        result *= base
+        if base == 256:
+            result += string[0]
+        else:
+            d = string[0]
+            result += code_string.find(d if isinstance(d, str) else chr(d))
+        string = string[1:]
+    return result
+
+
+secret = utils._b58check_to_bin(WIF)
+value = utils._decode(secret, 256)
+
+cases = [
+    (
+        "decode base58",
+        lambda: legacy_decode(WIF, 58),
+        lambda: utils._decode(WIF, 58),
+    ),
+    (
+        "decode base256",
+        lambda: legacy_decode(secret, 256),
+        lambda: utils._decode(secret, 256),
+    ),
+    (
+        "encode base58",
+        lambda: legacy_encode(value, 58),
+        lambda: utils._encode(value, 58),
+    ),
+    (
+        "encode base256",
+        lambda: legacy_encode(value, 256, 32),
+        lambda: utils._encode(value, 256, 32),
+    ),
+]
+
+for name, legacy, current in cases:
+    assert legacy() == current()
+    before = timeit.timeit(legacy, number=NUMBER) / NUMBER * 1e6
+    after = timeit.timeit(current, number=NUMBER) / NUMBER * 1e6
+    print(f"{name:15s} {before:7.2f} us -> {after:6.2f} us")
@@ -0,0 +1,65 @@
+"""Transactions packed per second."""
+
+import datetime as dt
+import timeit
+
+import eospyo
+
+NUMBER = 2000
+
+net = eospyo.Local()
+data = [
+    eospyo.Data(name="from", value=eospyo.types.Name("user2")),
+    eospyo.Data(name="memo", value=eospyo.types.String("x" * 1000)),
+]
+action = eospyo.LinkedAction(
+    net=net,
+    account="user2",
+    name="sendmsg",
+    data=data,
+    authorization=[eospyo.Authorization(actor="user2", permission="active")],
+)
+trans = eospyo.LinkedTransaction(
+    actions=[action],
+    net=net,
+    chain_id="00" * 32,
+    ref_block_num=1,
+    ref_block_prefix=1,
+    expiration=dt.datetime(2021, 8, 30, 13, 3, 31),
+)
+
+# packed bytes are cached on the transaction: each copy is packed anew
+seconds = timeit.timeit(lambda: bytes(trans.copy(update={})), number=NUMBER)
+print(f"{NUMBER / seconds:.0f} transactions with 1 KB of data copied+packed/s")
+seconds = timeit.timeit(lambda: bytes(trans), number=NUMBER)
+print(f"{NUMBER / seconds:.0f} cached packed bytes returned/s")
+
+packed_data = b"".join(bytes(d) for d in data)
+packed_trans = trans.copy(
+    update={"actions": [action.copy(update={"data": packed_data})]}
+)
+seconds = timeit.timeit(
+    lambda: bytes(packed_trans.copy(update={})), number=NUMBER
+)
+print(f"{NUMBER / seconds:.0f} with 1 KB of pre-packed data copied+packed/s")
+
+net.use_tapos_cache().update(
+    {"chain_id": "00" * 32, "last_irreversible_block_id": "00" * 32}
+)
+raw_trans = eospyo.Transaction(
+    actions=[
+        eospyo.Action(
+            account="user2",
+            name="sendmsg",
+            data=packed_data,
+            authorization=action.authorization,
+        )
+    ]
+)
+template = eospyo.TransactionTemplate(raw_trans)
+seconds = timeit.timeit(lambda: bytes(raw_trans.link(net=net)), number=NUMBER)
+print(f"{NUMBER / seconds:.0f} transactions linked and packed/s")
+seconds = timeit.timeit(
+    lambda: bytes(template.link(net=net, data=[packed_data])), number=NUMBER
+)
+print(f"{NUMBER / seconds:.0f} from a template/s")
@@ -0,0 +1,30 @@
+"""Signatures per second with the generic and the fixed-base multiplication."""
+
+import timeit
+
+from eospyo import utils
+
+KEY = utils.PrivateKey("5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3")
+NUMBER = 200
+
+
+def sign():
+    utils.sign_bytes(bytes_=b"eospyo benchmark", key=KEY)
+
+
+def signatures_per_second():
+    sign()  # warm up, builds the G table on the first call
+    elapsed = timeit.timeit(sign, number=NUMBER)
+    return NUMBER / elapsed
+
+
+fixed_base = utils._fixed_base_multiply
+after = signatures_per_second()
+
+utils._fixed_base_multiply = lambda k: utils._fast_multiply(utils.G, k)
+before = signatures_per_second()
+utils._fixed_base_multiply = fixed_base
+
+print(f"double-and-add: {before:8.1f} signatures/s")
+print(f"fixed-base:     {after:8.1f} signatures/s")
+print(f"speedup:        {after / before:8.2f}x")
@@ -0,0 +1,34 @@
+"""Objects created per second with and without validation."""
+
+import timeit
+
+from eospyo import types
+
+NUMBER = 20000
+
+cases = [
+    (types.Name, "eosio.token"),
+    (types.Uint64, 2**63),
+    (types.Asset, "1.00000000 WAX"),
+    (types.String, "hello"),
+]
+
+for type_, value in cases:
+    validated = timeit.timeit(lambda: type_(value), number=NUMBER)
+    trusted = timeit.timeit(lambda: type_.trusted(value), number=NUMBER)
+    print(
+        f"{type_.__name__:8s} {NUMBER / validated:10.0f} validated/s "
+        f"{NUMBER / trusted:10.0f} trusted/s"
+    )
+
+values = [b"\x01"] * 1000
+validated = timeit.timeit(
+    lambda: types.Array(type_=types.Bytes, values=values), number=20
+)
+trusted = timeit.timeit(
+    lambda: types.Array.of_trusted(types.Bytes, values), number=20
+)
+print(
+    f"Array of 1000 Bytes {20 / validated:8.0f} validated/s "
+    f"{20 / trusted:8.0f} trusted/s"
+)
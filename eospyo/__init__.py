@@ -1,6 +1,6 @@
 import logging
 
-from . import exc, types
+from . import abi, cache, exc, ship, stream, types, utils
 from ._version import DEPRECATION_WARNING, __version__
 from .net import *  # NOQA: F403
 from .transaction import *  # NOQA: F403
@@ -0,0 +1,427 @@
+"""
+Contract ABI compiled to local serializers and deserializers.
+
+Nodeos abi serializer reference:
+https://developers.eos.io/manuals/eos/latest/nodeos/plugins/chain_api_plugin/api-reference/index#operation/abi_json_to_bin
+"""
+
+import json
+import pathlib
+import typing
+
+from . import types
+
+# abi builtin type names that are not the lowercase name of a types class
+_BUILTIN_TYPES = {
+    "time_point_sec": types.UnixTimestamp,
+    "time_point": types.TimePoint,
+    "symbol_code": types.SymbolCode,
+    "block_timestamp_type": types.BlockTimestamp,
+    "public_key": types.PublicKey,
+    "signature": types.Signature,
+}
+
+# abi builtin types serialized as structs
+_BUILTIN_STRUCTS = {
+    "extended_asset": {
+        "name": "extended_asset",
+        "base": "",
+        "fields": [
+            {"name": "quantity", "type": "asset"},
+            {"name": "contract", "type": "name"},
+        ],
+    },
+}
+
+# values of these types are converted to what nodeos returns in json
+_TO_PLAIN = {
+    types.UnixTimestamp: lambda v: v.isoformat(),
+    types.TimePoint: lambda v: v.isoformat(timespec="milliseconds"),
+    types.BlockTimestamp: lambda v: v.isoformat(timespec="milliseconds"),
+}
+
+
+class Abi:
+    """
+    A contract ABI, compiled once into one serializer per type.
+
+    Accepts the dict returned by Net.get_abi or the content of a .abi file.
+
+    abi = Abi(net.get_abi(account_name="eosio.token"))
+    abi.abi_json_to_bin(action="transfer", json={"from": ..., ...})
+    abi.abi_bin_to_json(action="transfer", bytes=b"...")
+
+    With raw_bytes=True, bytes values are unpacked as memoryviews of the
+    unpacked buffer instead of hex strings, without copying them.
+    """
+
+    def __init__(self, abi: dict, *, raw_bytes: bool = False):
+        if "abi" in abi:
+            abi = abi["abi"]
+        self.raw_bytes = raw_bytes
+        self.aliases = {
+            t["new_type_name"]: t["type"] for t in abi.get("types", [])
+        }
+        self.structs = dict(_BUILTIN_STRUCTS)
+        self.structs.update((s["name"], s) for s in abi.get("structs", []))
+        self.variants = {
+            v["name"]: v["types"] for v in abi.get("variants", [])
+        }
+        self.actions = {a["name"]: a["type"] for a in abi.get("actions", [])}
+        self.tables = {t["name"]: t["type"] for t in abi.get("tables", [])}
+        self._packers = {}
+        self._unpackers = {}
+
+    @classmethod
+    def from_file(cls, path: typing.Union[str, pathlib.Path]):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def abi_json_to_bin(self, *, action: str, json: dict) -> bytes:
+        """Return the serialized action data, like Net.abi_json_to_bin."""
+        return self.pack(type_=self.action_type(action), value=json)
+
+    def abi_bin_to_json(self, *, action: str, bytes: bytes) -> dict:
+        """Return the deserialized action data, like Net.abi_bin_to_json."""
+        return self.unpack(type_=self.action_type(action), bytes_=bytes)
+
+    def action_type(self, action: str) -> str:
+        try:
+            return self.actions[action]
+        except KeyError:
+            msg = f"Action {action} not found. {list(self.actions)=}"
+            raise ValueError(msg)
+
+    def pack(self, *, type_: str, value) -> bytes:
+        """Serialize a value (dict for structs) of any type in the abi."""
+        buffer = bytearray()
+        self.packer(type_)(buffer, value)
+        return bytes(buffer)
+
+    def unpack(self, *, type_: str, bytes_: bytes):
+        """Deserialize bytes_ into plain python values (dict for structs)."""
+        value, offset = self.unpacker(type_)(memoryview(bytes_), 0)
+        if offset != len(bytes_):
+            msg = f"{len(bytes_) - offset} bytes left after reading {type_}"
+            raise ValueError(msg)
+        return value
+
+    def packer(self, type_: str) -> typing.Callable:
+        """
+        Return the compiled packer of type_.
+
+        The packer is a function (buffer: bytearray, value) that appends the
+        serialized value to buffer.
+        """
+        try:
+            return self._packers[type_]
+        except KeyError:
+            return self._compile_packer(type_)
+
+    def unpacker(self, type_: str) -> typing.Callable:
+        """
+        Return the compiled unpacker of type_.
+
+        The unpacker is a function (buffer, offset) that reads a value from
+        buffer starting at offset and returns it with the offset after it.
+        """
+        try:
+            return self._unpackers[type_]
+        except KeyError:
+            return self._compile_unpacker(type_)
+
+    def _compile_packer(self, type_):
+        base, suffix = _split_suffix(type_)
+        if suffix is None:
+            packer = self._compile_named_packer(type_)
+        else:
+            packer = _PACKER_WRAPPERS[suffix](self.packer(base))
+        self._packers[type_] = packer
+        return packer
+
+    def _compile_named_packer(self, type_):
+        if type_ in self.aliases:
+            return self.packer(self.aliases[type_])
+        if type_ in self.structs:
+            return self._compile_struct_packer(type_)
+        if type_ in self.variants:
+            return self._compile_variant_packer(type_)
+        return _builtin_packer(type_)
+
+    def _compile_struct_packer(self, type_):
+        fields = []
+        names = set()
+
+        def pack_struct(buffer, value):
+            _check_field_names(type_, names, value)
+            for name, field_type, packer in fields:
+                if name not in value:
+                    if field_type.endswith("$"):
+                        break
+                    raise ValueError(f"Field {name} expected in {type_}")
+                packer(buffer, value[name])
+
+        # registered before compiling the fields for recursive structs
+        self._packers[type_] = pack_struct
+        fields.extend(
+            (f["name"], f["type"], self.packer(f["type"]))
+            for f in self._struct_fields(type_)
+        )
+        names.update(name for name, _, _ in fields)
+        return pack_struct
+
+    def _compile_variant_packer(self, type_):
+        options = self.variants[type_]
+        packers = [self.packer(option) for option in options]
+
+        def pack_variant(buffer, value):
+            option, option_value = value
+            try:
+                index = options.index(option)
+            except ValueError:
+                msg = f"Type {option} is not an option of variant {type_}"
+                raise ValueError(msg)
+            types.write_varuint32(buffer, index)
+            packers[index](buffer, option_value)
+
+        return pack_variant
+
+    def _compile_unpacker(self, type_):
+        base, suffix = _split_suffix(type_)
+        if suffix is None:
+            unpacker = self._compile_named_unpacker(type_)
+        else:
+            unpacker = _UNPACKER_WRAPPERS[suffix](self.unpacker(base))
+        self._unpackers[type_] = unpacker
+        return unpacker
+
+    def _compile_named_unpacker(self, type_):
+        if type_ in self.aliases:
+            return self.unpacker(self.aliases[type_])
+        if type_ in self.structs:
+            return self._compile_struct_unpacker(type_)
+        if type_ in self.variants:
+            return self._compile_variant_unpacker(type_)
+        return _builtin_unpacker(type_, raw_bytes=self.raw_bytes)
+
+    def _compile_struct_unpacker(self, type_):
+        fields = []
+
+        def unpack_struct(buffer, offset):
+            value = {}
+            for name, field_type, unpacker in fields:
+                if offset == len(buffer) and field_type.endswith("$"):
+                    break
+                value[name], offset = unpacker(buffer, offset)
+            return value, offset
+
+        # registered before compiling the fields for recursive structs
+        self._unpackers[type_] = unpack_struct
+        fields.extend(
+            (f["name"], f["type"], self.unpacker(f["type"]))
+            for f in self._struct_fields(type_)
+        )
+        return unpack_struct
+
+    def _compile_variant_unpacker(self, type_):
+        options = self.variants[type_]
+        unpackers = [self.unpacker(option) for option in options]
+
+        def unpack_variant(buffer, offset):
+            index, offset = types.Varuint32.from_buffer(buffer, offset)
+            if index.value >= len(options):
+                msg = f"Invalid option {index.value} for variant {type_}"
+                raise ValueError(msg)
+            value, offset = unpackers[index.value](buffer, offset)
+            return [options[index.value], value], offset
+
+        return unpack_variant
+
+    def _struct_fields(self, type_):
+        struct = self.structs[type_]
+        fields = []
+        if struct.get("base"):
+            base = self.aliases.get(struct["base"], struct["base"])
+            fields.extend(self._struct_fields(base))
+        fields.extend(struct["fields"])
+        return fields
+
+
+def _check_field_names(type_, names, value):
+    if not names.issuperset(value):
+        unknown = sorted(set(value) - names)
+        raise ValueError(f"Unknown fields {unknown} in {type_}")
+
+
+def _optional_packer(packer):
+    def pack_optional(buffer, value):
+        if value is None:
+            buffer += b"\x00"
+        else:
+            buffer += b"\x01"
+            packer(buffer, value)
+
+    return pack_optional
+
+
+def _array_packer(packer):
+    def pack_array(buffer, value):
+        types.write_varuint32(buffer, len(value))
+        for item in value:
+            packer(buffer, item)
+
+    return pack_array
+
+
+def _pack_bytes(buffer, value):
+    if isinstance(value, str):
+        value = bytes.fromhex(value)
+    types.write_varuint32(buffer, len(value))
+    buffer += value
+
+
+def _optional_unpacker(unpacker):
+    def unpack_optional(buffer, offset):
+        if not buffer[offset]:
+            return None, offset + 1
+        return unpacker(buffer, offset + 1)
+
+    return unpack_optional
+
+
+def _array_unpacker(unpacker):
+    def unpack_array(buffer, offset):
+        length, offset = types.Varuint32.from_buffer(buffer, offset)
+        values = []
+        for _ in range(length.value):
+            value, offset = unpacker(buffer, offset)
+            values.append(value)
+        return values, offset
+
+    return unpack_array
+
+
+def _unpack_bytes(buffer, offset):
+    length, offset = types.Varuint32.from_buffer(buffer, offset)
+    end = offset + length.value
+    return buffer[offset:end].hex(), end
+
+
+def _unpack_raw_bytes(buffer, offset):
+    length, offset = types.Varuint32.from_buffer(buffer, offset)
+    end = offset + length.value
+    return buffer[offset:end], end
+
+
+def _builtin_packer(type_):
+    if type_ == "bytes":
+        return _pack_bytes
+    class_ = _BUILTIN_TYPES.get(type_) or types.from_string(type_)
+
+    def pack_builtin(buffer, value):
+        class_(value).write(buffer)
+
+    return pack_builtin
+
+
+def _builtin_unpacker(type_, *, raw_bytes=False):
+    if type_ == "bytes":
+        return _unpack_raw_bytes if raw_bytes else _unpack_bytes
+    class_ = _BUILTIN_TYPES.get(type_) or types.from_string(type_)
+    to_plain = _TO_PLAIN.get(class_)
+
+    def unpack_builtin(buffer, offset):
+        instance, offset = class_.from_buffer(buffer, offset)
+        return instance.value, offset
+
+    def unpack_builtin_to_plain(buffer, offset):
+        instance, offset = class_.from_buffer(buffer, offset)
+        return to_plain(instance.value), offset
+
+    return unpack_builtin_to_plain if to_plain else unpack_builtin
+
+
+# packers and unpackers of "type$", "type?" and "type[]" from the ones of type
+_PACKER_WRAPPERS = {
+    "$": lambda packer: packer,
+    "?": _optional_packer,
+    "[]": _array_packer,
+}
+_UNPACKER_WRAPPERS = {
+    "$": lambda unpacker: unpacker,
+    "?": _optional_unpacker,
+    "[]": _array_unpacker,
+}
+
+
+def _split_suffix(type_):
+    """Return type_ without its $, ? or [] suffix, and the suffix."""
+    for suffix in _PACKER_WRAPPERS:
+        if type_.endswith(suffix):
+            return type_[: -len(suffix)], suffix
+    return type_, None
+
+
+def _struct(struct_name, /, **fields):
+    return {
+        "name": struct_name,
+        "base": "",
+        "fields": [{"name": k, "type": v} for k, v in fields.items()],
+    }
+
+
+# the abi of abis, to read the serialized abi returned by get_raw_abi
+_ABI_DEF = {
+    "structs": [
+        _struct("type_def", new_type_name="string", type="string"),
+        _struct("field_def", name="string", type="string"),
+        _struct(
+            "struct_def", name="string", base="string", fields="field_def[]"
+        ),
+        _struct(
+            "action_def",
+            name="name",
+            type="string",
+            ricardian_contract="string",
+        ),
+        _struct(
+            "table_def",
+            name="name",
+            index_type="string",
+            key_names="string[]",
+            key_types="string[]",
+            type="string",
+        ),
+        _struct("clause_pair", id="string", body="string"),
+        _struct("error_message", error_code="uint64", error_msg="string"),
+        _struct("extension", tag="uint16", value="bytes"),
+        _struct("variant_def", name="string", types="string[]"),
+        _struct("action_result_def", name="name", result_type="string"),
+        _struct(
+            "abi_def",
+            version="string",
+            types="type_def[]",
+            structs="struct_def[]",
+            actions="action_def[]",
+            tables="table_def[]",
+            ricardian_clauses="clause_pair[]",
+            error_messages="error_message[]",
+            abi_extensions="extension[]",
+            variants="variant_def[]$",
+            action_results="action_result_def[]$",
+        ),
+    ],
+}
+
+_abi_def = Abi(_ABI_DEF)
+
+
+def bin_to_abi(bytes_: bytes) -> dict:
+    """Return the abi serialized in bytes_, as returned by get_raw_abi."""
+    # unpacked without Abi.unpack, that rejects the trailing bytes of the
+    # extensions newer abi versions may add
+    abi, _ = _abi_def.unpacker("abi_def")(memoryview(bytes_), 0)
+    return abi
+
+
+__all__ = ["Abi", "bin_to_abi"]
@@ -0,0 +1,348 @@
+"""Caches in front of the Net calls whose answers rarely or never change."""
+
+import base64
+import collections
+import json
+import os
+import pathlib
+import threading
+import time
+import typing
+import zlib
+
+from . import abi
+from .net import Net
+
+# zlib.error for a corrupt stream, ValueError (JSONDecodeError and
+# UnicodeDecodeError) for bad json
+_CORRUPT_ERRORS = (zlib.error, ValueError)
+
+
+class AbiCache:
+    """
+    Net.get_abi behind a LRU cache in memory and, optionally, on disk.
+
+    Abis younger than ttl seconds are returned as is. Older ones are
+    revalidated with get_raw_abi and the hash of the cached abi, so the abi
+    is downloaded again only when the contract changed it.
+
+    With a directory, abis are also saved there as one json file per
+    account, so other processes using the same directory start warm. Use
+    one directory per chain.
+
+    cache = AbiCache(net, directory="/var/cache/eospyo/wax")
+    cache.get_abi(account_name="eosio.token")
+    cache.get(account_name="eosio.token").abi_bin_to_json(...)
+    """
+
+    def __init__(
+        self,
+        net: Net,
+        *,
+        maxsize: int = 128,
+        ttl: float = 300.0,
+        directory: typing.Union[str, pathlib.Path] = None,
+    ):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1. {maxsize=}")
+        self.net = net
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.directory = None if directory is None else pathlib.Path(directory)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_abi(self, *, account_name: str):
+        """Return the abi of a contract, like Net.get_abi."""
+        entry = self._entry(account_name)
+        if isinstance(entry, dict):
+            return entry
+        if entry.abi is None:
+            return None
+        return dict(account_name=account_name, abi=entry.abi)
+
+    def get(self, *, account_name: str) -> typing.Optional[abi.Abi]:
+        """Return the compiled abi of a contract, None if it has no abi."""
+        entry = self._entry(account_name)
+        if isinstance(entry, dict):
+            raise ValueError(f"Abi of {account_name} not found. {entry=}")
+        if entry.abi is None:
+            return None
+        if entry.compiled is None:
+            entry.compiled = abi.Abi(entry.abi)
+        return entry.compiled
+
+    def invalidate(self, *, account_name: str = None):
+        """Forget the abi of account_name, or all abis when None."""
+        with self._lock:
+            if account_name is None:
+                names = list(self._entries)
+                self._entries.clear()
+            else:
+                names = [account_name]
+                self._entries.pop(account_name, None)
+        if self.directory is not None:
+            if account_name is None:
+                names = [p.stem for p in self.directory.glob("*.json")]
+            for name in names:
+                self._path(name).unlink(missing_ok=True)
+
+    def _entry(self, account_name):
+        entry = self._cached(account_name)
+        if entry is None or time.time() - entry.checked_at >= self.ttl:
+            entry = self._fetch(account_name, entry)
+        return entry
+
+    def _cached(self, account_name):
+        with self._lock:
+            entry = self._entries.get(account_name)
+            if entry is not None:
+                self._entries.move_to_end(account_name)
+                return entry
+        if self.directory is None:
+            return None
+        entry = _AbiEntry.load(self._path(account_name))
+        if entry is not None:
+            self._remember(account_name, entry)
+        return entry
+
+    def _fetch(self, account_name, entry):
+        abi_hash = None if entry is None else entry.abi_hash
+        resp = self.net.get_raw_abi(
+            account_name=account_name, abi_hash=abi_hash
+        )
+        if "abi_hash" not in resp:  # api error, returned as get_abi does
+            return resp
+        if resp["abi_hash"] == abi_hash:
+            entry.checked_at = time.time()
+        else:
+            entry = _AbiEntry(
+                abi=_decode_abi(resp.get("abi")),
+                abi_hash=resp["abi_hash"],
+                code_hash=resp.get("code_hash"),
+                checked_at=time.time(),
+            )
+            self._remember(account_name, entry)
+        if self.directory is not None:
+            entry.save(self._path(account_name))
+        return entry
+
+    def _remember(self, account_name, entry):
+        with self._lock:
+            self._entries[account_name] = entry
+            self._entries.move_to_end(account_name)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _path(self, account_name):
+        return self.directory / f"{account_name}.json"
+
+
+class _AbiEntry:
+    def __init__(self, *, abi, abi_hash, code_hash, checked_at):
+        self.abi = abi
+        self.abi_hash = abi_hash
+        self.code_hash = code_hash
+        self.checked_at = checked_at
+        self.compiled = None
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path) as f:
+                return cls(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def save(self, path):
+        data = dict(
+            abi=self.abi,
+            abi_hash=self.abi_hash,
+            code_hash=self.code_hash,
+            checked_at=self.checked_at,
+        )
+        _write_file(path, json.dumps(data).encode())
+
+
+class BlockCache:
+    """
+    Net.get_block and Net.get_block_info behind a cache of irreversible blocks.
+
+    Only blocks at or below the last irreversible block (as returned by
+    Net.get_tapos, fetched again at most every lib_refresh seconds) are
+    cached: they never change. Blocks are kept zlib compressed in a LRU of
+    at most max_bytes and, with a directory, also written there so other
+    processes replaying the same ranges read them from disk.
+
+    Every call returns a new dict, so callers may modify it. hits, disk_hits
+    and misses count the calls answered from memory, disk and the net.
+    """
+
+    def __init__(
+        self,
+        net: Net,
+        *,
+        max_bytes: int = 64 * 2**20,
+        directory: typing.Union[str, pathlib.Path] = None,
+        lib_refresh: float = 1.0,
+    ):
+        self.net = net
+        self.max_bytes = max_bytes
+        self.directory = None if directory is None else pathlib.Path(directory)
+        self.lib_refresh = lib_refresh
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._lib_num = 0
+        self._lib_checked_at = None
+
+    @property
+    def size(self) -> int:
+        """Bytes of compressed blocks held in memory."""
+        return self._bytes
+
+    def get_block(self, *, block_num_or_id: typing.Union[int, str]):
+        """Return a block, like Net.get_block."""
+        block_num, block_id = _block_key(block_num_or_id)
+        return self._get(
+            ("block", block_num),
+            block_id,
+            lambda: self.net.get_block(block_num_or_id=block_num_or_id),
+        )
+
+    def get_block_info(self, *, block_num: typing.Union[int, str]):
+        """Return a subset of a block, like Net.get_block_info."""
+        return self._get(
+            ("block_info", int(block_num)),
+            None,
+            lambda: self.net.get_block_info(block_num=block_num),
+        )
+
+    def _get(self, key, block_id, fetch):
+        block, from_disk = self._cached(key)
+        if self._count(block, block_id, from_disk):
+            return block
+        block = fetch()
+        if "id" in block and self._is_irreversible(key[1]):
+            self._store(key, zlib.compress(json.dumps(block).encode()))
+        return block
+
+    def _count(self, block, block_id, from_disk):
+        """Count a hit, disk hit or miss, tell if block answers the call."""
+        hit = block is not None and block_id in (None, block["id"])
+        with self._lock:
+            if not hit:
+                self.misses += 1
+            elif from_disk:
+                self.disk_hits += 1
+            else:
+                self.hits += 1
+        return hit
+
+    def _cached(self, key):
+        """Return the cached block of key, or None, and if read from disk."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+        if data is not None:
+            return self._decode(key, data), False
+        return self._read_file(key), True
+
+    def _read_file(self, key):
+        if self.directory is None:
+            return None
+        try:
+            data = self._path(key).read_bytes()
+        except OSError:
+            return None
+        block = self._decode(key, data)
+        if block is not None:
+            self._remember(key, data)
+        return block
+
+    def _decode(self, key, data):
+        try:
+            return _decode_block(data)
+        except _CORRUPT_ERRORS:  # eg: a truncated file, fetched again
+            self._forget(key)
+            return None
+
+    def _forget(self, key):
+        with self._lock:
+            data = self._entries.pop(key, None)
+            if data is not None:
+                self._bytes -= len(data)
+        if self.directory is not None:
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def _is_irreversible(self, block_num):
+        if block_num <= self._lib_num:
+            return True
+        now = time.monotonic()
+        checked_at = self._lib_checked_at
+        if checked_at is None or now - checked_at >= self.lib_refresh:
+            self._lib_checked_at = now
+            _, lib_id = self.net.get_tapos()
+            self._lib_num = max(self._lib_num, _block_key(lib_id)[0])
+        return block_num <= self._lib_num
+
+    def _store(self, key, data):
+        self._remember(key, data)
+        if self.directory is not None:
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _write_file(path, data)
+
+    def _remember(self, key, data):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = data
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def _path(self, key):
+        kind, block_num = key
+        shard = str(block_num // 10_000)
+        return self.directory / kind / shard / f"{block_num}.json.z"
+
+
+def _block_key(block_num_or_id):
+    """Return the block number and id (None for numbers) of a block."""
+    if isinstance(block_num_or_id, str) and len(block_num_or_id) == 64:
+        # block ids start with the big endian block number
+        return int(block_num_or_id[:8], 16), block_num_or_id
+    return int(block_num_or_id), None
+
+
+def _decode_block(data):
+    return json.loads(zlib.decompress(data))
+
+
+def _write_file(path, data):
+    # written aside then renamed, so readers never see a partial file
+    tmp_name = f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    tmp_path = path.with_name(tmp_name)
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _decode_abi(raw_abi):
+    if not raw_abi:
+        return None
+    return abi.bin_to_abi(base64.b64decode(raw_abi))
+
+
+__all__ = ["AbiCache", "BlockCache"]
@@ -7,6 +7,8 @@ logger = logging.getLogger(__name__)
 
 class ConnectionError(Exception):
     def __init__(self, *, response, url, payload, error):
+        self.response = response
+        self.error = error
         try:
             text = response.text
         except AttributeError:
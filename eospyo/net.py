@@ -5,23 +5,235 @@ Nodeos api reference:
 https://developers.eos.io/manuals/eos/latest/nodeos/plugins/chain_api_plugin/api-reference/index
 """
 
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import hashlib
+import itertools
 import logging
+import queue
+import random
+import threading
+import time
 import typing
 from urllib.parse import urljoin
 
 import httpx
 import pydantic
 
-from eospyo import exc
+from eospyo import exc, types
 from eospyo._version import DEPRECATION_WARNING, __version__
 
+_HEADERS = {"user-agent": f"Eospyo/{__version__}"}
+_CONNECTION_ERRORS = (
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.WriteError,
+)
+# the host is down or overloaded: the next host is tried
+_FAILOVER_STATUS_CODES = {429, 502, 503, 504}
+# the request did not reach the node: a push can be sent to the next host
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_UNSENT_STATUS_CODES = {429, 503}
+_LATENCY_WEIGHT = 0.3  # of the last request in the latency average
+_DOWN_SECONDS = 30.0  # before a host that failed is tried again
+_RANGE_END = object()  # queued after the last row of a table range
+_STOP_POLL_SECONDS = 0.1  # between checks that a table scan was stopped
+
+
+class _Shared:
+    """Object shared by a Net and its copies, created on first use."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = None
+
+    def get(self, factory: typing.Callable):
+        value = self.value
+        if value is None:
+            with self._lock:
+                if self.value is None:
+                    self.value = factory()
+                value = self.value
+        return value
+
+    def pop(self):
+        """Forget the object and return it, eg: to be closed by the caller."""
+        with self._lock:
+            value, self.value = self.value, None
+        return value
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class _HostPool:
+    """
+    Hosts of a net, ranked by health and latency.
+
+    Latency is an exponentially weighted moving average of the request
+    durations. A host that fails is put aside for _DOWN_SECONDS and then
+    tried again by the next requests.
+    """
+
+    def __init__(self, hosts: typing.List[str]):
+        self.hosts = hosts
+        self._lock = threading.Lock()
+        self._latency = dict.fromkeys(hosts, 0.0)
+        self._down_until = dict.fromkeys(hosts, 0.0)
+
+    def order(self, pin: typing.Optional[str] = None) -> typing.List[str]:
+        """
+        Return the hosts in the order to try them.
+
+        Healthy hosts come first: the fastest of two random ones, to spread
+        the load, then the others by latency. With a pin, healthy hosts are
+        in its rendezvous hash order, so requests with the same pin go to
+        the same host. Hosts put aside come last.
+        """
+        now = time.monotonic()
+        with self._lock:
+            healthy = [h for h in self.hosts if self._down_until[h] <= now]
+            down = [h for h in self.hosts if self._down_until[h] > now]
+            down.sort(key=self._down_until.get)
+            healthy.sort(key=self._latency.get)
+        if pin is not None:
+            healthy.sort(key=lambda h: _rendezvous_score(pin, h))
+        elif len(healthy) > 1:
+            first = min(random.sample(range(len(healthy)), 2))
+            healthy.insert(0, healthy.pop(first))
+        return healthy + down
+
+    def latencies(self) -> typing.Dict[str, typing.Optional[float]]:
+        """Return the latency of each host, None for the ones put aside."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                h: None if self._down_until[h] > now else self._latency[h]
+                for h in self.hosts
+            }
+
+    def record_success(self, host: str, seconds: float):
+        with self._lock:
+            latency = self._latency[host]
+            if latency:
+                seconds = latency + _LATENCY_WEIGHT * (seconds - latency)
+            self._latency[host] = seconds
+            self._down_until[host] = 0.0
+
+    def record_failure(self, host: str):
+        with self._lock:
+            self._down_until[host] = time.monotonic() + _DOWN_SECONDS
+
+
+def _rendezvous_score(pin, host):
+    # lowest first
+    return hashlib.sha256(f"{pin}{host}".encode("utf8")).digest()
+
 
 class Net(pydantic.BaseModel):
     """
     The net hold the connection information with the blockchain network api.
-    """  # NOQA: D200
+
+    Requests go through one httpx client per net (shared by its copies)
+    that keeps connections alive. Close it with close() or use the net as
+    a context manager.
+
+    host and the optional extra hosts form a pool: reads go to the
+    healthy hosts with the lowest latency, push_transaction sticks to one
+    host per transaction, and a request that fails to connect or gets a
+    429/502/503/504 response is retried on the next host.
+
+    push_transaction only goes to the next host when the transaction
+    surely did not reach the node (connect error, 429 or 503): after a
+    read timeout or a 502/504 the node may still run it, so the error is
+    raised rather than the signed transaction sent twice.
+    """
 
     host: pydantic.AnyHttpUrl
+    hosts: typing.List[pydantic.AnyHttpUrl] = []
+    timeout: pydantic.confloat(gt=0) = 5.0
+    max_connections: pydantic.conint(ge=1) = 100
+    max_keepalive_connections: pydantic.conint(ge=0) = 20
+    _http: _Shared = pydantic.PrivateAttr(default_factory=_Shared)
+    _pool: _Shared = pydantic.PrivateAttr(default_factory=_Shared)
+    _tapos: typing.Optional["TaposProvider"] = pydantic.PrivateAttr(
+        default=None
+    )
+
+    def use_tapos_cache(
+        self, *, refresh_interval: float = 60.0, background: bool = False
+    ) -> "TaposProvider":
+        """
+        Cache the TAPOS information used by Transaction.link.
+
+        Return the TaposProvider now used by get_tapos (see TaposProvider).
+        """
+        if self._tapos is not None:
+            self._tapos.stop()
+        self._tapos = TaposProvider(
+            self, refresh_interval=refresh_interval, background=background
+        )
+        return self._tapos
+
+    def get_tapos(self) -> typing.Tuple[str, str]:
+        """
+        Return the chain id and the id of the block to reference (TAPOS).
+
+        Use the TaposProvider when there is one, else call get_info.
+        """
+        if self._tapos is not None:
+            return self._tapos.get()
+        info = self.get_info()
+        return info["chain_id"], info["last_irreversible_block_id"]
+
+    def check_hosts(self) -> typing.Dict[str, typing.Optional[float]]:
+        """
+        Call get_info on every host and return their latency in seconds.
+
+        The latency is None for the hosts that are down. Results are used
+        to rank the hosts, like the ones of any other request.
+        """
+        pool = self._host_pool()
+        for host in pool.hosts:
+            try:
+                self._request_host(host, endpoint="/v1/chain/get_info")
+            except exc.ConnectionError:
+                pass
+        return pool.latencies()
+
+    def close(self):
+        """Close the connections kept alive. The net can still be used."""
+        client = self._http.pop()
+        if client is not None:
+            client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _client(self) -> httpx.Client:
+        return self._http.get(self._new_client)
+
+    def _host_pool(self) -> _HostPool:
+        return self._pool.get(self._new_host_pool)
+
+    def _new_host_pool(self) -> _HostPool:
+        hosts = list(dict.fromkeys([self.host, *self.hosts]))
+        return _HostPool(hosts)
+
+    def _new_client(self) -> httpx.Client:
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+        )
+        return httpx.Client(timeout=self.timeout, limits=limits)
 
     def _request(
         self,
@@ -29,37 +241,61 @@ class Net(pydantic.BaseModel):
         endpoint: str,
         payload: typing.Optional[dict] = dict(),
         verb: str = "POST",
+        parse: typing.Optional[typing.Callable] = None,
+        pin: typing.Optional[str] = None,
+        resend: bool = True,
     ):
+        """
+        Post payload to endpoint and return the (parsed) json response.
+
+        Hosts are tried in the order of the host pool (see Net), pin
+        choosing the host when given. Unless resend, the next host is only
+        tried if the request did not reach the failed one.
+        """
         logging.warning(DEPRECATION_WARNING)
 
-        url = urljoin(self.host, endpoint)
-        headers = {"user-agent": f"Eospyo/{__version__}"}
+        for host in self._host_pool().order(pin):
+            try:
+                resp = self._request_host(
+                    host, endpoint=endpoint, payload=payload
+                )
+            except exc.ConnectionError as e:
+                if not (resend or _unsent(e)):
+                    raise
+                error = e
+            else:
+                url = urljoin(host, endpoint)
+                return _parse_response(
+                    resp, url=url, payload=payload, parse=parse
+                )
+        raise error
 
+    def _request_host(self, host, *, endpoint, payload=dict()):
+        url = urljoin(host, endpoint)
+        started = time.monotonic()
         try:
-            resp = httpx.post(url, json=payload, headers=headers)
-        except (
-            httpx.TimeoutException,
-            httpx.NetworkError,
-            httpx.WriteError,
-        ) as e:
-            raise exc.ConnectionError(
-                response=None, url=url, payload=payload, error=e
-            )
-
-        if resp.status_code > 299 and resp.status_code != 500:
-            raise exc.ConnectionError(
-                response=resp, url=url, payload=payload, error=None
-            )
+            resp = self._client().post(url, json=payload, headers=_HEADERS)
+        except _CONNECTION_ERRORS as e:
+            return self._record(host, started, url, payload, error=e)
+        return self._record(host, started, url, payload, resp=resp)
 
-        return resp.json()
+    def _record(self, host, started, url, payload, resp=None, error=None):
+        """Rank host by the outcome of a request, raise if it failed."""
+        pool = self._host_pool()
+        if error is None and resp.status_code not in _FAILOVER_STATUS_CODES:
+            pool.record_success(host, time.monotonic() - started)
+            return resp
+        pool.record_failure(host)
+        raise exc.ConnectionError(
+            response=resp, url=url, payload=payload, error=error
+        )
 
     def abi_bin_to_json(
         self, *, account_name: str, action: str, bytes: dict
     ) -> dict:
         endpoint = "/v1/chain/abi_bin_to_json"
         payload = dict(code=account_name, action=action, binargs=bytes.hex())
-        data = self._request(endpoint=endpoint, payload=payload)
-        return data["args"]
+        return self._request(endpoint=endpoint, payload=payload, parse=_args)
 
     def abi_json_to_bin(
         self, *, account_name: str, action: str, json: dict
@@ -71,17 +307,13 @@ class Net(pydantic.BaseModel):
         """
         endpoint = "/v1/chain/abi_json_to_bin"
         payload = dict(code=account_name, action=action, args=json)
-        data = self._request(endpoint=endpoint, payload=payload)
-        if "binargs" not in data:
-            return data
-        hex_ = data["binargs"]
-        bytes_ = bytes.fromhex(hex_)
-        return bytes_
+        return self._request(
+            endpoint=endpoint, payload=payload, parse=_binargs
+        )
 
     def get_info(self):
         endpoint = "/v1/chain/get_info"
-        data = self._request(endpoint=endpoint)
-        return data
+        return self._request(endpoint=endpoint)
 
     def get_account(self, *, account_name: str):
         """
@@ -92,8 +324,7 @@ class Net(pydantic.BaseModel):
         """
         endpoint = "/v1/chain/get_account"
         payload = dict(account_name=account_name)
-        data = self._request(endpoint=endpoint, payload=payload)
-        return data
+        return self._request(endpoint=endpoint, payload=payload)
 
     def get_abi(self, *, account_name: str):
         """
@@ -103,10 +334,30 @@ class Net(pydantic.BaseModel):
         """
         endpoint = "/v1/chain/get_abi"
         payload = dict(account_name=account_name)
-        data = self._request(endpoint=endpoint, payload=payload)
-        if len(data) == 1:
-            return None
-        return data
+        return self._request(endpoint=endpoint, payload=payload, parse=_abi)
+
+    def get_raw_abi(self, *, account_name: str, abi_hash: str = None):
+        """
+        Retrieve the serialized ABI of a contract with its abi and code hash.
+
+        The abi is not returned when abi_hash is the hash of the current one.
+        https://developers.eos.io/manuals/eos/latest/nodeos/plugins/chain_api_plugin/api-reference/index#operation/get_raw_abi
+        """
+        endpoint = "/v1/chain/get_raw_abi"
+        payload = dict(account_name=account_name)
+        if abi_hash is not None:
+            payload["abi_hash"] = abi_hash
+        return self._request(endpoint=endpoint, payload=payload)
+
+    def get_code_hash(self, *, account_name: str):
+        """
+        Retrieve the hash of the code of a contract.
+
+        https://developers.eos.io/manuals/eos/latest/nodeos/plugins/chain_api_plugin/api-reference/index#operation/get_code_hash
+        """
+        endpoint = "/v1/chain/get_code_hash"
+        payload = dict(account_name=account_name)
+        return self._request(endpoint=endpoint, payload=payload)
 
     def get_block(self, *, block_num_or_id: str):
         """
@@ -116,8 +367,7 @@ class Net(pydantic.BaseModel):
         """
         endpoint = "/v1/chain/get_block"
         payload = dict(block_num_or_id=block_num_or_id)
-        data = self._request(endpoint=endpoint, payload=payload)
-        return data
+        return self._request(endpoint=endpoint, payload=payload)
 
     def get_block_info(self, *, block_num: str):
         """
@@ -128,8 +378,7 @@ class Net(pydantic.BaseModel):
         """
         endpoint = "/v1/chain/get_block_info"
         payload = dict(block_num=block_num)
-        data = self._request(endpoint=endpoint, payload=payload)
-        return data
+        return self._request(endpoint=endpoint, payload=payload)
 
     def get_table_by_scope(
         self,
@@ -160,8 +409,7 @@ class Net(pydantic.BaseModel):
         for k in list(payload.keys()):
             if payload[k] is None:
                 del payload[k]
-        data = self._request(endpoint=endpoint, payload=payload)
-        return data
+        return self._request(endpoint=endpoint, payload=payload)
 
     def get_table_rows(
         self,
@@ -207,11 +455,176 @@ class Net(pydantic.BaseModel):
         for k in list(payload.keys()):
             if payload[k] is None:
                 del payload[k]
-        data = self._request(endpoint=endpoint, payload=payload)
-        if "rows" in data:
-            return data["rows"]
-        else:
-            return data
+        return self._request(endpoint=endpoint, payload=payload, parse=_rows)
+
+    def iter_table_rows(
+        self,
+        code: str,
+        table: str,
+        scope: str,
+        *,
+        limit: int = 100,
+        max_limit: int = 5000,
+        page_seconds: float = 0.5,
+        prefetch: bool = False,
+        **options,
+    ) -> typing.Iterator:
+        """
+        Yield every row of a table, following next_key page after page.
+
+        options are the other get_table_rows parameters (json, key_type,
+        lower_bound, upper_bound, reverse, ...). Only the current page (and
+        the next one with prefetch) is held in memory.
+
+        Parameters:
+        -----------
+        limit: int = 100
+            Rows in the first page. The next pages are resized so that each
+            request takes about page_seconds, up to max_limit rows.
+        prefetch: bool = False
+            Request the next page in a thread while the rows of the current
+            one are consumed.
+        """
+        payload = _table_rows_payload(code, table, scope, limit, options)
+        fetch = functools.partial(
+            self._table_page, page_seconds=page_seconds, max_limit=max_limit
+        )
+        if prefetch:
+            yield from _prefetched_rows(fetch, payload)
+            return
+        while payload is not None:
+            rows, payload = fetch(payload)
+            yield from rows
+
+    def scan_table(
+        self,
+        code: str,
+        table: str,
+        scope: str,
+        *,
+        partitions: int = 8,
+        lower_bound: typing.Optional[typing.Union[str, int]] = None,
+        upper_bound: typing.Optional[typing.Union[str, int]] = None,
+        key_type: typing.Optional[str] = None,
+        buffer_size: int = 1000,
+        **options,
+    ) -> typing.Iterator:
+        """
+        Yield every row of a table, reading key ranges in parallel.
+
+        The uint64 keys from lower_bound to upper_bound (names or numbers,
+        the whole table by default) are split in `partitions` ranges, each
+        read by iter_table_rows in its own thread. Rows are yielded in key
+        order: each range is read ahead into a queue of up to buffer_size
+        rows, its thread waiting while the queue is full.
+
+        Closing the iterator early returns at once, the threads stopping
+        after their current request.
+
+        key_type can only be None, "i64" or "name". With "name", string
+        bounds are always names (eg: "12345"), else digit strings are
+        numbers. options are passed to iter_table_rows.
+        """
+        if options.get("reverse"):
+            raise ValueError("Tables are scanned in ascending key order.")
+        ranges = _key_ranges(lower_bound, upper_bound, partitions, key_type)
+        # range bounds are numbers, that nodeos would read as names
+        key_type = "i64" if key_type == "name" else key_type
+        stop = threading.Event()
+        read = functools.partial(
+            self._table_range, code, table, scope, key_type, options, stop
+        )
+        queues = [queue.Queue(maxsize=buffer_size) for _ in ranges]
+        executor = concurrent.futures.ThreadPoolExecutor(len(ranges))
+        try:
+            futures = [executor.submit(read, *a) for a in zip(queues, ranges)]
+            for rows, future in zip(queues, futures):
+                yield from iter(rows.get, _RANGE_END)
+                future.result()  # raises the error that ended the range
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _table_range(
+        self, code, table, scope, key_type, options, stop, rows, range_
+    ):
+        lower, upper = range_
+        try:
+            for row in self.iter_table_rows(
+                code,
+                table,
+                scope,
+                key_type=key_type,
+                lower_bound=str(lower),
+                upper_bound=str(upper),
+                **options,
+            ):
+                if not _put(rows, row, stop):
+                    return
+        finally:
+            _put(rows, _RANGE_END, stop)
+
+    def _table_page(self, payload, *, page_seconds, max_limit):
+        started = time.monotonic()
+        data = self._request(
+            endpoint="/v1/chain/get_table_rows", payload=payload
+        )
+        seconds = time.monotonic() - started
+        return _next_table_page(
+            payload, data, seconds, page_seconds, max_limit
+        )
+
+    def fetch_blocks(
+        self,
+        start: int,
+        end: int,
+        *,
+        concurrency: int = 8,
+        retries: int = 3,
+        retry_delay: float = 0.5,
+    ) -> typing.Iterator[dict]:
+        """
+        Yield the blocks from start to end (included) in block order.
+
+        Up to `concurrency` get_block requests run at once in threads, and
+        no block is requested further than `concurrency` blocks ahead of the
+        one to yield, so memory stays constant however long the range.
+
+        A block that fails (connection error or api error, eg: not produced
+        yet) is requested again up to `retries` times, waiting retry_delay
+        seconds doubled after each attempt.
+        """
+        block_nums = _block_nums(start, end, concurrency)
+        fetch = functools.partial(
+            self._fetch_block, retries=retries, retry_delay=retry_delay
+        )
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=concurrency
+        ) as executor:
+            window = collections.deque(
+                executor.submit(fetch, n)
+                for n in itertools.islice(block_nums, concurrency)
+            )
+            try:
+                while window:
+                    block = window.popleft().result()
+                    for n in itertools.islice(block_nums, 1):
+                        window.append(executor.submit(fetch, n))
+                    yield block
+            finally:
+                for future in window:
+                    future.cancel()
+
+    def _fetch_block(self, block_num, *, retries, retry_delay):
+        for delay in _retry_delays(retries, retry_delay):
+            try:
+                result = self.get_block(block_num_or_id=str(block_num))
+            except exc.ConnectionError as e:
+                result = e
+            block = _block_or_retry(result, block_num, delay is None)
+            if block is not None:
+                return block
+            time.sleep(delay)
 
     def push_transaction(
         self,
@@ -232,8 +645,470 @@ class Net(pydantic.BaseModel):
             packed_context_free_data=packed_context_free_data,
             packed_trx=transaction.pack(),
         )
-        data = self._request(endpoint=endpoint, payload=payload)
+        # retries of a transaction go to the same host first
+        return self._request(
+            endpoint=endpoint,
+            payload=payload,
+            pin=transaction.id(),
+            resend=False,
+        )
+
+
+def _parse_response(resp, *, url, payload, parse):
+    if resp.status_code > 299 and resp.status_code != 500:
+        raise exc.ConnectionError(
+            response=resp, url=url, payload=payload, error=None
+        )
+    data = resp.json()
+    if parse is None:
         return data
+    return parse(data)
+
+
+def _unsent(error):
+    """Tell if the request that raised error surely did not reach a node."""
+    if error.response is not None:
+        return error.response.status_code in _UNSENT_STATUS_CODES
+    return isinstance(error.error, _UNSENT_ERRORS)
+
+
+def _args(data):
+    return data["args"]
+
+
+def _binargs(data):
+    if "binargs" not in data:
+        return data
+    return bytes.fromhex(data["binargs"])
+
+
+def _abi(data):
+    if len(data) == 1:
+        return None
+    return data
+
+
+def _rows(data):
+    if "rows" in data:
+        return data["rows"]
+    return data
+
+
+def _table_rows_payload(code, table, scope, limit, options):
+    payload = dict(code=code, table=table, scope=scope, json=True)
+    payload.update(options, limit=limit)
+    return {k: v for k, v in payload.items() if v is not None}
+
+
+def _next_table_page(payload, data, seconds, page_seconds, max_limit):
+    """Return the rows of a page and the payload of the next one, if any."""
+    if "rows" not in data:
+        raise ValueError(f"get_table_rows failed: {data}")
+    if not data.get("more"):
+        return data["rows"], None
+    if not data.get("next_key"):
+        raise ValueError("The node does not return next_key to paginate.")
+    bound = "upper_bound" if payload.get("reverse") else "lower_bound"
+    # aim at requests of page_seconds, changing the size by 2x at most
+    scale = min(2.0, max(0.5, page_seconds / max(seconds, 1e-3)))
+    limit = min(max_limit, max(1, int(payload["limit"] * scale)))
+    next_payload = dict(payload, limit=limit, **{bound: data["next_key"]})
+    return data["rows"], next_payload
+
+
+def _prefetched_rows(fetch, payload):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch, payload)
+        while future is not None:
+            rows, payload = future.result()
+            future = None
+            if payload is not None:
+                future = executor.submit(fetch, payload)
+            yield from rows
+
+
+def _put(rows, item, stop):
+    """Put item in the bounded queue rows, unless stop is set while full."""
+    while not stop.is_set():
+        try:
+            rows.put(item, timeout=_STOP_POLL_SECONDS)
+        except queue.Full:
+            continue
+        return True
+    return False
+
+
+def _block_nums(start, end, concurrency):
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1. {concurrency=}")
+    return iter(range(start, end + 1))
+
+
+def _retry_delays(retries, retry_delay):
+    """Yield the delay after each attempt, doubling, None after the last."""
+    for attempt in range(retries):
+        yield retry_delay * 2**attempt
+    yield None
+
+
+def _block_or_retry(result, block_num, last_attempt):
+    """
+    Return the block of a get_block result, None to request it again.
+
+    result is the response or the exc.ConnectionError raised, which is
+    raised again after the last attempt, as ValueError for api errors.
+    """
+    if isinstance(result, exc.ConnectionError):
+        if last_attempt:
+            raise result
+        return None
+    if "id" in result:
+        return result
+    if last_attempt:
+        raise ValueError(f"Block {block_num} not fetched. {result=}")
+    return None
+
+
+def _key_ranges(lower_bound, upper_bound, partitions, key_type):
+    """Split the uint64 keys from lower to upper bound in disjoint ranges."""
+    if key_type not in (None, "i64", "name"):
+        raise ValueError(f"Can not split the keys of type {key_type}.")
+    if partitions < 1:
+        raise ValueError("At least one partition is required.")
+    lower = 0 if lower_bound is None else _uint64_key(lower_bound, key_type)
+    upper = 2**64 - 1
+    if upper_bound is not None:
+        upper = _uint64_key(upper_bound, key_type)
+    if upper < lower:
+        return [(lower, upper)]  # an empty range, as nodeos would read it
+    step = -(-(upper - lower + 1) // partitions)  # ceil
+    return [
+        (start, min(start + step - 1, upper))
+        for start in range(lower, upper + 1, step)
+    ]
+
+
+def _uint64_key(bound, key_type):
+    """Read a bound as nodeos does: numbers first, unless names are keys."""
+    if isinstance(bound, int):
+        return bound
+    if key_type != "name" and bound.isdigit():
+        return int(bound)
+    return types.Name.string_to_uint64(bound)
+
+
+class AsyncNet(Net):
+    """
+    Net for asyncio: every api method of Net is a coroutine here.
+
+    Requests go through one httpx.AsyncClient that keeps connections
+    alive. Use the net from a single event loop and close it with aclose()
+    or as an async context manager.
+
+    async with AsyncNet(host="http://127.0.0.1:8888") as net:
+        info = await net.get_info()
+    """
+
+    def use_tapos_cache(
+        self, *, refresh_interval: float = 60.0, background: bool = False
+    ) -> "TaposProvider":
+        if background:
+            msg = "AsyncNet refreshes TAPOS on demand, not in background."
+            raise ValueError(msg)
+        return super().use_tapos_cache(refresh_interval=refresh_interval)
+
+    async def get_tapos(self) -> typing.Tuple[str, str]:
+        if self._tapos is None:
+            info = await self.get_info()
+            return info["chain_id"], info["last_irreversible_block_id"]
+        cached = self._tapos.cached()
+        if cached is None:
+            self._tapos.update(await self.get_info())
+            cached = self._tapos.cached()
+        return cached
+
+    async def check_hosts(self) -> typing.Dict[str, typing.Optional[float]]:
+        pool = self._host_pool()
+        checks = [
+            self._request_host(h, endpoint="/v1/chain/get_info")
+            for h in pool.hosts
+        ]
+        await asyncio.gather(*checks, return_exceptions=True)
+        return pool.latencies()
+
+    def close(self):
+        raise TypeError("AsyncNet is closed with 'await net.aclose()'")
+
+    async def aclose(self):
+        """Close the connections kept alive. The net can still be used."""
+        client = self._http.pop()
+        if client is not None:
+            await client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def _new_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+        )
+        return httpx.AsyncClient(timeout=self.timeout, limits=limits)
+
+    async def _request(
+        self,
+        *,
+        endpoint: str,
+        payload: typing.Optional[dict] = dict(),
+        verb: str = "POST",
+        parse: typing.Optional[typing.Callable] = None,
+        pin: typing.Optional[str] = None,
+        resend: bool = True,
+    ):
+        logging.warning(DEPRECATION_WARNING)
+
+        for host in self._host_pool().order(pin):
+            try:
+                resp = await self._request_host(
+                    host, endpoint=endpoint, payload=payload
+                )
+            except exc.ConnectionError as e:
+                if not (resend or _unsent(e)):
+                    raise
+                error = e
+            else:
+                url = urljoin(host, endpoint)
+                return _parse_response(
+                    resp, url=url, payload=payload, parse=parse
+                )
+        raise error
+
+    async def iter_table_rows(
+        self,
+        code: str,
+        table: str,
+        scope: str,
+        *,
+        limit: int = 100,
+        max_limit: int = 5000,
+        page_seconds: float = 0.5,
+        prefetch: bool = False,
+        **options,
+    ) -> typing.AsyncIterator:
+        """Yield every row of a table, like Net.iter_table_rows."""
+        payload = _table_rows_payload(code, table, scope, limit, options)
+        fetch = functools.partial(
+            self._table_page, page_seconds=page_seconds, max_limit=max_limit
+        )
+        next_page = None
+        try:
+            while payload is not None:
+                rows, payload = await (next_page or fetch(payload))
+                next_page = None
+                if prefetch and payload is not None:
+                    next_page = asyncio.ensure_future(fetch(payload))
+                for row in rows:
+                    yield row
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def scan_table(
+        self,
+        code: str,
+        table: str,
+        scope: str,
+        *,
+        partitions: int = 8,
+        lower_bound: typing.Optional[typing.Union[str, int]] = None,
+        upper_bound: typing.Optional[typing.Union[str, int]] = None,
+        key_type: typing.Optional[str] = None,
+        **options,
+    ) -> typing.AsyncIterator:
+        """Yield every row of a table, like Net.scan_table, in tasks."""
+        if options.get("reverse"):
+            raise ValueError("Tables are scanned in ascending key order.")
+        ranges = _key_ranges(lower_bound, upper_bound, partitions, key_type)
+        # range bounds are numbers, that nodeos would read as names
+        key_type = "i64" if key_type == "name" else key_type
+        tasks = [
+            asyncio.ensure_future(
+                self._table_range(code, table, scope, key_type, options, *r)
+            )
+            for r in ranges
+        ]
+        try:
+            for task in tasks:
+                for row in await task:
+                    yield row
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _table_range(
+        self, code, table, scope, key_type, options, lower, upper
+    ):
+        rows = self.iter_table_rows(
+            code,
+            table,
+            scope,
+            key_type=key_type,
+            lower_bound=str(lower),
+            upper_bound=str(upper),
+            **options,
+        )
+        return [row async for row in rows]
+
+    async def _table_page(self, payload, *, page_seconds, max_limit):
+        started = time.monotonic()
+        data = await self._request(
+            endpoint="/v1/chain/get_table_rows", payload=payload
+        )
+        seconds = time.monotonic() - started
+        return _next_table_page(
+            payload, data, seconds, page_seconds, max_limit
+        )
+
+    async def fetch_blocks(
+        self,
+        start: int,
+        end: int,
+        *,
+        concurrency: int = 8,
+        retries: int = 3,
+        retry_delay: float = 0.5,
+    ) -> typing.AsyncIterator[dict]:
+        """Yield the blocks from start to end, like Net.fetch_blocks."""
+        block_nums = _block_nums(start, end, concurrency)
+        fetch = functools.partial(
+            self._fetch_block, retries=retries, retry_delay=retry_delay
+        )
+        window = collections.deque(
+            asyncio.ensure_future(fetch(n))
+            for n in itertools.islice(block_nums, concurrency)
+        )
+        try:
+            while window:
+                block = await window.popleft()
+                for n in itertools.islice(block_nums, 1):
+                    window.append(asyncio.ensure_future(fetch(n)))
+                yield block
+        finally:
+            for task in window:
+                task.cancel()
+
+    async def _fetch_block(self, block_num, *, retries, retry_delay):
+        for delay in _retry_delays(retries, retry_delay):
+            try:
+                result = await self.get_block(block_num_or_id=str(block_num))
+            except exc.ConnectionError as e:
+                result = e
+            block = _block_or_retry(result, block_num, delay is None)
+            if block is not None:
+                return block
+            await asyncio.sleep(delay)
+
+    async def _request_host(self, host, *, endpoint, payload=dict()):
+        url = urljoin(host, endpoint)
+        started = time.monotonic()
+        try:
+            resp = await self._client().post(
+                url, json=payload, headers=_HEADERS
+            )
+        except _CONNECTION_ERRORS as e:
+            return self._record(host, started, url, payload, error=e)
+        return self._record(host, started, url, payload, resp=resp)
+
+
+class TaposProvider:
+    """
+    Chain id and reference block cache, shared by the links of a Net.
+
+    The chain id is cached forever. The reference block (last irreversible
+    block) is refreshed by get_info when it is older than refresh_interval
+    seconds or, with background=True, by a daemon thread every
+    refresh_interval seconds. It is safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        net: Net,
+        *,
+        refresh_interval: float = 60.0,
+        background: bool = False,
+    ):
+        self.net = net
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._chain_id = None
+        self._block_id = None
+        self._updated_at = None
+        self._stopped = threading.Event()
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def get(self) -> typing.Tuple[str, str]:
+        """Return the chain id and the reference block id."""
+        with self._lock:
+            if self._is_stale():
+                self._update(self.net.get_info())
+            return self._chain_id, self._block_id
+
+    def cached(self) -> typing.Optional[typing.Tuple[str, str]]:
+        """Return the chain id and the reference block id, None if stale."""
+        with self._lock:
+            if self._is_stale():
+                return None
+            return self._chain_id, self._block_id
+
+    def update(self, info: dict):
+        """Update the cache with a get_info response fetched elsewhere."""
+        with self._lock:
+            self._update(info)
+
+    def stop(self):
+        """Stop the background thread, if any."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _is_stale(self):
+        if self._block_id is None:
+            return True
+        if self._thread is not None:  # kept up to date by the thread
+            return False
+        age = time.monotonic() - self._updated_at
+        return age >= self.refresh_interval
+
+    def _update(self, info):
+        if self._chain_id is None:
+            self._chain_id = info["chain_id"]
+        self._block_id = info["last_irreversible_block_id"]
+        self._updated_at = time.monotonic()
+
+    def _run(self):
+        while True:
+            try:
+                info = self.net.get_info()
+            except exc.ConnectionError as e:
+                logging.warning(f"TAPOS refresh failed: {e}")
+            else:
+                self.update(info)
+            if self._stopped.wait(self.refresh_interval):
+                return
+
+    def __copy__(self):
+        # copies of the net (eg: in linked actions) share the same cache
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
 
 class WaxTestnet(Net):
@@ -242,10 +1117,12 @@ class WaxTestnet(Net):
 
 class WaxMainnet(Net):
     host: pydantic.HttpUrl = "https://facings.waxpub.net"
+    hosts: typing.List[pydantic.HttpUrl] = ["https://wax.greymass.com"]
 
 
 class EosMainnet(Net):
     host: pydantic.HttpUrl = "https://api.eossweden.org"
+    hosts: typing.List[pydantic.HttpUrl] = ["https://eos.greymass.com"]
 
 
 class KylinTestnet(Net):
@@ -258,6 +1135,7 @@ class Jungle3Testnet(Net):
 
 class TelosMainnet(Net):
     host: pydantic.HttpUrl = "https://telos.caleos.io/"
+    hosts: typing.List[pydantic.HttpUrl] = ["https://mainnet.telos.net"]
 
 
 class TelosTestnet(Net):
@@ -286,6 +1164,8 @@ class Local(Net):
 
 __all__ = [
     "Net",
+    "AsyncNet",
+    "TaposProvider",
     "EosMainnet",
     "KylinTestnet",
     "Jungle3Testnet",
@@ -0,0 +1,186 @@
+"""
+Client of the state history plugin (SHiP) websocket.
+
+Requires the websockets package: pip install eospyo[ship]
+
+State history plugin reference:
+https://developers.eos.io/manuals/eos/latest/nodeos/plugins/state_history_plugin/index
+"""
+
+import json
+import struct
+import typing
+
+from . import abi
+
+# types of the binary fields of get_blocks results
+_RESULT_FIELDS = {
+    "block": "signed_block",
+    "traces": "transaction_trace[]",
+    "deltas": "table_delta[]",
+}
+# raised by the readers of types on bad data, short buffers included
+_DECODE_ERRORS = (ValueError, IndexError, struct.error)
+
+
+class ShipAbi:
+    """
+    The abi sent by a state history node, compiled to read its messages.
+
+    The binary fields of get_blocks results (block, traces and deltas) are
+    decoded too, as are the rows of the deltas. bytes values (eg: action
+    data) are left as memoryviews of the message, nothing being copied.
+
+    Fields and rows that cannot be decoded (eg: blocks signed or permissions
+    set with WebAuthn keys, which PublicKey and Signature do not read, or
+    truncated data) are left as memoryviews too, rather than failing the
+    whole result.
+    """
+
+    def __init__(self, abi_: dict):
+        self.abi = abi.Abi(abi_, raw_bytes=True)
+
+    def pack_request(self, type_: str, value: dict) -> bytes:
+        """Serialize a request, eg: ("get_status_request_v0", {})."""
+        return self.abi.pack(type_="request", value=[type_, value])
+
+    def decode_result(
+        self, message: bytes, *, decode_rows: bool = True
+    ) -> typing.Tuple[str, dict]:
+        """Return the type and the content of a result message."""
+        type_, result = self.abi.unpack(type_="result", bytes_=message)
+        for name, field_type in _RESULT_FIELDS.items():
+            value = result.get(name)
+            if isinstance(value, memoryview):
+                result[name] = self._decode(field_type, value)
+        if decode_rows and isinstance(result.get("deltas"), list):
+            self._decode_rows(result["deltas"])
+        return type_, result
+
+    def _decode_rows(self, deltas):
+        for _, delta in deltas:
+            table_type = self.abi.tables.get(delta["name"])
+            if table_type is None:
+                continue
+            for row in delta["rows"]:
+                row["data"] = self._decode(table_type, row["data"])
+
+    def _decode(self, type_, data):
+        try:
+            return self.abi.unpack(type_=type_, bytes_=data)
+        except _DECODE_ERRORS:
+            return data
+
+
+class ShipClient:
+    """
+    Read blocks, traces and table deltas from a state history node.
+
+    async with ShipClient("ws://127.0.0.1:8080") as ship:
+        async for result in ship.get_blocks(start_block_num=100):
+            result["this_block"]["block_num"], result["traces"]
+
+    Results are decoded by ShipAbi.decode_result. The node sends at most
+    max_messages_in_flight results ahead of the ones consumed.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        max_messages_in_flight: int = 32,
+        decode_rows: bool = True,
+    ):
+        self.url = url
+        self.max_messages_in_flight = max_messages_in_flight
+        self.decode_rows = decode_rows
+        self.abi = None
+        self._ws = None
+
+    async def connect(self):
+        """Open the websocket and read the abi the node sends first."""
+        websockets = _import_websockets()
+        self._ws = await websockets.connect(self.url, max_size=None)
+        self.abi = ShipAbi(json.loads(await self._ws.recv()))
+
+    async def close(self):
+        if self._ws is not None:
+            await self._ws.close()
+            self._ws = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def get_status(self) -> dict:
+        """Return the head, last irreversible and available block ranges."""
+        await self._send("get_status_request_v0", {})
+        _, result = self.abi.decode_result(await self._ws.recv())
+        return result
+
+    async def get_blocks(
+        self,
+        *,
+        start_block_num: int,
+        end_block_num: int = 2**32 - 1,
+        irreversible_only: bool = False,
+        fetch_block: bool = True,
+        fetch_traces: bool = True,
+        fetch_deltas: bool = True,
+        have_positions: typing.Sequence[dict] = (),
+    ) -> typing.AsyncIterator[dict]:
+        """
+        Yield the results of the blocks from start to end (excluded).
+
+        have_positions are the {"block_num", "block_id"} already received,
+        for the node to resume from the last one on the same fork.
+        """
+        await self._send(
+            "get_blocks_request_v0",
+            dict(
+                start_block_num=start_block_num,
+                end_block_num=end_block_num,
+                max_messages_in_flight=self.max_messages_in_flight,
+                have_positions=list(have_positions),
+                irreversible_only=irreversible_only,
+                fetch_block=fetch_block,
+                fetch_traces=fetch_traces,
+                fetch_deltas=fetch_deltas,
+            ),
+        )
+        # acked by halves, so the node always has messages it may send
+        ack_every = max(1, self.max_messages_in_flight // 2)
+        unacked = 0
+        while True:
+            _, result = self.abi.decode_result(
+                await self._ws.recv(), decode_rows=self.decode_rows
+            )
+            unacked += 1
+            if unacked >= ack_every:
+                await self._send(
+                    "get_blocks_ack_request_v0", dict(num_messages=unacked)
+                )
+                unacked = 0
+            if result.get("this_block") is None:
+                continue
+            yield result
+            if result["this_block"]["block_num"] >= end_block_num - 1:
+                return
+
+    async def _send(self, type_, value):
+        await self._ws.send(self.abi.pack_request(type_, value))
+
+
+def _import_websockets():
+    try:
+        import websockets
+    except ImportError:
+        msg = "ShipClient requires websockets: pip install eospyo[ship]"
+        raise ImportError(msg)
+    return websockets
+
+
+__all__ = ["ShipAbi", "ShipClient"]
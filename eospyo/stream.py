@@ -0,0 +1,199 @@
+"""Stream of the blocks of a chain, as they are produced."""
+
+import collections
+import datetime
+import time
+import typing
+
+import pydantic
+
+from . import exc
+from .net import Net
+
+_BLOCK_SECONDS = 0.5
+_MIN_INTERVAL = 0.05  # between two polls
+_LATENCY_WEIGHT = 0.1  # of the last block in the latency average
+
+
+class BlockEvent(pydantic.BaseModel):
+    """
+    A block added to (type "block") or removed from (type "undo") the chain.
+
+    actions are the actions of the block transactions that match the filters
+    of the stream. latency is the seconds from the block timestamp to the
+    event, None for undo events.
+    """
+
+    type: typing.Literal["block", "undo"]
+    block_num: int
+    block_id: str
+    block: dict
+    actions: typing.List[dict]
+    latency: typing.Optional[float] = None
+
+    class Config:
+        extra = "forbid"
+        frozen = True
+
+
+class BlockStream:
+    """
+    Follow the head (or last irreversible) block and yield BlockEvents.
+
+    Polls get_info and get_block, waiting until the next block is due (one
+    block every 0.5 s) and twice longer after each empty poll, up to
+    max_interval seconds. When a block does not follow the previous one (a
+    micro fork), undo events are yielded for the replaced blocks, newest
+    first, before the blocks of the new branch. The blocks read are kept
+    back to the last irreversible one, and a fork replacing that block
+    raises ValueError, as the node went to a branch the stream cannot undo.
+
+    filters is a list of (account, action name) pairs, the name being None
+    for every action of account. With filters, only the blocks with
+    matching actions are yielded. Only the actions of the transactions are
+    seen, not the inline actions they send.
+
+    stream = BlockStream(net, filters=[("eosio.token", "transfer")])
+    for event in stream:
+        ...
+
+    next_block_num is the number of the next block to read, to resume later.
+    """
+
+    def __init__(
+        self,
+        net: Net,
+        *,
+        start: typing.Optional[int] = None,
+        irreversible: bool = False,
+        filters: typing.Optional[
+            typing.List[typing.Tuple[str, typing.Optional[str]]]
+        ] = None,
+        max_interval: float = 5.0,
+    ):
+        self.net = net
+        self.next_block_num = start
+        self.irreversible = irreversible
+        self.filters = None if filters is None else list(filters)
+        self.max_interval = max_interval
+        self.latency = None
+        self.average_latency = None
+        self._interval = _BLOCK_SECONDS
+        self._stopped = False
+        # (block number, block id, event or None) of the blocks read, back
+        # to the last irreversible one
+        self._blocks = collections.deque()
+
+    def __iter__(self) -> typing.Iterator[BlockEvent]:
+        self._stopped = False
+        info = self.net.get_info()
+        if self.next_block_num is None:
+            self.next_block_num = self._last_block_num(info)
+        while not self._stopped:
+            if self.next_block_num > self._last_block_num(info):
+                self._wait()
+                info = self.net.get_info()
+                continue
+            yield from self._next_events(info["last_irreversible_block_num"])
+
+    def run(self, callback: typing.Callable[[BlockEvent], None]):
+        """Call callback with every event until stop is called."""
+        for event in self:
+            callback(event)
+
+    def stop(self):
+        """End the iteration, after the current event."""
+        self._stopped = True
+
+    def _last_block_num(self, info):
+        if self.irreversible:
+            return info["last_irreversible_block_num"]
+        return info["head_block_num"]
+
+    def _wait(self):
+        time.sleep(self._interval)
+        self._interval = min(self._interval * 2, self.max_interval)
+
+    def _next_events(self, lib_num):
+        block_num = self.next_block_num
+        block = self._get_block(block_num)
+        if "id" not in block:  # not available on this node yet
+            self._wait()
+            return
+        if self._blocks and block["previous"] != self._blocks[-1][1]:
+            yield from self._undo_last_block(lib_num)
+            return
+        event = self._block_event(block)
+        self._blocks.append((block_num, block["id"], event))
+        while len(self._blocks) > 1 and self._blocks[0][0] < lib_num:
+            self._blocks.popleft()
+        self.next_block_num = block_num + 1
+        if event is not None:
+            yield event
+
+    def _get_block(self, block_num):
+        try:
+            return self.net.get_block(block_num_or_id=str(block_num))
+        except exc.ConnectionError:  # hosts down or lagging, retried later
+            return {}
+
+    def _undo_last_block(self, lib_num):
+        block_num, block_id, _ = self._blocks[-1]
+        if block_num <= lib_num:
+            msg = (
+                f"Irreversible block {block_num} ({block_id}) was replaced, "
+                "the fork point is older than the blocks kept by the stream"
+            )
+            raise ValueError(msg)
+        _, _, event = self._blocks.pop()
+        self.next_block_num = block_num
+        if event is not None:
+            yield event.copy(update=dict(type="undo", latency=None))
+
+    def _block_event(self, block):
+        seconds = _timestamp(block)
+        # the next block is due one block after this one
+        delay = seconds + _BLOCK_SECONDS - time.time()
+        self._interval = min(max(delay, _MIN_INTERVAL), _BLOCK_SECONDS)
+        actions = [a for a in _block_actions(block) if self._matches(a)]
+        if self.filters is not None and not actions:
+            return None
+        self.latency = time.time() - seconds
+        if self.average_latency is None:
+            self.average_latency = self.latency
+        else:
+            self.average_latency += _LATENCY_WEIGHT * (
+                self.latency - self.average_latency
+            )
+        return BlockEvent(
+            type="block",
+            block_num=block["block_num"],
+            block_id=block["id"],
+            block=block,
+            actions=actions,
+            latency=self.latency,
+        )
+
+    def _matches(self, action):
+        if self.filters is None:
+            return True
+        return any(
+            action["account"] == account and name in (None, action["name"])
+            for account, name in self.filters
+        )
+
+
+def _block_actions(block):
+    for receipt in block.get("transactions", []):
+        trx = receipt["trx"]
+        if isinstance(trx, dict):  # else the id of a deferred transaction
+            yield from trx["transaction"]["actions"]
+
+
+def _timestamp(block):
+    """Return the block timestamp in seconds since epoch."""
+    timestamp = datetime.datetime.fromisoformat(block["timestamp"])
+    return timestamp.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+__all__ = ["BlockEvent", "BlockStream"]
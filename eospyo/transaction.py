@@ -1,18 +1,19 @@
 """Transaction, Authorization and Action classes."""
 
 
+import calendar
 import datetime as dt
 import hashlib
 import json
 import logging
 import struct
-from typing import List, Tuple
+from typing import List, Optional, Tuple, Union
 
 import pydantic
 
 from . import types, utils
 from ._version import DEPRECATION_WARNING
-from .net import Net
+from .net import AsyncNet, Net
 
 
 class Authorization(pydantic.BaseModel):
@@ -26,13 +27,12 @@ class Authorization(pydantic.BaseModel):
     actor: pydantic.constr(min_length=1, max_length=13)
     permission: pydantic.constr(min_length=1, max_length=13)
 
+    def write(self, buffer: bytearray):
+        types.Name(self.actor).write(buffer)
+        types.Name(self.permission).write(buffer)
+
     def __bytes__(self):
-        bytes_ = b""
-        account_name = types.Name(self.actor)
-        bytes_ += bytes(account_name)
-        permission = types.Name(self.permission)
-        bytes_ += bytes(permission)
-        return bytes_
+        return _to_bytes(self)
 
     class Config:
         extra = "forbid"
@@ -89,6 +89,9 @@ class Data(pydantic.BaseModel):
         j = json.dumps(d)
         return j
 
+    def write(self, buffer: bytearray):
+        self.value.write(buffer)
+
     def __bytes__(self):
         return bytes(self.value)
 
@@ -103,17 +106,19 @@ class Action(pydantic.BaseModel):
 
     account: str
     name: str
-    data: list[Data]
+    data: list[Data] or bytes already packed (eg: by abi.Abi)
     authorization: list[Action]
     """
 
     account: pydantic.constr(max_length=13)
     name: str
     authorization: pydantic.conlist(Authorization, min_items=1, max_items=10)
-    data: List[Data]
+    data: Union[List[Data], pydantic.StrictBytes]
 
     @pydantic.validator("data", "authorization")
     def transform_to_tuple(cls, v):
+        if isinstance(v, bytes):
+            return v
         new_v = tuple(v)
         return new_v
 
@@ -143,40 +148,50 @@ class LinkedAction(Action):
 
     account: str
     name: str
-    data: list[Data]
+    data: list[Data] or bytes already packed (eg: by abi.Abi)
     authorization: list[Authorization]
     """
 
     account: pydantic.constr(max_length=13)
     name: str
     authorization: pydantic.conlist(Authorization, min_items=1, max_items=10)
-    data: List[Data]
+    data: Union[List[Data], pydantic.StrictBytes]
     net: Net
 
+    def write(self, buffer: bytearray):
+        buffer += _pack_action_head(self)
+        # data is prefixed by its length in bytes
+        data = _pack_action_data(self.data)
+        types.write_varuint32(buffer, len(data))
+        buffer += data
+
     def __bytes__(self):
-        bytes_ = b""
-        account_name = types.Name(value=self.account)
-        bytes_ += bytes(account_name)
-        action_name = types.Name(value=self.name)
-        bytes_ += bytes(action_name)
+        return _to_bytes(self)
 
-        auth_bytes = [bytes(a) for a in self.authorization]
-        auth = types.Array(type_=types.Bytes, values=auth_bytes)
-        bytes_ += bytes(auth)
 
-        data_bytes = b""
-        for d in self.data:
-            data_bytes += bytes(d)
-        data_bytes = data_bytes.hex()
-        data_bytes_list = []
-        for i in range(0, len(data_bytes), 2):
-            data_bytes_list.append(data_bytes[i : i + 2])  # NOQA: E203
-        data_bytes_list = [bytes.fromhex(b) for b in data_bytes_list]
-        data = types.Array(type_=types.Bytes, values=data_bytes_list)
+def _pack_action_head(action: Action) -> bytes:
+    buffer = bytearray()
+    types.Name(value=action.account).write(buffer)
+    types.Name(value=action.name).write(buffer)
+    types.write_varuint32(buffer, len(action.authorization))
+    for auth in action.authorization:
+        auth.write(buffer)
+    return bytes(buffer)
 
-        bytes_ += bytes(data)
 
-        return bytes_
+def _pack_action_data(data: Union[List[Data], bytes]) -> bytes:
+    if isinstance(data, bytes):
+        return data
+    buffer = bytearray()
+    for d in data:
+        d.write(buffer)
+    return bytes(buffer)
+
+
+def _to_bytes(obj) -> bytes:
+    buffer = bytearray()
+    obj.write(buffer)
+    return bytes(buffer)
 
 
 def _endian_reverse_u32(i: int) -> int:
@@ -222,10 +237,16 @@ class Transaction(pydantic.BaseModel):
     # used to link transaction to a specified network (net)
     # gets required info from net then returns a LinkedTransaction
     def link(self, *, net: Net):  # block_id: str, chain_id: str):
-        net_info = net.get_info()
-        block_id = net_info["last_irreversible_block_id"]
-        chain_id = net_info["chain_id"]
+        # no network call when net has a TAPOS cache (Net.use_tapos_cache)
+        chain_id, block_id = net.get_tapos()
+        return self._link(net=net, chain_id=chain_id, block_id=block_id)
+
+    async def link_async(self, *, net: AsyncNet):
+        """Link the transaction to an AsyncNet, like link."""
+        chain_id, block_id = await net.get_tapos()
+        return self._link(net=net, chain_id=chain_id, block_id=block_id)
 
+    def _link(self, *, net: Net, chain_id: str, block_id: str):
         ref_block_num, ref_block_prefix = _get_tapos_info(block_id=block_id)
         expiration = dt.datetime.utcnow() + dt.timedelta(
             seconds=self.expiration_delay_sec
@@ -266,58 +287,102 @@ class LinkedTransaction(Transaction):
     ref_block_num: str
     ref_block_prefix: str
     expiration: dt.datetime
+    # computed once, the model being frozen (TransactionTemplate sets
+    # _packed itself)
+    _packed: Optional[bytes] = pydantic.PrivateAttr(default=None)
+    _digest: Optional[bytes] = pydantic.PrivateAttr(default=None)
+    _id: Optional[str] = pydantic.PrivateAttr(default=None)
 
-    def __bytes__(self):
-        bytes_ = b""
-        bytes_ += bytes(types.UnixTimestamp(self.expiration))
-        bytes_ += bytes(types.Uint16(self.ref_block_num))
-        bytes_ += bytes(types.Uint32(self.ref_block_prefix))
-        bytes_ += bytes(types.Varuint32(self.max_net_usage_words))
-        bytes_ += bytes(types.Uint8(self.max_cpu_usage_ms))
-        bytes_ += bytes(types.Varuint32(self.delay_sec))
-        # context_free_actions
-        bytes_ += bytes(types.Array(type_=types.Int8, values=[]))
-
-        actions_bytes = [bytes(act) for act in self.actions]
-        actions = types.Array(type_=types.Bytes, values=actions_bytes)
-        bytes_ += bytes(actions)
-
-        # transaction_extensions
-        bytes_ += bytes(types.Array(type_=types.Int8, values=[]))
+    def write(self, buffer: bytearray):
+        buffer += bytes(self)
 
-        return bytes_
+    def __bytes__(self):
+        if self._packed is None:
+            buffer = bytearray()
+            self._write_fields(buffer)
+            self._packed = bytes(buffer)
+        return self._packed
+
+    def _write_fields(self, buffer):
+        types.UnixTimestamp(self.expiration).write(buffer)
+        types.Uint16(self.ref_block_num).write(buffer)
+        types.Uint32(self.ref_block_prefix).write(buffer)
+        types.write_varuint32(buffer, self.max_net_usage_words)
+        types.Uint8(self.max_cpu_usage_ms).write(buffer)
+        types.write_varuint32(buffer, self.delay_sec)
+        buffer += b"\x00"  # context_free_actions
+
+        types.write_varuint32(buffer, len(self.actions))
+        for action in self.actions:
+            action.write(buffer)
+
+        buffer += b"\x00"  # transaction_extensions
+
+    def copy(self, *, update: Optional[dict] = None, **kwargs):
+        trans = super().copy(update=update, **kwargs)
+        if update:  # caches would not match the updated fields
+            trans._packed = trans._digest = trans._id = None
+        return trans
 
     def id(self):
-        hash256 = hashlib.sha256()
-        hash256.update(bytes(self))
-        hash256_digest = hash256.digest()
-        return hash256_digest.hex()
-
-    def sign(self, key: str):
-        signs = []
-        if hasattr(self, "signatures"):
-            signs = list(self.signatures)
+        if self._id is None:
+            self._id = hashlib.sha256(bytes(self)).hexdigest()
+        return self._id
+
+    def sign(self, key: Union[str, utils.PrivateKey]):
+        """
+        Sign the transaction and return a SignedTransaction.
+
+        key can be a WIF string or a utils.PrivateKey.
+        """
+        digest = self._signing_digest()
+        signature = utils.sign_digest(digest=digest, key=key)
+        return self._add_signature(signature)
+
+    @staticmethod
+    def sign_batch(
+        transactions: List["LinkedTransaction"],
+        key: Union[str, utils.PrivateKey, utils.SignerPool],
+        workers: Optional[int] = None,
+    ) -> List["SignedTransaction"]:
+        """
+        Sign many transactions with the same key.
+
+        Signatures are computed in a pool of processes (see utils.sign_many)
+        and the SignedTransactions are returned in the input order. Pass a
+        utils.SignerPool as key to reuse its processes across batches.
+        """
+        transactions = list(transactions)
+        signatures = utils.sign_many(
+            bytes_list=[t._signing_bytes() for t in transactions],
+            key=key,
+            workers=workers,
+        )
+        return [t._add_signature(s) for t, s in zip(transactions, signatures)]
 
+    def _signing_bytes(self):
         chain_bytes = bytes.fromhex(self.chain_id)
         trans_bytes = bytes(self)
         zero_bytes = bytes.fromhex("0" * 64)
-        bytes_ = chain_bytes + trans_bytes + zero_bytes
-
-        signature = utils.sign_bytes(bytes_=bytes_, key=key)
-        signs.append(signature)
-        trans = SignedTransaction(
-            net=self.net,
-            actions=self.actions,
-            expiration_delay_sec=self.expiration_delay_sec,
-            delay_sec=self.delay_sec,
-            max_cpu_usage_ms=self.max_cpu_usage_ms,
-            max_net_usage_words=self.max_net_usage_words,
-            chain_id=self.chain_id,
-            ref_block_num=self.ref_block_num,
-            ref_block_prefix=self.ref_block_prefix,
-            expiration=self.expiration,
-            signatures=tuple(signs),
-        )
+        return chain_bytes + trans_bytes + zero_bytes
+
+    def _signing_digest(self):
+        if self._digest is None:
+            self._digest = hashlib.sha256(self._signing_bytes()).digest()
+        return self._digest
+
+    def _add_signature(self, signature):
+        signs = getattr(self, "signatures", ()) + (signature,)
+        if len(signs) > 10:
+            raise ValueError("A transaction can have at most 10 signatures")
+        # every field is already validated: share them instead of
+        # validating the actions, authorizations, data and net again
+        values = dict(self.__dict__, signatures=signs)
+        trans = SignedTransaction.construct(**values)
+        # signatures are not part of the packed transaction
+        trans._packed = self._packed
+        trans._digest = self._digest
+        trans._id = self._id
         return trans
 
 
@@ -339,11 +404,162 @@ class SignedTransaction(LinkedTransaction):
         bytes_ = bytes(self)
         return bytes_.hex()
 
+    def public_keys(self) -> List[str]:
+        """Return the public keys recovered from each signature."""
+        digest = self._signing_digest()
+        return [
+            utils.recover_public_key(digest=digest, signature=s)
+            for s in self.signatures
+        ]
+
+    def verify(self, public_keys: Optional[List[str]] = None) -> bool:
+        """
+        Check the signatures locally, before sending the transaction.
+
+        Return True when every key in public_keys (EOS... or PUB_K1_...)
+        has signed this transaction. Without public_keys, only check that
+        every signature is well formed and recovers to a public key.
+        """
+        try:
+            signers = {utils._decode_public_key(k) for k in self.public_keys()}
+            required = {utils._decode_public_key(k) for k in public_keys or []}
+        except ValueError:
+            return False
+        return required <= signers
+
     def send(self):
         logging.warning(DEPRECATION_WARNING)
         resp = self.net.push_transaction(transaction=self)
         return resp
 
+    async def send_async(self):
+        """Send the transaction through its AsyncNet, like send."""
+        logging.warning(DEPRECATION_WARNING)
+        return await self.net.push_transaction(transaction=self)
+
+
+class TransactionTemplate:
+    """
+    Transaction whose invariant parts are packed only once.
+
+    The header, the account, name and authorization of every action and
+    the transaction extensions are packed when the template is created.
+    Each link only packs the TAPOS and expiration fields and the data of
+    the actions, which is the template one when None is given.
+
+    template = TransactionTemplate(Transaction(actions=[transfer]))
+    linked = template.link(net=net, data=[abi.abi_json_to_bin(...)])
+    linked = await template.link_async(net=async_net)  # with an AsyncNet
+    """
+
+    def __init__(self, transaction: Transaction):
+        self.transaction = transaction
+        tail = bytearray()
+        types.write_varuint32(tail, transaction.max_net_usage_words)
+        types.Uint8(transaction.max_cpu_usage_ms).write(tail)
+        types.write_varuint32(tail, transaction.delay_sec)
+        tail += b"\x00"  # context_free_actions
+        types.write_varuint32(tail, len(transaction.actions))
+        self._header_tail = bytes(tail)
+        self._action_heads = [
+            _pack_action_head(a) for a in transaction.actions
+        ]
+        self._action_data = [
+            _pack_action_data(a.data) for a in transaction.actions
+        ]
+
+    def link(
+        self,
+        *,
+        net: Net,
+        data: Optional[List[Union[List[Data], bytes, None]]] = None,
+    ) -> LinkedTransaction:
+        """
+        Return a LinkedTransaction with the new data of each action.
+
+        data has one item per action: a list of Data, packed bytes or None.
+        """
+        data = self._check_data(data)
+        chain_id, block_id = net.get_tapos()
+        return self._link(
+            net=net, data=data, chain_id=chain_id, block_id=block_id
+        )
+
+    async def link_async(
+        self,
+        *,
+        net: AsyncNet,
+        data: Optional[List[Union[List[Data], bytes, None]]] = None,
+    ) -> LinkedTransaction:
+        """Link the template to an AsyncNet, like link."""
+        data = self._check_data(data)
+        chain_id, block_id = await net.get_tapos()
+        return self._link(
+            net=net, data=data, chain_id=chain_id, block_id=block_id
+        )
+
+    def _check_data(self, data):
+        actions = self.transaction.actions
+        if data is None:
+            return [None] * len(actions)
+        if len(data) != len(actions):
+            msg = f"{len(actions)} data expected, {len(data)} found."
+            raise ValueError(msg)
+        return data
+
+    def _link(self, *, net, data, chain_id, block_id):
+        actions = self.transaction.actions
+        ref_block_num, ref_block_prefix = _get_tapos_info(block_id=block_id)
+        expiration = dt.datetime.utcnow().replace(
+            microsecond=0
+        ) + dt.timedelta(seconds=self.transaction.expiration_delay_sec)
+
+        buffer = bytearray(
+            struct.pack(
+                "<IHI",
+                calendar.timegm(expiration.timetuple()),
+                ref_block_num,
+                ref_block_prefix,
+            )
+        )
+        buffer += self._header_tail
+        linked_actions = []
+        for action, head, template_data, new_data in zip(
+            actions, self._action_heads, self._action_data, data
+        ):
+            if new_data is None:
+                action_data = template_data
+            else:
+                action_data = _pack_action_data(new_data)
+            buffer += head
+            types.write_varuint32(buffer, len(action_data))
+            buffer += action_data
+            linked_actions.append(
+                LinkedAction.construct(
+                    account=action.account,
+                    name=action.name,
+                    authorization=action.authorization,
+                    data=action_data,
+                    net=net,
+                )
+            )
+        buffer += b"\x00"  # transaction_extensions
+
+        trans = LinkedTransaction.construct(
+            actions=tuple(linked_actions),
+            net=net,
+            expiration_delay_sec=self.transaction.expiration_delay_sec,
+            delay_sec=self.transaction.delay_sec,
+            max_cpu_usage_ms=self.transaction.max_cpu_usage_ms,
+            max_net_usage_words=self.transaction.max_net_usage_words,
+            chain_id=chain_id,
+            ref_block_num=str(ref_block_num),
+            ref_block_prefix=str(ref_block_prefix),
+            expiration=expiration,
+        )
+        trans._packed = bytes(buffer)
+        return trans
+
 
 __all__ = [
     "Action",
@@ -353,4 +569,5 @@ __all__ = [
     "LinkedTransaction",
     "SignedTransaction",
     "LinkedAction",
+    "TransactionTemplate",
 ]
@@ -5,13 +5,38 @@ import datetime as dt
 import re
 import struct
 import sys
-from abc import ABC, abstractmethod
+from abc import ABC
 
+import base58
 import pydantic
 
+from . import utils
+
+_EPOCH = dt.datetime(1970, 1, 1)
+_BLOCK_EPOCH = dt.datetime(2000, 1, 1)
+_BLOCK_INTERVAL = dt.timedelta(milliseconds=500)
+# key and signature types, in the order of their variant index
+_KEY_TYPES = ["K1", "R1"]
+
 
 class EosioType(pydantic.BaseModel, ABC):
+    # serialization methods of which subclasses must define at least one
+    _SERIALIZERS = (("write", "__bytes__"), ("from_buffer", "from_bytes"))
+    _missing = _SERIALIZERS
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._missing = [
+            names
+            for names in cls._SERIALIZERS
+            if not any(_overrides(cls, name) for name in names)
+        ]
+
     def __init__(self, *args, **kwargs):
+        if self._missing:
+            missing = " and ".join(" or ".join(n) for n in self._missing)
+            msg = f"Can't instantiate {type(self).__name__} without {missing}"
+            raise TypeError(msg)
         if len(args) == 1 and len(kwargs) == 0:
             super().__init__(value=args[0])
         else:
@@ -23,13 +48,50 @@ class EosioType(pydantic.BaseModel, ABC):
             return v.value
         return v
 
-    @abstractmethod
+    def write(self, buffer: bytearray):
+        """
+        Append the serialized instance to buffer.
+
+        Types define write or, as before it existed, __bytes__.
+        """
+        buffer += self.__bytes__()
+
     def __bytes__(self):
         """Convert instance to bytes."""
+        buffer = bytearray()
+        self.write(buffer)
+        return bytes(buffer)
+
+    @classmethod
+    def trusted(cls, value):
+        """
+        Create an instance without running any validation.
+
+        Only for values known to be valid: decoded by from_buffer or already
+        validated somewhere else. Anything else may serialize to garbage.
+        """
+        return cls.construct(value=value)
 
-    @abstractmethod
-    def from_bytes(self):
+    @classmethod
+    def from_bytes(cls, bytes_):
         """Create instance from bytes."""
+        instance, _ = cls.from_buffer(memoryview(bytes_))
+        return instance
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        """
+        Read an instance from buffer, starting at offset.
+
+        buffer is anything that supports the buffer protocol, preferably a
+        memoryview so nothing is copied. Return the instance and the offset
+        right after its last byte.
+
+        Types define from_buffer or, as before it existed, from_bytes. Those
+        are given the rest of buffer and read as long as their bytes.
+        """
+        instance = cls.from_bytes(bytes(buffer[offset:]))
+        return instance, offset + len(instance)
 
     def __len__(self):
         """Lenght of value in bytes."""
@@ -41,6 +103,12 @@ class EosioType(pydantic.BaseModel, ABC):
         frozen = True
 
 
+def _overrides(class_, name):
+    """Whether class_ or a base below EosioType defines the method name."""
+    mro = class_.__mro__
+    return any(name in vars(base) for base in mro[: mro.index(EosioType)])
+
+
 class UnixTimestamp(EosioType):
     """
     Serialize a datetime.
@@ -56,38 +124,35 @@ class UnixTimestamp(EosioType):
         new_v = v.replace(microsecond=0)
         return new_v
 
-    def __bytes__(self):
+    def write(self, buffer):
         unix_secs = calendar.timegm(self.value.timetuple())
-        uint32_secs = Uint32(value=unix_secs)
-        bytes_ = bytes(uint32_secs)
-        return bytes_
+        Uint32(value=unix_secs).write(buffer)
 
     @classmethod
-    def from_bytes(cls, bytes_):
-        uint32_secs = Uint32.from_bytes(bytes_)
+    def from_buffer(cls, buffer, offset=0):
+        uint32_secs, offset = Uint32.from_buffer(buffer, offset)
         datetime = dt.datetime.utcfromtimestamp(uint32_secs.value)
-        return cls(value=datetime)
+        return cls.trusted(datetime), offset
 
 
 class Bool(EosioType):
     value: bool
 
-    def __bytes__(self):
-        return b"\x01" if self.value else b"\x00"
+    def write(self, buffer):
+        buffer += b"\x01" if self.value else b"\x00"
 
     @classmethod
-    def from_bytes(cls, bytes_):
-        return cls(value=int(bytes_[:1].hex(), 16))
+    def from_buffer(cls, buffer, offset=0):
+        return cls.trusted(bool(buffer[offset])), offset + 1
 
 
 class String(EosioType):
     value: str
 
-    def __bytes__(self):
+    def write(self, buffer):
         bytes_ = self.value.encode("utf8")
-        length = len(bytes_)
-        bytes_ = bytes(Varuint32(value=length)) + bytes_
-        return bytes_
+        write_varuint32(buffer, len(bytes_))
+        buffer += bytes_
 
     @pydantic.validator("value")
     def must_not_contain_multi_utf_char(cls, v):
@@ -101,12 +166,11 @@ class String(EosioType):
         return v
 
     @classmethod
-    def from_bytes(cls, bytes_):
-        size = Varuint32.from_bytes(bytes_)
-        start = len(size)
-        string_bytes = bytes_[start : start + size.value]  # NOQA: E203
-        value = string_bytes.decode("utf8")
-        return cls(value=value)
+    def from_buffer(cls, buffer, offset=0):
+        size, offset = Varuint32.from_buffer(buffer, offset)
+        end = offset + size.value
+        value = str(buffer[offset:end], "utf8")
+        return cls.trusted(value), end
 
 
 class Asset(EosioType):
@@ -197,37 +261,24 @@ class Asset(EosioType):
         """
         return len(self.get_frac_digits())
 
-    def __bytes__(self):
-
+    def write(self, buffer):
         amount = Uint64(int(self.get_int_digits() + self.get_frac_digits()))
-        name = self.get_name()
-        symbol = Symbol(str(self.get_precision()) + "," + name)
-
-        amount_bytes = bytes(amount)
-        symbol_bytes = bytes(symbol)
-
-        return amount_bytes + symbol_bytes
+        amount.write(buffer)
+        # precision and name were validated with the asset itself
+        symbol = str(self.get_precision()) + "," + self.get_name()
+        Symbol.trusted(symbol).write(buffer)
 
     @classmethod
-    def from_bytes(cls, bytes_):
-        amount_bytes = bytes_[:8]  # get first 8 bytes
-        asset_precision = bytes_[8]  # (amount of decimal places)
-        amount = str(
-            struct.unpack("<Q", amount_bytes)[0]
-        )  # amount with decimal values (no decimal splitting yet)
-        # get name (currency) from Symbol
-        name = str(Symbol.from_bytes(bytes_[8:])).split(",")[1][:-1]
-        if asset_precision == 0:
-            value = amount + " " + name
-        else:
-            value = (
-                amount[:-asset_precision]
-                + "."  # noqa: W503
-                + amount[asset_precision + 1 :]  # noqa: W503, E203
-                + " "  # noqa: W503
-                + name  # noqa: W503
-            )  # combine everything and place decimal in correct position
-        return cls(value=value)
+    def from_buffer(cls, buffer, offset=0):
+        amount = struct.unpack_from("<Q", buffer, offset)[0]
+        symbol, offset = Symbol.from_buffer(buffer, offset + 8)
+        precision, name = symbol.value.split(",")
+        precision = int(precision)
+        amount = str(amount)
+        if precision > 0:
+            amount = amount.rjust(precision + 1, "0")
+            amount = amount[:-precision] + "." + amount[-precision:]
+        return cls.trusted(amount + " " + name), offset
 
     @pydantic.validator("value")
     def amount_must_be_in_the_valid_range(cls, v):
@@ -312,51 +363,31 @@ class Symbol(EosioType):
             raise ValueError(msg)
         return v
 
-    def __bytes__(self):
-        precision = int(self.value.split(",")[0])
-        precision_bytes_ = struct.pack("<B", (precision & 0xFF))
-        bytes_ = precision_bytes_
-        name = self.value.split(",")[1]
-        name_bytes_ = name.encode("utf8")
-        bytes_ += name_bytes_
-        leftover_byte_space = len(name) + 1
-        while (
-            leftover_byte_space < 8
-        ):  # add null bytes in remaining empty space
-            bytes_ += struct.pack("<B", 0)
-            leftover_byte_space += 1
-        return bytes_
+    def write(self, buffer):
+        precision, name = self.value.split(",")
+        buffer.append(int(precision) & 0xFF)
+        # add null bytes in remaining empty space
+        buffer += name.encode("utf8").ljust(7, b"\x00")
 
     @classmethod
-    def from_bytes(cls, bytes_):
-        bytes_len = len(bytes_)
-        precision = ""
-        name = ""
-        for i in range(bytes_len):
-            if chr(bytes_[i]).isupper():
-                precision = str(bytes_[0])
-                name_bytes = bytes_[i:]  # name is all bytes after precision
-                for k in range(1, len(name_bytes) + 1):
-                    if not chr(bytes_[k]).isupper():
-                        name_bytes = name_bytes[
-                            : k - 1
-                        ]  # name only goes up to the last upper case character
-                name = name_bytes.decode("utf8")
-                break
-
-        value = precision + "," + name
-        return cls(value=value)
+    def from_buffer(cls, buffer, offset=0):
+        precision = buffer[offset]
+        name_bytes = bytes(buffer[offset + 1 : offset + 8])  # NOQA: E203
+        name = name_bytes.rstrip(b"\x00").decode("utf8")
+        value = str(precision) + "," + name
+        return cls.trusted(value), offset + 8
 
 
 class Bytes(EosioType):
     value: bytes
 
-    def __bytes__(self):
-        return self.value
+    def write(self, buffer):
+        buffer += self.value
 
     @classmethod
-    def from_bytes(cls, bytes_):
-        return cls(value=bytes_)
+    def from_buffer(cls, buffer, offset=0):
+        """Bytes have no length prefix: read until the end of buffer."""
+        return cls.trusted(bytes(buffer[offset:])), len(buffer)
 
 
 class Array(EosioType):
@@ -380,27 +411,40 @@ class Array(EosioType):
         all_values["values"] = values
         return all_values
 
-    def __bytes__(self):
-        bytes_ = b""
-        length = Varuint32(len(self.values))
-        bytes_ += bytes(length)
+    @classmethod
+    def of_trusted(cls, type_, values):
+        """
+        Create an Array without validating type_ or its values.
+
+        values can be instances of type_ or raw values known to be valid for
+        it (see EosioType.trusted).
+        """
+        values = tuple(
+            v if type(v) is type_ else type_.trusted(v) for v in values
+        )
+        return cls.construct(values=values, type_=type_)
+
+    def write(self, buffer):
+        write_varuint32(buffer, len(self.values))
         for value in self.values:
-            bytes_ += bytes(value)
-        return bytes_
+            value.write(buffer)
 
     @classmethod
     def from_bytes(cls, bytes_, type_):
-        length = Varuint32.from_bytes(bytes_)
-        bytes_ = bytes_[len(length) :]  # NOQA: E203
+        instance, _ = cls.from_buffer(memoryview(bytes_), 0, type_)
+        return instance
+
+    @classmethod
+    def from_buffer(cls, buffer, offset, type_):
+        length, offset = Varuint32.from_buffer(buffer, offset)
         values = []
-        for n in range(length.value):
-            value = type_.from_bytes(bytes_)
-            values.append(value.value)
-            bytes_ = bytes_[len(value) :]  # NOQA: E203
-        return cls(values=values, type_=type_)
+        for _ in range(length.value):
+            value, offset = type_.from_buffer(buffer, offset)
+            values.append(value)
+        return cls.of_trusted(type_, values), offset
 
     def __getitem__(self, index):
-        return Array(values=self.values[index], type_=self.type_)
+        return Array.of_trusted(self.type_, self.values[index])
 
 
 class Name(EosioType):
@@ -428,16 +472,14 @@ class Name(EosioType):
                 raise ValueError(msg)
         return v
 
-    def __bytes__(self):
-        value_int = self.string_to_uint64(self.value)
-        uint64 = Uint64(value=value_int)
-        return bytes(uint64)
+    def write(self, buffer):
+        buffer += struct.pack("<Q", self.string_to_uint64(self.value))
 
     @classmethod
-    def from_bytes(cls, bytes_):
-        uint64 = Uint64.from_bytes(bytes_)
-        value_str = cls.uint64_to_string(uint64.value, strip_dots=True)
-        return cls(value=value_str)
+    def from_buffer(cls, buffer, offset=0):
+        uint64 = struct.unpack_from("<Q", buffer, offset)[0]
+        value_str = cls.uint64_to_string(uint64, strip_dots=True)
+        return cls.trusted(value_str), offset + 8
 
     @classmethod
     def char_to_symbol(cls, c):
@@ -481,98 +523,372 @@ class Name(EosioType):
 class Int8(EosioType):
     value: pydantic.conint(ge=-128, lt=128)
 
-    def __bytes__(self):
-        return struct.pack("<b", self.value)
+    def write(self, buffer):
+        buffer += struct.pack("<b", self.value)
 
     @classmethod
-    def from_bytes(cls, bytes_):
-        struct_tuple = struct.unpack("<b", bytes_[:1])
-        value = struct_tuple[0]
-        return cls(value=value)
+    def from_buffer(cls, buffer, offset=0):
+        value = struct.unpack_from("<b", buffer, offset)[0]
+        return cls.trusted(value), offset + 1
 
 
 class Uint8(EosioType):
     value: pydantic.conint(ge=0, lt=256)  # 2 ** 8
 
-    def __bytes__(self):
-        return struct.pack("<B", self.value)
+    def write(self, buffer):
+        buffer += struct.pack("<B", self.value)
 
     @classmethod
-    def from_bytes(cls, bytes_):
-        struct_tuple = struct.unpack("<B", bytes_[:1])
-        value = struct_tuple[0]
-        return cls(value=value)
+    def from_buffer(cls, buffer, offset=0):
+        value = struct.unpack_from("<B", buffer, offset)[0]
+        return cls.trusted(value), offset + 1
 
 
 class Uint16(EosioType):
     value: pydantic.conint(ge=0, lt=65536)  # 2 ** 16
 
-    def __bytes__(self):
-        return struct.pack("<H", self.value)
+    def write(self, buffer):
+        buffer += struct.pack("<H", self.value)
 
     @classmethod
-    def from_bytes(cls, bytes_):
-        struct_tuple = struct.unpack("<H", bytes_[:2])
-        value = struct_tuple[0]
-        return cls(value=value)
+    def from_buffer(cls, buffer, offset=0):
+        value = struct.unpack_from("<H", buffer, offset)[0]
+        return cls.trusted(value), offset + 2
 
 
 class Uint32(EosioType):
     value: pydantic.conint(ge=0, lt=4294967296)  # 2 ** 32
 
-    def __bytes__(self):
-        return struct.pack("<I", self.value)
+    def write(self, buffer):
+        buffer += struct.pack("<I", self.value)
 
     @classmethod
-    def from_bytes(cls, bytes_):
-        struct_tuple = struct.unpack("<I", bytes_[:4])
-        value = struct_tuple[0]
-        return cls(value=value)
+    def from_buffer(cls, buffer, offset=0):
+        value = struct.unpack_from("<I", buffer, offset)[0]
+        return cls.trusted(value), offset + 4
 
 
 class Uint64(EosioType):
     value: pydantic.conint(ge=0, lt=18446744073709551616)  # 2 ** 64
 
-    def __bytes__(self):
-        return struct.pack("<Q", self.value)
+    def write(self, buffer):
+        buffer += struct.pack("<Q", self.value)
 
     @classmethod
-    def from_bytes(cls, bytes_):
-        struct_tuple = struct.unpack("<Q", bytes_)
-        value = struct_tuple[0]
-        return cls(value=value)
+    def from_buffer(cls, buffer, offset=0):
+        value = struct.unpack_from("<Q", buffer, offset)[0]
+        return cls.trusted(value), offset + 8
+
+
+class Int16(EosioType):
+    value: pydantic.conint(ge=-32768, lt=32768)  # 2 ** 15
+
+    def write(self, buffer):
+        buffer += struct.pack("<h", self.value)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        value = struct.unpack_from("<h", buffer, offset)[0]
+        return cls.trusted(value), offset + 2
+
+
+class Int32(EosioType):
+    value: pydantic.conint(ge=-2147483648, lt=2147483648)  # 2 ** 31
+
+    def write(self, buffer):
+        buffer += struct.pack("<i", self.value)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        value = struct.unpack_from("<i", buffer, offset)[0]
+        return cls.trusted(value), offset + 4
+
+
+class Int64(EosioType):
+    value: pydantic.conint(
+        ge=-9223372036854775808, lt=9223372036854775808  # 2 ** 63
+    )
+
+    def write(self, buffer):
+        buffer += struct.pack("<q", self.value)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        value = struct.unpack_from("<q", buffer, offset)[0]
+        return cls.trusted(value), offset + 8
+
+
+class Uint128(EosioType):
+    value: pydantic.conint(ge=0, lt=2**128)
+
+    def write(self, buffer):
+        buffer += self.value.to_bytes(16, "little")
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        end = offset + 16
+        value = int.from_bytes(buffer[offset:end], "little")
+        return cls.trusted(value), end
+
+
+class Int128(EosioType):
+    value: pydantic.conint(ge=-(2**127), lt=2**127)
+
+    def write(self, buffer):
+        buffer += self.value.to_bytes(16, "little", signed=True)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        end = offset + 16
+        value = int.from_bytes(buffer[offset:end], "little", signed=True)
+        return cls.trusted(value), end
+
+
+class Float32(EosioType):
+    value: float
+
+    def write(self, buffer):
+        buffer += struct.pack("<f", self.value)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        value = struct.unpack_from("<f", buffer, offset)[0]
+        return cls.trusted(value), offset + 4
+
+
+class Float64(EosioType):
+    value: float
+
+    def write(self, buffer):
+        buffer += struct.pack("<d", self.value)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        value = struct.unpack_from("<d", buffer, offset)[0]
+        return cls.trusted(value), offset + 8
+
+
+class Float128(EosioType):
+    """16 bytes quadruple precision float, as the hex string of its bytes."""
+
+    value: pydantic.constr(regex=r"^[0-9a-fA-F]{32}$")  # NOQA: F722
+
+    def write(self, buffer):
+        buffer += bytes.fromhex(self.value)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        end = offset + 16
+        return cls.trusted(buffer[offset:end].hex()), end
+
+
+class Checksum160(EosioType):
+    """20 bytes hash as an hex string."""
+
+    value: pydantic.constr(regex=r"^[0-9a-fA-F]{40}$")  # NOQA: F722
+
+    def write(self, buffer):
+        buffer += bytes.fromhex(self.value)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        end = offset + 20
+        return cls.trusted(buffer[offset:end].hex()), end
+
+
+class Checksum256(EosioType):
+    """32 bytes hash (eg: transaction and block ids) as an hex string."""
+
+    value: pydantic.constr(regex=r"^[0-9a-fA-F]{64}$")  # NOQA: F722
+
+    def write(self, buffer):
+        buffer += bytes.fromhex(self.value)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        end = offset + 32
+        return cls.trusted(buffer[offset:end].hex()), end
+
+
+class Checksum512(EosioType):
+    """64 bytes hash as an hex string."""
+
+    value: pydantic.constr(regex=r"^[0-9a-fA-F]{128}$")  # NOQA: F722
+
+    def write(self, buffer):
+        buffer += bytes.fromhex(self.value)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        end = offset + 64
+        return cls.trusted(buffer[offset:end].hex()), end
+
+
+class TimePoint(EosioType):
+    """
+    Serialize a datetime.
+
+    Precision is in microseconds
+    Considers UTC time
+    """
+
+    value: dt.datetime
+
+    def write(self, buffer):
+        delta = self.value.replace(tzinfo=None) - _EPOCH
+        microseconds = delta // dt.timedelta(microseconds=1)
+        buffer += struct.pack("<q", microseconds)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        microseconds = struct.unpack_from("<q", buffer, offset)[0]
+        value = _EPOCH + dt.timedelta(microseconds=microseconds)
+        return cls.trusted(value), offset + 8
+
+
+class SymbolCode(EosioType):
+    """
+    Serialize a symbol code: the name of a Symbol without its precision.
+
+    example: WAX
+    """
+
+    value: pydantic.constr(regex=r"^[A-Z]{1,7}$")  # NOQA: F722
+
+    def write(self, buffer):
+        buffer += self.value.encode("utf8").ljust(8, b"\x00")
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        end = offset + 8
+        value = bytes(buffer[offset:end]).rstrip(b"\x00").decode("utf8")
+        return cls.trusted(value), end
+
+
+class BlockTimestamp(EosioType):
+    """
+    Serialize a datetime as a block slot (abi type block_timestamp_type).
+
+    Precision is in half seconds
+    Considers UTC time
+    """
+
+    value: dt.datetime
+
+    def write(self, buffer):
+        delta = self.value.replace(tzinfo=None) - _BLOCK_EPOCH
+        Uint32(value=delta // _BLOCK_INTERVAL).write(buffer)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        slot = struct.unpack_from("<I", buffer, offset)[0]
+        return cls.trusted(_BLOCK_EPOCH + slot * _BLOCK_INTERVAL), offset + 4
+
+
+class PublicKey(EosioType):
+    """
+    Serialize a K1 or R1 public key.
+
+    example: PUB_K1_6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5BoDq63
+    Legacy keys (EOS6MRyAj...) are accepted, PUB_ keys are returned.
+    """
+
+    value: pydantic.constr(regex=r"^(EOS|PUB_(K1|R1)_)\w+$")  # NOQA: F722
+
+    def write(self, buffer):
+        _write_key(buffer, self.value, size=33)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        value, offset = _read_key(buffer, offset, "PUB", size=33)
+        return cls.trusted(value), offset
+
+
+class Signature(EosioType):
+    """Serialize a K1 or R1 signature (SIG_K1_... or SIG_R1_...)."""
+
+    value: pydantic.constr(regex=r"^SIG_(K1|R1)_\w+$")  # NOQA: F722
+
+    def write(self, buffer):
+        _write_key(buffer, self.value, size=65)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        value, offset = _read_key(buffer, offset, "SIG", size=65)
+        return cls.trusted(value), offset
+
+
+def _write_key(buffer, value, *, size):
+    if value.startswith("EOS"):
+        key_type, encoded, suffix = "K1", value[3:], b""
+    else:
+        _, key_type, encoded = value.split("_", 2)
+        suffix = key_type.encode()
+    data = base58.b58decode(encoded)
+    raw, checksum = data[:-4], data[-4:]
+    if len(raw) != size or utils._ripmed160(raw + suffix)[:4] != checksum:
+        raise ValueError(f"Invalid key or signature: {value}")
+    buffer.append(_KEY_TYPES.index(key_type))
+    buffer += raw
+
+
+def _read_key(buffer, offset, prefix, *, size):
+    index = buffer[offset]
+    if index >= len(_KEY_TYPES):
+        msg = f"Unsupported {prefix} type {index} (only K1 and R1 are)"
+        raise ValueError(msg)
+    key_type = _KEY_TYPES[index]
+    start, end = offset + 1, offset + 1 + size
+    raw = bytes(buffer[start:end])
+    checksum = utils._ripmed160(raw + key_type.encode())[:4]
+    encoded = base58.b58encode(raw + checksum).decode("ascii")
+    return f"{prefix}_{key_type}_{encoded}", end
 
 
 class Varuint32(EosioType):
     value: pydantic.conint(ge=0, le=20989371979)
 
-    def __bytes__(self):
-        bytes_ = b""
-        val = self.value
-        while True:
-            b = val & 0x7F
-            val >>= 7
-            b |= (val > 0) << 7
-            uint8 = Uint8(value=b)
-            bytes_ += bytes(uint8)
-            if not val:
-                break
-        return bytes_
+    def write(self, buffer):
+        write_varuint32(buffer, self.value)
 
     @classmethod
-    def from_bytes(cls, bytes_):
-        offset = 0
+    def from_buffer(cls, buffer, offset=0):
         value = 0
-        for n, byte in enumerate(bytes_):
-            partial_value = byte & 0x7F  # only the 7 first bits matter
-            partial_value_offset = partial_value << offset
-            value |= partial_value_offset
-            offset += 7
-            if n >= 8:
-                break
+        shift = 0
+        for _ in range(9):
+            byte = buffer[offset]
+            offset += 1
+            value |= (byte & 0x7F) << shift  # only the 7 first bits matter
+            shift += 7
             if not byte & 0x80:  # first bit (carry) off
                 break
-        return cls(value=value)
+        return cls.trusted(value), offset
+
+
+class Varint32(EosioType):
+    """Signed 32 bits integer, zigzag encoded as a varuint32."""
+
+    value: pydantic.conint(ge=-(2**31), lt=2**31)
+
+    def write(self, buffer):
+        write_varuint32(buffer, (self.value << 1) ^ (self.value >> 31))
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        zigzag, offset = Varuint32.from_buffer(buffer, offset)
+        value = (zigzag.value >> 1) ^ -(zigzag.value & 1)
+        return cls.trusted(value), offset
+
+
+def write_varuint32(buffer: bytearray, value: int):
+    """Append value to buffer as a varuint32, without a Varuint32 instance."""
+    while True:
+        b = value & 0x7F
+        value >>= 7
+        if not value:
+            buffer.append(b)
+            return
+        buffer.append(b | 0x80)
 
 
 def _get_all_types():
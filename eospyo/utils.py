@@ -1,10 +1,13 @@
 """Utility functions."""
 
+import concurrent.futures
+import functools
 import hashlib
 import hmac
 import io
-import re
+import os
 import struct
+from typing import Iterable, List, Optional, Union
 
 import base58
 
@@ -15,15 +18,122 @@ Gx = 550662630222773436695787188951685343262506034537775941755001873603891167292
 Gy = 32670510020758816978083085130507043184471273380659243275938904335757337482424  # NOQA: E501
 G = (Gx, Gy)
 
+# Fixed-base multiplication of G uses a table of precomputed affine points:
+# row i holds j * 2 ** (i * _G_WINDOW) * G for j in [0, 2 ** _G_WINDOW).
+# It is built on first use and shared by every signature afterwards.
+_G_WINDOW = 4
+_G_TABLE = None
+
+
+class PrivateKey:
+    """
+    A WIF private key, parsed and validated once.
+
+    Keeps the integer scalar, its 32 bytes encoding and the derived public
+    key, so signing many times with the same key doesn't decode it again.
+
+    key = PrivateKey("5K...")
+    key.public_key  # "EOS..."
+    """
+
+    def __init__(self, wif: str):
+        try:
+            bin_p = _b58check_to_bin(wif)
+        except AssertionError:
+            raise ValueError("Error in private key provided")
+        if len(bin_p) != 32:
+            msg = "Can't handle this private key format"
+            raise NotImplementedError(msg)
+        self._set_scalar(_decode(bin_p, 256))
+
+    @classmethod
+    def from_scalar(cls, scalar: int):
+        key = cls.__new__(cls)
+        key._set_scalar(scalar)
+        return key
+
+    def _set_scalar(self, scalar):
+        if not 0 < scalar < N:
+            raise ValueError("Error in private key provided")
+        self.scalar = scalar
+        self.secret = _encode(scalar, 256, 32)
+
+    @functools.cached_property
+    def public_point(self):
+        return _fixed_base_multiply(self.scalar)
+
+    @functools.cached_property
+    def public_key(self) -> str:
+        return _encode_public_key(self.public_point)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(public_key={self.public_key!r})"
+
+
+def _encode_public_key(point):
+    x, y = point
+    compressed = (2 + (y % 2)).to_bytes(1, "big") + x.to_bytes(32, "big")
+    data = compressed + _ripmed160(compressed)[:4]
+    return "EOS" + base58.b58encode(data).decode("ascii")
+
+
+def _decode_public_key(public_key):
+    if public_key.startswith("PUB_K1_"):
+        data = base58.b58decode(public_key[7:])
+        suffix = b"K1"
+    elif public_key.startswith("EOS"):
+        data = base58.b58decode(public_key[3:])
+        suffix = b""
+    else:
+        raise ValueError(f"Unknown public key format: {public_key}")
+    compressed, checksum = data[:-4], data[-4:]
+    if len(compressed) != 33 or compressed[0] not in (2, 3):
+        raise ValueError(f"Invalid public key: {public_key}")
+    if _ripmed160(compressed + suffix)[:4] != checksum:
+        raise ValueError(f"Invalid public key checksum: {public_key}")
+    x = int.from_bytes(compressed[1:], "big")
+    return _decompress_point(x, compressed[0] % 2)
+
+
+def _decode_signature(signature):
+    if not signature.startswith("SIG_K1_"):
+        raise ValueError(f"Unknown signature format: {signature}")
+    data = base58.b58decode(signature[7:])
+    raw, checksum = data[:-4], data[-4:]
+    if len(raw) != 65 or _ripmed160(raw + b"K1")[:4] != checksum:
+        raise ValueError(f"Invalid signature: {signature}")
+    v = raw[0]
+    r = int.from_bytes(raw[1:33], "big")
+    s = int.from_bytes(raw[33:], "big")
+    if not (27 <= v < 35 and 0 < r < N and 0 < s < N):
+        raise ValueError(f"Invalid signature: {signature}")
+    return v, r, s
+
 
-def sign_bytes(*, bytes_: bytes, key: str) -> str:
+def sign_bytes(*, bytes_: bytes, key: Union[str, PrivateKey]) -> str:
+    """
+    Sign the sha256 of bytes_ and return a SIG_K1_ signature.
+
+    key can be a WIF string or a PrivateKey. Pass a PrivateKey when signing
+    repeatedly with the same key to skip decoding it on every call.
+    """
     _check_bytes(bytes_)
+    digest = hashlib.sha256(bytes_).digest()
+    return sign_digest(digest=digest, key=key)
+
+
+def sign_digest(*, digest: bytes, key: Union[str, PrivateKey]) -> str:
+    """
+    Sign a sha256 digest and return a SIG_K1_ signature.
+
+    Same as sign_bytes, for callers that already hashed the signed bytes.
+    """
+    _check_digest(digest)
+    key = _as_private_key(key)
 
     nonce = 0
-    sha256 = hashlib.sha256()
-    sha256.update(bytes_)
     while True:
-        v, r, s = _ecdsa_raw_sign_nonce(sha256.digest(), key, nonce)
+        v, r, s = _ecdsa_raw_sign_nonce(digest, key, nonce)
         signature = v.to_bytes(1, "big")
         signature += r.to_bytes(32, "big") + s.to_bytes(32, "big")
         if _is_canonical(signature):
@@ -46,6 +156,119 @@ def sign_bytes(*, bytes_: bytes, key: str) -> str:
     return signature
 
 
+def sign_many(
+    *,
+    bytes_list: Iterable[bytes],
+    key: Union[str, PrivateKey, "SignerPool"],
+    workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Sign every item in bytes_list and return the signatures in input order.
+
+    Signing is spread over a pool of `workers` processes (default: number
+    of cpus), started for this call. Pass a SignerPool as key to reuse its
+    processes across calls instead (workers is then ignored).
+    """
+    if isinstance(key, SignerPool):
+        return key.sign_many(bytes_list)
+    with SignerPool(key, workers=workers) as pool:
+        return pool.sign_many(bytes_list)
+
+
+class SignerPool:
+    """
+    Processes signing with the same key, started once and reused.
+
+    Each worker parses the key and builds its precomputed tables once, when
+    it starts, instead of for every batch. With workers=1 it signs in this
+    process.
+
+    with SignerPool(key, workers=4) as pool:
+        for batch in batches:
+            signatures = pool.sign_many(batch)
+    """
+
+    def __init__(
+        self, key: Union[str, PrivateKey], *, workers: Optional[int] = None
+    ):
+        self.key = _as_private_key(key)
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = None
+        if self.workers > 1:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_sign_worker,
+                initargs=(self.key.scalar,),
+            )
+
+    def sign_many(self, bytes_list: Iterable[bytes]) -> List[str]:
+        """Sign every item in bytes_list, returning signatures in order."""
+        bytes_list = list(bytes_list)
+        for bytes_ in bytes_list:
+            _check_bytes(bytes_)
+        if self._executor is None or len(bytes_list) <= 1:
+            return [sign_bytes(bytes_=b, key=self.key) for b in bytes_list]
+        chunksize = max(1, len(bytes_list) // (self.workers * 4))
+        signatures = self._executor.map(
+            _sign_in_worker, bytes_list, chunksize=chunksize
+        )
+        return list(signatures)
+
+    def close(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def recover_public_key(*, digest: bytes, signature: str) -> str:
+    """
+    Return the public key (EOS... format) that produced a SIG_K1_ signature.
+
+    digest is the sha256 of the signed bytes.
+    """
+    v, r, s = _decode_signature(signature)
+    point = _ecdsa_raw_recover(digest, v, r, s)
+    return _encode_public_key(point)
+
+
+def verify(*, digest: bytes, signature: str, public_key: str) -> bool:
+    """
+    Check a SIG_K1_ signature of digest against a public key.
+
+    digest is the sha256 of the signed bytes. public_key can be in the
+    EOS... or PUB_K1_... format.
+    """
+    _, r, s = _decode_signature(signature)
+    point = _decode_public_key(public_key)
+    return _ecdsa_raw_verify(digest, r, s, point)
+
+
+_worker_key = None
+
+
+def _init_sign_worker(scalar):
+    global _worker_key
+    _worker_key = PrivateKey.from_scalar(scalar)
+    _get_g_table()
+
+
+def _sign_in_worker(bytes_):
+    return sign_bytes(bytes_=bytes_, key=_worker_key)
+
+
+def _as_private_key(key):
+    if isinstance(key, PrivateKey):
+        return key
+    return PrivateKey(key)
+
+
 def _check_bytes(bytes_):
     if len(bytes_) == 0:
         raise ValueError("Can not sign empty bytes")
@@ -54,6 +277,11 @@ def _check_bytes(bytes_):
         raise TypeError(msg)
 
 
+def _check_digest(digest):
+    if not isinstance(digest, bytes) or len(digest) != 32:
+        raise ValueError("digest must be the 32 bytes of a sha256 hash")
+
+
 def _ripmed160(data):
     try:
         h = hashlib.new("ripemd160")
@@ -81,25 +309,61 @@ def _ecdsa_raw_sign_nonce(message_hash, key, nonce):
     msg_int = _decode(message_hash, 256)
     k = _deterministic_generate_k_nonce(message_hash, key, nonce)
 
-    r, y = _fast_multiply(G, k)
-    s = _inv(k, N) * (msg_int + r * _decode_privkey(key)) % N  # NOQA: W503
+    r, y = _fixed_base_multiply(k)
+    s = _inv(k, N) * (msg_int + r * key.scalar) % N  # NOQA: W503
 
     v = 27 + ((y % 2) ^ (0 if s * 2 < N else 1))
     s = s if s * 2 < N else N - s
 
-    if "compressed" in _get_privkey_format(key):
-        v += 4
-
     return v, r, s
 
 
+def _ecdsa_raw_recover(message_hash, v, r, s):
+    recovery_id = (v - 27) & 3
+    x = r + (recovery_id >> 1) * N
+    if x >= P:
+        raise ValueError("Invalid signature: r out of range")
+    point = _decompress_point(x, recovery_id & 1)
+    msg_int = _decode(message_hash, 256)
+    r_inv = _inv(r, N)
+    u1 = (-msg_int * r_inv) % N
+    u2 = (s * r_inv) % N
+    public_point = _double_multiply(u1, u2, point)
+    if public_point == (0, 0):
+        raise ValueError("Invalid signature: public key at infinity")
+    return public_point
+
+
+def _ecdsa_raw_verify(message_hash, r, s, point):
+    msg_int = _decode(message_hash, 256)
+    s_inv = _inv(s, N)
+    u1 = (msg_int * s_inv) % N
+    u2 = (r * s_inv) % N
+    x, y = _double_multiply(u1, u2, point)
+    return (x, y) != (0, 0) and x % N == r
+
+
+def _double_multiply(u1, u2, point):
+    """Return u1 * G + u2 * point as an affine point."""
+    p1 = _to_jacobian(_fixed_base_multiply(u1))
+    p2 = _jacobian_multiply(_to_jacobian(point), u2)
+    return _from_jacobian(_jacobian_add(p1, p2))
+
+
+def _decompress_point(x, parity):
+    y_square = (pow(x, 3, P) + 7) % P
+    y = pow(y_square, (P + 1) // 4, P)
+    if (y * y) % P != y_square:
+        raise ValueError("Point is not on the curve")
+    if y % 2 != parity:
+        y = P - y
+    return (x, y)
+
+
 def _deterministic_generate_k_nonce(message_hash, key, nonce):
     v = b"\x01" * 32
     k = b"\x00" * 32
-    try:
-        key_encoded = _encode_privkey(key, "bin")
-    except AssertionError:
-        raise ValueError("Error in private key provided: {key=}")
+    key_encoded = key.secret
 
     msg_int = _decode(message_hash, 256)
     message_hash = _encode(msg_int + nonce, 256, 32)
@@ -130,52 +394,49 @@ CODE_STRINGS = {
 }
 
 
-def _encode(val, base, minlen=0):
-    base, minlen = int(base), int(minlen)
-    code_string = CODE_STRINGS[base]
-    result_bytes = bytes()
-    while val > 0:
-        curcode = code_string[val % base]
-        result_bytes = bytes([ord(curcode)]) + result_bytes
-        val //= base
+_CODE_INDEXES = {
+    base: {char: index for index, char in enumerate(code_string)}
+    for base, code_string in CODE_STRINGS.items()
+}
 
-    pad_size = minlen - len(result_bytes)
 
+def _encode(val, base, minlen=0):
+    base, minlen = int(base), int(minlen)
     if base == 256:
-        padding_element = b"\x00"
-    elif base == 58:
-        padding_element = b"1"
-    else:
-        padding_element = b"0"
+        length = max(minlen, (val.bit_length() + 7) // 8)
+        return val.to_bytes(length, "big")
 
-    if pad_size > 0:
-        result_bytes = padding_element * pad_size + result_bytes
+    code_string = CODE_STRINGS[base]
+    digits = []
+    while val > 0:
+        val, digit = divmod(val, base)
+        digits.append(code_string[digit])
 
-    result_string = "".join([chr(y) for y in result_bytes])
-    result = result_bytes if base == 256 else result_string
+    padding_element = "1" if base == 58 else "0"
+    digits.extend(padding_element * (minlen - len(digits)))
 
-    return result
+    return "".join(reversed(digits))
 
 
-def _decode(string, base):  # NOQA: C901
+def _decode(string, base):
     base = int(base)
-    code_string = CODE_STRINGS[base]
-    result = 0
     if base == 256:
+        return int.from_bytes(string, "big")
 
-        def extract(d, cs):
-            return d
-
-    else:
+    if isinstance(string, bytes):
+        string = string.decode("latin-1")
+    result = 0
+    for index in _digit_indexes(string, base):
+        result = result * base + index
+    return result
 
-        def extract(d, cs):
-            return cs.find(d if isinstance(d, str) else chr(d))
 
-    while len(string) > 0:
-        result *= base
-        result += extract(string[0], code_string)
-        string = string[1:]
-    return result
+def _digit_indexes(string, base):
+    indexes = _CODE_INDEXES[base]
+    try:
+        return [indexes[char] for char in string]
+    except KeyError as e:
+        raise ValueError(f"Invalid base {base} character: {e}")
 
 
 def _changebase(string, frm, to, minlen=0):
@@ -195,62 +456,22 @@ def _from_string_to_bytes(a):
 
 
 def _b58check_to_bin(inp):
-    leadingzbytes = len(re.match("^1*", inp).group(0))
+    leadingzbytes = len(inp) - len(inp.lstrip("1"))
     data = b"\x00" * leadingzbytes + _changebase(inp, 58, 256)
     assert _bin_dbl_sha256(data[:-4])[:4] == data[-4:]
     return data[1:-4]
 
 
-def _get_privkey_format(priv):
-    bin_p = _b58check_to_bin(priv)
-    if len(bin_p) == 32:
-        return "wif"
-    else:
-        msg = "Can't handle this private key format"
-        raise NotImplementedError(msg)
-
-
-def _from_int_to_byte(a):
-    return bytes([a])
-
-
 def _bin_to_b58check(inp, magicbyte=0):
-    if magicbyte == 0:
-        inp = _from_int_to_byte(0) + inp
-    while magicbyte > 0:
-        inp = _from_int_to_byte(magicbyte % 256) + inp
-        magicbyte //= 256
-
-    leadingzbytes = 0
-    for x in inp:
-        if x != 0:
-            break
-        leadingzbytes += 1
+    magic_length = max(1, (magicbyte.bit_length() + 7) // 8)
+    inp = magicbyte.to_bytes(magic_length, "big") + inp
+
+    leadingzbytes = len(inp) - len(inp.lstrip(b"\x00"))
 
     checksum = _bin_dbl_sha256(inp)[:4]
     return "1" * leadingzbytes + _changebase(inp + checksum, 256, 58)
 
 
-def _encode_privkey(priv, formt, vbyte=0):
-    if not isinstance(priv, (int, float)):
-        return _encode_privkey(_decode_privkey(priv), formt, vbyte)
-    if formt == "bin":
-        return _encode(priv, 256, 32)
-    else:
-        msg = "Can't handle this private key format"
-        raise NotImplementedError(msg)
-
-
-def _decode_privkey(priv, formt=None):
-    if not formt:
-        formt = _get_privkey_format(priv)
-    if formt == "wif":
-        return _decode(_b58check_to_bin(priv), 256)
-    else:
-        msg = "Can't handle this private key format"
-        raise NotImplementedError(msg)
-
-
 def _from_jacobian(p):
     z = _inv(p[2], P)
     return ((p[0] * z**2) % P, (p[1] * z**3) % P)
@@ -317,12 +538,71 @@ def _fast_multiply(a, n):
 
 
 def _inv(a, n):
-    if a == 0:
+    if a % n == 0:
         return 0
-    lm, hm = 1, 0
-    low, high = a % n, n
-    while low > 1:
-        r = high // low
-        nm, new = hm - lm * r, high - low * r
-        lm, low, hm, high = nm, new, lm, low
-    return lm % n
+    return pow(a, -1, n)
+
+
+def _jacobian_add_affine(p, q):
+    """Add the affine point q to the jacobian point p (mixed addition)."""
+    if not p[1]:
+        return (q[0], q[1], 1)
+    z2 = (p[2] * p[2]) % P
+    U2 = (q[0] * z2) % P
+    S2 = (q[1] * z2 * p[2]) % P
+    if p[0] == U2:
+        if p[1] != S2:
+            return (0, 0, 1)
+        return _jacobian_double(p)
+    H = U2 - p[0]
+    R = S2 - p[1]
+    H2 = (H * H) % P
+    H3 = (H * H2) % P
+    U1H2 = (p[0] * H2) % P
+    nx = (R**2 - H3 - 2 * U1H2) % P
+    ny = (R * (U1H2 - nx) - p[1] * H3) % P
+    nz = (H * p[2]) % P
+    return (nx, ny, nz)
+
+
+def _build_fixed_base_table(point, window):
+    table = []
+    base = _to_jacobian(point)
+    for _ in range(0, 256, window):
+        row = [(0, 0)]
+        multiple = (0, 0, 1)
+        for _ in range((1 << window) - 1):
+            multiple = _jacobian_add(multiple, base)
+            row.append(_from_jacobian(multiple))
+        table.append(row)
+        for _ in range(window):
+            base = _jacobian_double(base)
+    return table
+
+
+def _get_g_table():
+    global _G_TABLE
+    if _G_TABLE is None:
+        _G_TABLE = _build_fixed_base_table(G, _G_WINDOW)
+    return _G_TABLE
+
+
+def _fixed_base_multiply(n):
+    """
+    Return n * G using the precomputed table for G.
+
+    One mixed addition per non-zero window and no doublings, instead of the
+    double-and-add of _fast_multiply.
+    """
+    table = _get_g_table()
+    n %= N
+    mask = (1 << _G_WINDOW) - 1
+    result = (0, 0, 1)
+    for row in table:
+        if not n:
+            break
+        digit = n & mask
+        if digit:
+            result = _jacobian_add_affine(result, row[digit])
+        n >>= _G_WINDOW
+    return _from_jacobian(result)
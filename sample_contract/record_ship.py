@@ -0,0 +1,54 @@
+"""
+Record the state history messages read by tests/unit/ship_test.py.
+
+Run against the nodeos of docker-compose.yml (state history on port 8080),
+with the blocks start to end (excluded) holding the transactions the tests
+look for:
+
+python sample_contract/record_ship.py ws://127.0.0.1:8080 1000 1003
+
+The abi sent by the node is saved as tests/unit/data/ship.abi and the
+get_status and get_blocks results, as hex, in ship_frames.json.
+"""
+
+import asyncio
+import json
+import pathlib
+import sys
+
+import websockets
+
+import eospyo
+
+DATA = pathlib.Path(__file__).parents[1] / "tests" / "unit" / "data"
+
+
+async def record(url, start, end):
+    async with websockets.connect(url, max_size=None) as ws:
+        abi = json.loads(await ws.recv())
+        ship = eospyo.ship.ShipAbi(abi)
+        await ws.send(ship.pack_request("get_status_request_v0", {}))
+        status = await ws.recv()
+        request = dict(
+            start_block_num=start,
+            end_block_num=end,
+            max_messages_in_flight=end - start,
+            have_positions=[],
+            irreversible_only=False,
+            fetch_block=True,
+            fetch_traces=True,
+            fetch_deltas=True,
+        )
+        await ws.send(ship.pack_request("get_blocks_request_v0", request))
+        blocks = [await ws.recv() for _ in range(end - start)]
+    frames = {
+        "get_status": status.hex(),
+        "get_blocks": [block.hex() for block in blocks],
+    }
+    (DATA / "ship.abi").write_text(json.dumps(abi, indent=4) + "\n")
+    (DATA / "ship_frames.json").write_text(json.dumps(frames, indent=4) + "\n")
+
+
+if __name__ == "__main__":
+    url, start, end = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+    asyncio.run(record(url, start, end))
@@ -13,6 +13,10 @@ nodeos -e -p eosio \
     --plugin eosio::producer_api_plugin \
     --plugin eosio::chain_api_plugin \
     --plugin eosio::http_plugin \
+    --plugin eosio::state_history_plugin \
+    --trace-history \
+    --chain-state-history \
+    --state-history-endpoint=0.0.0.0:8080 \
     --contracts-console \
     --http-validate-host=false \
     --http-server-address=0.0.0.0:8888 \
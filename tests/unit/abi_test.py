@@ -0,0 +1,283 @@
+import pathlib
+
+import pytest
+
+import eospyo
+from eospyo import types
+
+SAMPLE_CONTRACT = pathlib.Path(__file__).parents[2] / "sample_contract"
+
+
+@pytest.fixture(scope="module")
+def token_abi():
+    yield eospyo.abi.Abi.from_file(SAMPLE_CONTRACT / "eosio_token.abi")
+
+
+@pytest.fixture(scope="module")
+def simple_abi():
+    yield eospyo.abi.Abi.from_file(SAMPLE_CONTRACT / "simplecontract.abi")
+
+
+def test_transfer_matches_data_serialization(token_abi):
+    data = [
+        eospyo.Data(name="from", value=types.Name("user2")),
+        eospyo.Data(name="to", value=types.Name("user2")),
+        eospyo.Data(name="quantity", value=types.Asset(str(2**61) + " WAX")),
+        eospyo.Data(name="memo", value=types.String("Trying EosPyo")),
+    ]
+    expected = b"".join(bytes(d) for d in data)
+    bytes_ = token_abi.abi_json_to_bin(
+        action="transfer",
+        json={
+            "from": "user2",
+            "to": "user2",
+            "quantity": str(2**61) + " WAX",
+            "memo": "Trying EosPyo",
+        },
+    )
+    assert bytes_ == expected
+
+
+def test_sendmsg_matches_data_serialization(simple_abi):
+    data = [
+        eospyo.Data(name="from", value=types.Name("user2")),
+        eospyo.Data(name="message", value=types.String("hello")),
+    ]
+    expected = b"".join(bytes(d) for d in data)
+    bytes_ = simple_abi.abi_json_to_bin(
+        action="sendmsg", json={"from": "user2", "message": "hello"}
+    )
+    assert bytes_ == expected
+
+
+def test_get_abi_response_is_accepted():
+    abi = {"account_name": "user2", "abi": {"actions": []}}
+    assert eospyo.abi.Abi(abi).actions == {}
+
+
+def test_unknown_action_raises_value_error(simple_abi):
+    with pytest.raises(ValueError):
+        simple_abi.abi_json_to_bin(action="xxx", json={})
+
+
+def test_missing_field_raises_value_error(simple_abi):
+    with pytest.raises(ValueError):
+        simple_abi.abi_json_to_bin(action="sendmsg", json={"from": "user2"})
+
+
+def test_unknown_field_raises_value_error(simple_abi):
+    json = {"from": "user2", "message": "hi", "memo": "x"}
+    with pytest.raises(ValueError):
+        simple_abi.abi_json_to_bin(action="sendmsg", json=json)
+
+
+def test_invalid_value_raises_validation_error(simple_abi):
+    with pytest.raises(ValueError):
+        simple_abi.abi_json_to_bin(
+            action="sendmsg", json={"from": "A", "message": ""}
+        )
+
+
+@pytest.fixture(scope="module")
+def nested_abi():
+    abi = {
+        "version": "eosio::abi/1.2",
+        "types": [
+            {"new_type_name": "account_name", "type": "name"},
+            {"new_type_name": "amounts", "type": "uint16[]"},
+        ],
+        "structs": [
+            {
+                "name": "base",
+                "base": "",
+                "fields": [{"name": "owner", "type": "account_name"}],
+            },
+            {
+                "name": "item",
+                "base": "",
+                "fields": [
+                    {"name": "id", "type": "uint64"},
+                    {"name": "children", "type": "item[]"},
+                ],
+            },
+            {
+                "name": "mint",
+                "base": "base",
+                "fields": [
+                    {"name": "amounts", "type": "amounts"},
+                    {"name": "memo", "type": "string?"},
+                    {"name": "item", "type": "item"},
+                    {"name": "attribute", "type": "attribute"},
+                    {"name": "data", "type": "bytes"},
+                    {"name": "extra", "type": "uint8$"},
+                ],
+            },
+        ],
+        "variants": [{"name": "attribute", "types": ["uint8", "string"]}],
+        "actions": [
+            {"name": "mint", "type": "mint", "ricardian_contract": ""}
+        ],
+    }
+    yield eospyo.abi.Abi(abi)
+
+
+mint = {
+    "owner": "user2",
+    "amounts": [1, 2],
+    "memo": None,
+    "item": {"id": 1, "children": [{"id": 2, "children": []}]},
+    "attribute": ["string", "hi"],
+    "data": "cafe",
+}
+
+
+def mint_bytes(memo=b"\x00", extra=b""):
+    return (
+        b"\x00\x00\x00\x00\x00q\x15\xd6"  # owner (base)
+        + b"\x02\x01\x00\x02\x00"  # amounts
+        + memo
+        + b"\x01\x00\x00\x00\x00\x00\x00\x00\x01"  # item
+        + b"\x02\x00\x00\x00\x00\x00\x00\x00\x00"  # item.children
+        + b"\x01\x02hi"  # attribute
+        + b"\x02\xca\xfe"  # data
+        + extra
+    )
+
+
+def test_nested_struct_without_extension(nested_abi):
+    bytes_ = nested_abi.abi_json_to_bin(action="mint", json=mint)
+    assert bytes_ == mint_bytes()
+
+
+def test_nested_struct_with_extension(nested_abi):
+    bytes_ = nested_abi.abi_json_to_bin(
+        action="mint", json=dict(mint, memo="a", extra=7)
+    )
+    assert bytes_ == mint_bytes(memo=b"\x01\x01a", extra=b"\x07")
+
+
+def test_unknown_variant_option_raises_value_error(nested_abi):
+    with pytest.raises(ValueError):
+        nested_abi.abi_json_to_bin(
+            action="mint", json=dict(mint, attribute=["uint64", 1])
+        )
+
+
+def test_transfer_bin_to_json_returns_sent_json(token_abi):
+    json = {
+        "from": "user2",
+        "to": "user1",
+        "quantity": "12.3450 WAX",
+        "memo": "Trying EosPyo",
+    }
+    bytes_ = token_abi.abi_json_to_bin(action="transfer", json=json)
+    assert token_abi.abi_bin_to_json(action="transfer", bytes=bytes_) == json
+
+
+def test_nested_struct_bin_to_json_without_extension(nested_abi):
+    data = nested_abi.abi_bin_to_json(action="mint", bytes=mint_bytes())
+    assert data == mint
+
+
+def test_nested_struct_bin_to_json_with_extension(nested_abi):
+    data = nested_abi.abi_bin_to_json(
+        action="mint", bytes=mint_bytes(memo=b"\x01\x01a", extra=b"\x07")
+    )
+    assert data == dict(mint, memo="a", extra=7)
+
+
+def test_trailing_bytes_raise_value_error(nested_abi):
+    with pytest.raises(ValueError):
+        nested_abi.abi_bin_to_json(
+            action="mint", bytes=mint_bytes(extra=b"\x07\x00")
+        )
+
+
+def test_invalid_variant_option_raises_value_error(nested_abi):
+    bytes_ = mint_bytes().replace(b"\x01\x02hi", b"\x05\x02hi")
+    with pytest.raises(ValueError):
+        nested_abi.abi_bin_to_json(action="mint", bytes=bytes_)
+
+
+time_abi = {
+    "structs": [
+        {
+            "name": "times",
+            "base": "",
+            "fields": [
+                {"name": "sec", "type": "time_point_sec"},
+                {"name": "usec", "type": "time_point"},
+                {"name": "hash", "type": "checksum256"},
+            ],
+        }
+    ],
+}
+
+
+def test_time_and_checksum_round_trip_as_nodeos_json():
+    abi = eospyo.abi.Abi(time_abi)
+    value = {
+        "sec": "2021-08-30T13:03:31",
+        "usec": "2021-08-30T13:03:31.500",
+        "hash": "ab" * 32,
+    }
+    bytes_ = abi.pack(type_="times", value=value)
+    assert abi.unpack(type_="times", bytes_=bytes_) == value
+
+
+def test_builtin_types_round_trip():
+    abi = eospyo.abi.Abi(
+        {
+            "structs": [
+                {
+                    "name": "builtins",
+                    "base": "",
+                    "fields": [
+                        {"name": "fee", "type": "extended_asset"},
+                        {"name": "delta", "type": "varint32"},
+                        {"name": "ripemd", "type": "checksum160"},
+                        {"name": "sha512", "type": "checksum512"},
+                        {"name": "quad", "type": "float128"},
+                    ],
+                }
+            ],
+        }
+    )
+    value = {
+        "fee": {"quantity": "1.0000 EOS", "contract": "eosio.token"},
+        "delta": -300,
+        "ripemd": "ab" * 20,
+        "sha512": "cd" * 64,
+        "quad": "00" * 14 + "ff3f",
+    }
+    bytes_ = abi.pack(type_="builtins", value=value)
+    assert len(bytes_) == 16 + 8 + 2 + 20 + 64 + 16
+    assert abi.unpack(type_="builtins", bytes_=bytes_) == value
+
+
+def test_raw_abi_is_read_as_get_abi_json():
+    raw_abi = (
+        b"\x0eeosio::abi/1.1"  # version
+        + b"\x00"  # types
+        + b"\x01\x04ping\x00\x01\x02id\x06uint64"  # structs
+        + b"\x01\x00\x00\x00\x00\x00\xc0\xa6\xab\x04ping\x00"  # actions
+        + b"\x00\x00\x00\x00"  # tables, clauses, errors, extensions
+    )
+    assert eospyo.abi.bin_to_abi(raw_abi) == {
+        "version": "eosio::abi/1.1",
+        "types": [],
+        "structs": [
+            {
+                "name": "ping",
+                "base": "",
+                "fields": [{"name": "id", "type": "uint64"}],
+            }
+        ],
+        "actions": [
+            {"name": "ping", "type": "ping", "ricardian_contract": ""}
+        ],
+        "tables": [],
+        "ricardian_clauses": [],
+        "error_messages": [],
+        "abi_extensions": [],
+    }
@@ -0,0 +1,242 @@
+import base64
+import hashlib
+import zlib
+
+import pytest
+
+import eospyo
+from eospyo import abi
+
+CONTRACT_ABI = {
+    "version": "eosio::abi/1.1",
+    "types": [],
+    "structs": [
+        {
+            "name": "sendmsg",
+            "base": "",
+            "fields": [
+                {"name": "from", "type": "name"},
+                {"name": "message", "type": "string"},
+            ],
+        }
+    ],
+    "actions": [
+        {"name": "sendmsg", "type": "sendmsg", "ricardian_contract": ""}
+    ],
+    "tables": [],
+    "ricardian_clauses": [],
+    "error_messages": [],
+    "abi_extensions": [],
+}
+
+
+class FakeNet:
+    def __init__(self, abi_=CONTRACT_ABI):
+        self.calls = []
+        self.set_abi(abi_)
+
+    def set_abi(self, abi_):
+        self.raw_abi = abi._abi_def.pack(type_="abi_def", value=abi_)
+
+    def get_raw_abi(self, *, account_name, abi_hash=None):
+        self.calls.append(abi_hash)
+        if account_name == "nobody":
+            return {"code": 500, "error": {"name": "unknown_key"}}
+        resp = {
+            "account_name": account_name,
+            "code_hash": "00" * 32,
+            "abi_hash": hashlib.sha256(self.raw_abi).hexdigest(),
+        }
+        if abi_hash != resp["abi_hash"]:
+            resp["abi"] = base64.b64encode(self.raw_abi).decode()
+        return resp
+
+
+@pytest.fixture
+def net():
+    yield FakeNet()
+
+
+def test_raw_abi_is_decoded_like_get_abi(net):
+    cache = eospyo.cache.AbiCache(net)
+    resp = cache.get_abi(account_name="user2")
+    assert resp == {"account_name": "user2", "abi": CONTRACT_ABI}
+
+
+def test_abi_is_fetched_once_within_ttl(net):
+    cache = eospyo.cache.AbiCache(net)
+    cache.get_abi(account_name="user2")
+    cache.get_abi(account_name="user2")
+    assert net.calls == [None]
+
+
+def test_expired_abi_is_revalidated_with_its_hash(net):
+    cache = eospyo.cache.AbiCache(net, ttl=0)
+    first = cache.get(account_name="user2")
+    second = cache.get(account_name="user2")
+    abi_hash = hashlib.sha256(net.raw_abi).hexdigest()
+    assert net.calls == [None, abi_hash]
+    assert second is first
+
+
+def test_changed_abi_is_downloaded_again(net):
+    cache = eospyo.cache.AbiCache(net, ttl=0)
+    cache.get_abi(account_name="user2")
+    new_abi = dict(CONTRACT_ABI, version="eosio::abi/1.2")
+    net.set_abi(new_abi)
+    assert cache.get_abi(account_name="user2")["abi"] == new_abi
+
+
+def test_least_recently_used_abi_is_evicted(net):
+    cache = eospyo.cache.AbiCache(net, maxsize=2)
+    for account_name in ["a", "b", "a", "c", "a", "b"]:
+        cache.get_abi(account_name=account_name)
+    assert len(net.calls) == 4  # a, b, c and b again
+
+
+def test_account_without_abi_returns_none(net):
+    net.raw_abi = b""
+    cache = eospyo.cache.AbiCache(net)
+    assert cache.get_abi(account_name="user2") is None
+    assert cache.get(account_name="user2") is None
+
+
+def test_api_error_is_returned_and_not_cached(net):
+    cache = eospyo.cache.AbiCache(net)
+    resp = cache.get_abi(account_name="nobody")
+    assert resp["code"] == 500
+    cache.get_abi(account_name="nobody")
+    assert len(net.calls) == 2
+    with pytest.raises(ValueError):
+        cache.get(account_name="nobody")
+
+
+def test_other_process_starts_warm_from_directory(net, tmp_path):
+    eospyo.cache.AbiCache(net, directory=tmp_path).get(account_name="user2")
+    other_net = FakeNet()
+    cache = eospyo.cache.AbiCache(other_net, directory=tmp_path)
+    compiled = cache.get(account_name="user2")
+    assert other_net.calls == []
+    assert compiled.actions == {"sendmsg": "sendmsg"}
+
+
+def test_invalidate_removes_abi_from_memory_and_disk(net, tmp_path):
+    cache = eospyo.cache.AbiCache(net, directory=tmp_path)
+    cache.get_abi(account_name="user2")
+    cache.invalidate(account_name="user2")
+    assert list(tmp_path.iterdir()) == []
+    cache.get_abi(account_name="user2")
+    assert net.calls == [None, None]
+
+
+class FakeBlockNet:
+    def __init__(self, lib_num=100):
+        self.lib_num = lib_num
+        self.calls = []
+        self.tapos_calls = 0
+
+    def get_tapos(self):
+        self.tapos_calls += 1
+        return "00" * 32, f"{self.lib_num:08x}" + "ab" * 28
+
+    def get_block(self, *, block_num_or_id):
+        self.calls.append(block_num_or_id)
+        if isinstance(block_num_or_id, str) and len(block_num_or_id) == 64:
+            block_num = int(block_num_or_id[:8], 16)
+        else:
+            block_num = int(block_num_or_id)
+        return {"id": block_id(block_num), "block_num": block_num}
+
+    def get_block_info(self, *, block_num):
+        self.calls.append(block_num)
+        return {"id": block_id(block_num), "block_num": block_num}
+
+
+def block_id(block_num):
+    return f"{block_num:08x}" + "cd" * 28
+
+
+@pytest.fixture
+def block_net():
+    yield FakeBlockNet()
+
+
+def test_irreversible_block_is_fetched_once(block_net):
+    cache = eospyo.cache.BlockCache(block_net)
+    first = cache.get_block(block_num_or_id=50)
+    first["block_num"] = 0  # callers get their own copy
+    assert cache.get_block(block_num_or_id=block_id(50))["block_num"] == 50
+    assert block_net.calls == [50]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_reversible_block_is_not_cached(block_net):
+    cache = eospyo.cache.BlockCache(block_net, lib_refresh=0)
+    cache.get_block(block_num_or_id=101)
+    cache.get_block(block_num_or_id=101)
+    assert block_net.calls == [101, 101]
+    block_net.lib_num = 101
+    cache.get_block(block_num_or_id=101)
+    cache.get_block(block_num_or_id=101)
+    assert block_net.calls == [101, 101, 101]
+
+
+def test_lib_is_not_fetched_for_blocks_below_known_lib(block_net):
+    cache = eospyo.cache.BlockCache(block_net)
+    for block_num in range(1, 11):
+        cache.get_block_info(block_num=block_num)
+    assert block_net.tapos_calls == 1
+
+
+def test_memory_is_bounded_by_bytes(block_net):
+    cache = eospyo.cache.BlockCache(block_net, max_bytes=200)
+    for block_num in range(1, 11):
+        cache.get_block(block_num_or_id=block_num)
+    assert 0 < cache.size <= 200
+    cache.get_block(block_num_or_id=1)
+    assert block_net.calls.count(1) == 2
+
+
+def test_other_process_reads_blocks_from_directory(block_net, tmp_path):
+    eospyo.cache.BlockCache(block_net, directory=tmp_path).get_block(
+        block_num_or_id=50
+    )
+    other_net = FakeBlockNet()
+    cache = eospyo.cache.BlockCache(other_net, directory=tmp_path)
+    assert cache.get_block(block_num_or_id=50)["id"] == block_id(50)
+    assert cache.get_block(block_num_or_id=50)["id"] == block_id(50)
+    assert other_net.calls == []
+    assert (cache.disk_hits, cache.hits, cache.misses) == (1, 1, 0)
+
+
+@pytest.mark.parametrize(
+    "damage",
+    [
+        lambda data: data[: len(data) // 2],
+        lambda data: zlib.compress(b"{not json"),
+        lambda data: b"garbage",
+    ],
+)
+def test_corrupt_block_file_is_fetched_again(block_net, tmp_path, damage):
+    eospyo.cache.BlockCache(block_net, directory=tmp_path).get_block(
+        block_num_or_id=50
+    )
+    (path,) = tmp_path.glob("block/*/50.json.z")
+    path.write_bytes(damage(path.read_bytes()))
+    other_net = FakeBlockNet()
+    cache = eospyo.cache.BlockCache(other_net, directory=tmp_path)
+    assert cache.get_block(block_num_or_id=50)["id"] == block_id(50)
+    assert other_net.calls == [50]
+    assert (cache.disk_hits, cache.hits, cache.misses) == (0, 0, 1)
+    fresh = eospyo.cache.BlockCache(FakeBlockNet(), directory=tmp_path)
+    assert fresh.get_block(block_num_or_id=50)["id"] == block_id(50)
+    assert fresh.disk_hits == 1
+
+
+def test_block_with_another_id_is_counted_as_miss_only(block_net):
+    cache = eospyo.cache.BlockCache(block_net)
+    cache.get_block(block_num_or_id=50)
+    other_id = f"{50:08x}" + "ef" * 28
+    cache.get_block(block_num_or_id=other_id)
+    assert block_net.calls == [50, other_id]
+    assert (cache.hits, cache.misses) == (0, 2)
@@ -1,4 +1,7 @@
+import asyncio
 import re
+import threading
+import time
 
 import httpx
 import pydantic
@@ -63,6 +66,198 @@ def test_when_net_get_info_then_chain_id_has_correct_format(net):
     assert re.fullmatch(patt, info["chain_id"])
 
 
+def test_net_reuses_its_http_client(httpx_mock):
+    httpx_mock.add_response(json={"chain_id": "ab"})
+    httpx_mock.add_response(json={"chain_id": "ab"})
+    net = eospyo.Local()
+    client = net._client()
+    net.get_info()
+    net.copy().get_info()
+    assert net._client() is client
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_net_http_client_uses_net_limits_and_timeout():
+    net = eospyo.Local(timeout=1.5, max_connections=3)
+    client = net._client()
+    assert client.timeout == httpx.Timeout(1.5)
+    assert client._transport._pool._max_connections == 3
+
+
+def test_closed_net_creates_a_new_http_client():
+    with eospyo.Local() as net:
+        client = net._client()
+    assert client.is_closed
+    assert net._client() is not client
+    net.close()
+
+
+# host pool
+
+
+HOST_A = "http://a.test"
+HOST_B = "http://b.test"
+
+
+@pytest.fixture
+def pool_net():
+    net = eospyo.Net(host=HOST_A, hosts=[HOST_B])
+    pool = net._host_pool()
+    pool.record_success(HOST_A, 0.01)  # host a is tried first
+    pool.record_success(HOST_B, 1.0)
+    yield net
+
+
+def raise_connect_error(*args, **kwargs):
+    raise httpx.ConnectError("")
+
+
+def test_net_fails_over_to_next_host_on_connection_error(httpx_mock, pool_net):
+    httpx_mock.add_callback(
+        raise_connect_error, url=f"{HOST_A}/v1/chain/get_info"
+    )
+    httpx_mock.add_response(url=f"{HOST_B}/v1/chain/get_info", json={"b": 1})
+    assert pool_net.get_info() == {"b": 1}
+    assert pool_net._host_pool().order() == [HOST_B, HOST_A]
+
+
+@pytest.mark.parametrize("status_code", [429, 502, 503, 504])
+def test_net_fails_over_to_next_host_on_unavailable_status(
+    httpx_mock, pool_net, status_code
+):
+    httpx_mock.add_response(
+        url=f"{HOST_A}/v1/chain/get_info", status_code=status_code
+    )
+    httpx_mock.add_response(url=f"{HOST_B}/v1/chain/get_info", json={"b": 1})
+    assert pool_net.get_info() == {"b": 1}
+    assert pool_net._host_pool().latencies()[HOST_A] is None
+
+
+def test_async_net_fails_over_to_next_host(httpx_mock):
+    net = eospyo.AsyncNet(host=HOST_A, hosts=[HOST_B])
+    net._host_pool().record_success(HOST_A, 0.01)
+    net._host_pool().record_success(HOST_B, 1.0)
+    httpx_mock.add_response(url=f"{HOST_A}/v1/chain/get_info", status_code=503)
+    httpx_mock.add_response(url=f"{HOST_B}/v1/chain/get_info", json={"b": 1})
+
+    async def get_info():
+        async with net:
+            return await net.get_info()
+
+    assert asyncio.run(get_info()) == {"b": 1}
+
+
+def test_net_returns_500_without_failover(httpx_mock, pool_net):
+    httpx_mock.add_response(
+        url=f"{HOST_A}/v1/chain/get_info", status_code=500, json={"code": 500}
+    )
+    assert pool_net.get_info() == {"code": 500}
+
+
+def test_net_raises_connection_error_when_every_host_fails(
+    httpx_mock, pool_net
+):
+    httpx_mock.add_callback(
+        raise_connect_error, url=f"{HOST_A}/v1/chain/get_info"
+    )
+    httpx_mock.add_callback(
+        raise_connect_error, url=f"{HOST_B}/v1/chain/get_info"
+    )
+    with pytest.raises(eospyo.exc.ConnectionError):
+        pool_net.get_info()
+
+
+class SignedTransaction:
+    signatures = ["SIG_K1_x"]
+
+    def pack(self):
+        return "00"
+
+    def id(self):
+        return "0" * 64
+
+
+@pytest.mark.parametrize("error", [httpx.ReadTimeout(""), httpx.ReadError("")])
+def test_push_transaction_is_not_resent_once_it_may_have_been_received(
+    httpx_mock, pool_net, error
+):
+    httpx_mock.add_exception(error)
+    with pytest.raises(eospyo.exc.ConnectionError) as e:
+        pool_net.push_transaction(transaction=SignedTransaction())
+    assert e.value.error is error
+    assert len(httpx_mock.get_requests()) == 1
+
+
+def test_push_transaction_is_not_resent_on_gateway_timeout(
+    httpx_mock, pool_net
+):
+    httpx_mock.add_response(status_code=504)
+    with pytest.raises(eospyo.exc.ConnectionError):
+        pool_net.push_transaction(transaction=SignedTransaction())
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.parametrize("status_code", [429, 503])
+def test_push_transaction_fails_over_when_it_was_not_received(
+    httpx_mock, status_code
+):
+    net = eospyo.Net(host=HOST_A, hosts=[HOST_B, "http://c.test"])
+    httpx_mock.add_exception(httpx.ConnectError(""))
+    httpx_mock.add_response(status_code=status_code)
+    httpx_mock.add_response(json={"transaction_id": "0" * 64})
+    resp = net.push_transaction(transaction=SignedTransaction())
+    assert resp == {"transaction_id": "0" * 64}
+    hosts = {r.url.host for r in httpx_mock.get_requests()}
+    assert hosts == {"a.test", "b.test", "c.test"}
+
+
+def test_net_check_hosts_returns_latencies(httpx_mock):
+    net = eospyo.Net(host=HOST_A, hosts=[HOST_B])
+    httpx_mock.add_response(url=f"{HOST_A}/v1/chain/get_info", json={})
+    httpx_mock.add_callback(
+        raise_connect_error, url=f"{HOST_B}/v1/chain/get_info"
+    )
+    latencies = net.check_hosts()
+    assert latencies[HOST_A] > 0
+    assert latencies[HOST_B] is None
+
+
+def test_host_pool_spreads_reads_but_skips_the_slowest_host():
+    hosts = ["http://a", "http://b", "http://c"]
+    pool = eospyo.net._HostPool(hosts)
+    for latency, host in enumerate(hosts, start=1):
+        pool.record_success(host, latency)
+    first_hosts = {pool.order()[0] for _ in range(100)}
+    assert first_hosts == {"http://a", "http://b"}
+
+
+def test_host_pool_pins_same_key_to_same_host():
+    hosts = [f"http://{i}" for i in range(5)]
+    pool = eospyo.net._HostPool(hosts)
+    assert pool.order(pin="trx") == pool.order(pin="trx")
+    assert len({pool.order(pin=str(i))[0] for i in range(50)}) > 1
+
+
+def test_host_pool_tries_hosts_that_failed_last():
+    pool = eospyo.net._HostPool(["http://a", "http://b"])
+    pool.record_failure("http://a")
+    assert pool.order(pin="trx") == ["http://b", "http://a"]
+    assert pool.order() == ["http://b", "http://a"]
+
+
+def test_host_pool_latency_is_a_moving_average():
+    pool = eospyo.net._HostPool(["http://a"])
+    pool.record_success("http://a", 1.0)
+    pool.record_success("http://a", 2.0)
+    assert pool.latencies()["http://a"] == pytest.approx(1.3)
+
+
+@pytest.mark.parametrize("alias", ["WaxMainnet", "EosMainnet", "TelosMainnet"])
+def test_presets_have_many_hosts(alias):
+    net = getattr(eospyo, alias)()
+    assert len(net._host_pool().hosts) > 1
+
+
 aliases = [
     "EosMainnet",
     "KylinTestnet",
@@ -267,3 +462,477 @@ def get_table_rows_with_strange_bounds_returns_empty_list(net):
 def get_table_rows_with_strange_scope_returns_empty_list(net):
     resp = net.get_table_rows(code="user2", table="messages", scope="user1")
     assert resp == []
+
+
+# tapos cache
+
+
+@pytest.fixture
+def get_info_calls(monkeypatch):
+    calls = []
+
+    def get_info(self):
+        calls.append(time.monotonic())
+        return {
+            "chain_id": "ab" * 32,
+            "last_irreversible_block_id": f"{len(calls):064x}",
+        }
+
+    monkeypatch.setattr(eospyo.Net, "get_info", get_info)
+    yield calls
+
+
+def test_get_tapos_without_cache_calls_get_info(get_info_calls):
+    net = eospyo.Local()
+    net.get_tapos()
+    net.get_tapos()
+    assert len(get_info_calls) == 2
+
+
+def test_get_tapos_with_cache_calls_get_info_once(get_info_calls):
+    net = eospyo.Local()
+    net.use_tapos_cache()
+    assert net.get_tapos() == ("ab" * 32, f"{1:064x}")
+    assert net.get_tapos() == ("ab" * 32, f"{1:064x}")
+    assert len(get_info_calls) == 1
+
+
+def test_tapos_cache_refreshes_block_after_interval(get_info_calls):
+    net = eospyo.Local()
+    net.use_tapos_cache(refresh_interval=0)
+    net.get_tapos()
+    assert net.get_tapos() == ("ab" * 32, f"{2:064x}")
+
+
+def test_tapos_cache_keeps_first_chain_id(get_info_calls):
+    net = eospyo.Local()
+    tapos = net.use_tapos_cache()
+    tapos.update({"chain_id": "cd" * 32, "last_irreversible_block_id": "0"})
+    tapos.update({"chain_id": "ef" * 32, "last_irreversible_block_id": "1"})
+    assert net.get_tapos() == ("cd" * 32, "1")
+    assert get_info_calls == []
+
+
+def test_tapos_cache_is_shared_by_net_copies(get_info_calls):
+    net = eospyo.Local()
+    tapos = net.use_tapos_cache()
+    assert net.copy(deep=True)._tapos is tapos
+
+
+def test_tapos_cache_shared_between_threads_calls_get_info_once(
+    get_info_calls,
+):
+    net = eospyo.Local()
+    net.use_tapos_cache()
+    threads = [threading.Thread(target=net.get_tapos) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(get_info_calls) == 1
+
+
+def test_tapos_cache_background_thread_refreshes_block(get_info_calls):
+    net = eospyo.Local()
+    tapos = net.use_tapos_cache(refresh_interval=0.01, background=True)
+    while len(get_info_calls) < 3:
+        time.sleep(0.01)
+    assert int(net.get_tapos()[1], 16) >= 3
+    tapos.stop()
+    calls = len(get_info_calls)
+    time.sleep(0.05)
+    assert len(get_info_calls) == calls
+
+
+# async net
+
+
+def test_async_net_get_info_returns_dict(httpx_mock):
+    httpx_mock.add_response(json={"chain_id": "ab"})
+
+    async def get_info():
+        async with eospyo.AsyncNet(host="http://127.0.0.1:8888") as net:
+            return await net.get_info()
+
+    assert asyncio.run(get_info()) == {"chain_id": "ab"}
+
+
+def test_async_net_parses_responses_as_net(httpx_mock):
+    httpx_mock.add_response(json={"rows": [1, 2], "more": False})
+    httpx_mock.add_response(json={"binargs": "cafe"})
+
+    async def requests():
+        async with eospyo.AsyncNet(host="http://127.0.0.1:8888") as net:
+            rows = await net.get_table_rows(
+                code="user2", table="messages", scope="user2"
+            )
+            bytes_ = await net.abi_json_to_bin(
+                account_name="user2", action="sendmsg", json={}
+            )
+            return rows, bytes_
+
+    assert asyncio.run(requests()) == ([1, 2], b"\xca\xfe")
+
+
+def test_async_net_keeps_many_requests_in_flight(httpx_mock):
+    for i in range(50):
+        httpx_mock.add_response(json={"i": i})
+
+    async def requests():
+        async with eospyo.AsyncNet(host="http://127.0.0.1:8888") as net:
+            calls = [net.get_block(block_num_or_id=i) for i in range(50)]
+            return await asyncio.gather(*calls)
+
+    assert len(asyncio.run(requests())) == 50
+
+
+def test_async_net_raises_connection_error(httpx_mock):
+    def raise_write_error(*args, **kwargs):
+        raise httpx.WriteError("")
+
+    httpx_mock.add_callback(raise_write_error)
+
+    async def get_info():
+        async with eospyo.AsyncNet(host="http://127.0.0.1:8888") as net:
+            await net.get_info()
+
+    with pytest.raises(eospyo.exc.ConnectionError):
+        asyncio.run(get_info())
+
+
+def test_async_net_closes_its_client():
+    net = eospyo.AsyncNet(host="http://127.0.0.1:8888")
+    client = net._client()
+    asyncio.run(net.aclose())
+    assert client.is_closed
+
+
+def test_async_net_can_not_refresh_tapos_in_background():
+    net = eospyo.AsyncNet(host="http://127.0.0.1:8888")
+    with pytest.raises(ValueError):
+        net.use_tapos_cache(background=True)
+
+
+def test_async_net_get_tapos_uses_the_tapos_cache():
+    net = eospyo.AsyncNet(host="http://127.0.0.1:8888")
+    net.use_tapos_cache().update(
+        {"chain_id": "ab" * 32, "last_irreversible_block_id": "01"}
+    )
+    assert asyncio.run(net.get_tapos()) == ("ab" * 32, "01")
+
+
+# table iteration
+
+
+def fake_table(rows_count, requests):
+    def request(self, *, endpoint, payload, **kwargs):
+        requests.append(payload)
+        lower = int(payload.get("lower_bound", 0))
+        upper = int(payload.get("upper_bound", 2**64 - 1))
+        keys = [k for k in range(rows_count) if lower <= k <= upper]
+        if payload.get("reverse"):
+            keys.reverse()
+        page, rest = keys[: payload["limit"]], keys[payload["limit"] :]
+        return {
+            "rows": [{"id": k} for k in page],
+            "more": bool(rest),
+            "next_key": str(rest[0]) if rest else "",
+        }
+
+    return request
+
+
+@pytest.fixture
+def table_requests(monkeypatch):
+    requests = []
+    monkeypatch.setattr(eospyo.Net, "_request", fake_table(50, requests))
+    yield requests
+
+
+def test_iter_table_rows_follows_next_key(table_requests):
+    net = eospyo.Local()
+    rows = net.iter_table_rows("user2", "items", "user2", limit=7)
+    assert [r["id"] for r in rows] == list(range(50))
+    assert len(table_requests) > 1
+
+
+def test_iter_table_rows_in_reverse(table_requests):
+    net = eospyo.Local()
+    rows = net.iter_table_rows(
+        "user2", "items", "user2", limit=7, reverse=True
+    )
+    assert [r["id"] for r in rows] == list(range(49, -1, -1))
+
+
+def test_iter_table_rows_with_prefetch(table_requests):
+    net = eospyo.Local()
+    rows = net.iter_table_rows("user2", "items", "user2", prefetch=True)
+    assert [r["id"] for r in rows] == list(range(50))
+
+
+def test_iter_table_rows_requests_pages_on_demand(table_requests):
+    net = eospyo.Local()
+    rows = net.iter_table_rows("user2", "items", "user2", limit=7)
+    next(rows)
+    assert len(table_requests) == 1
+
+
+def test_async_iter_table_rows_with_prefetch(monkeypatch):
+    request = fake_table(50, [])
+
+    async def async_request(self, **kwargs):
+        return request(self, **kwargs)
+
+    monkeypatch.setattr(eospyo.AsyncNet, "_request", async_request)
+    net = eospyo.AsyncNet(host="http://127.0.0.1:8888")
+
+    async def ids():
+        rows = net.iter_table_rows(
+            "user2", "t", "user2", limit=7, prefetch=True
+        )
+        return [r["id"] async for r in rows]
+
+    assert asyncio.run(ids()) == list(range(50))
+
+
+@pytest.mark.parametrize(
+    "seconds,max_limit,expected_limit",
+    [(0.01, 5000, 200), (0.5, 5000, 100), (5, 5000, 50), (0.01, 150, 150)],
+)
+def test_table_page_size_adapts_to_response_time(
+    seconds, max_limit, expected_limit
+):
+    data = {"rows": [], "more": True, "next_key": "5"}
+    _, payload = eospyo.net._next_table_page(
+        {"limit": 100}, data, seconds, 0.5, max_limit
+    )
+    assert payload == {"limit": expected_limit, "lower_bound": "5"}
+
+
+def test_table_page_with_api_error_raises_value_error():
+    data = {"code": 500, "error": {"what": "Table not found"}}
+    with pytest.raises(ValueError):
+        eospyo.net._next_table_page({"limit": 10}, data, 0.1, 0.5, 5000)
+
+
+def test_table_page_without_next_key_raises_value_error():
+    data = {"rows": [], "more": True}
+    with pytest.raises(ValueError):
+        eospyo.net._next_table_page({"limit": 10}, data, 0.1, 0.5, 5000)
+
+
+def test_scan_table_yields_rows_in_key_order(table_requests):
+    net = eospyo.Local()
+    rows = net.scan_table("user2", "items", "user2", partitions=4, limit=5)
+    assert [r["id"] for r in rows] == list(range(50))
+    first_lower_bounds = {
+        r["lower_bound"] for r in table_requests if r["limit"] == 5
+    }
+    assert len(first_lower_bounds) == 4
+
+
+def test_scan_table_within_bounds(table_requests):
+    net = eospyo.Local()
+    rows = net.scan_table(
+        "user2", "items", "user2", lower_bound=10, upper_bound="19"
+    )
+    assert [r["id"] for r in rows] == list(range(10, 20))
+
+
+def test_scan_table_sends_name_ranges_as_numbers(table_requests):
+    net = eospyo.Local()
+    lower = eospyo.types.Name.string_to_uint64("12345")
+    rows = net.scan_table(
+        "user2",
+        "items",
+        "user2",
+        partitions=2,
+        lower_bound="12345",
+        upper_bound="zzzzz",
+        key_type="name",
+    )
+    assert list(rows) == []
+    assert {r["key_type"] for r in table_requests} == {"i64"}
+    assert min(int(r["lower_bound"]) for r in table_requests) == lower
+
+
+def test_scan_table_reads_ahead_at_most_buffer_size_rows(table_requests):
+    net = eospyo.Local()
+    rows = net.scan_table(
+        "user2", "items", "user2", partitions=2, limit=1, buffer_size=1
+    )
+    assert next(rows) == {"id": 0}
+    time.sleep(0.3)
+    assert len(table_requests) < 10  # of the 50 one row pages
+    rows.close()
+
+
+def test_scan_table_closed_early_does_not_wait_for_ranges(monkeypatch):
+    request = fake_table(50, [])
+    release = threading.Event()
+
+    def slow_request(self, *, payload, **kwargs):
+        if int(payload.get("lower_bound", 0)) > 0:
+            release.wait(5)  # later ranges hang
+        return request(self, payload=payload, **kwargs)
+
+    monkeypatch.setattr(eospyo.Net, "_request", slow_request)
+    rows = eospyo.Local().scan_table("user2", "items", "user2")
+    started = time.monotonic()
+    assert next(rows) == {"id": 0}
+    rows.close()
+    assert time.monotonic() - started < 1
+    release.set()
+
+
+def test_scan_table_raises_the_error_of_a_range(monkeypatch):
+    def failing_request(self, **kwargs):
+        return {"code": 500, "error": {"what": "Table not found"}}
+
+    monkeypatch.setattr(eospyo.Net, "_request", failing_request)
+    rows = eospyo.Local().scan_table("user2", "items", "user2")
+    with pytest.raises(ValueError):
+        list(rows)
+
+
+def test_async_scan_table_yields_rows_in_key_order(monkeypatch):
+    request = fake_table(50, [])
+
+    async def async_request(self, **kwargs):
+        return request(self, **kwargs)
+
+    monkeypatch.setattr(eospyo.AsyncNet, "_request", async_request)
+    net = eospyo.AsyncNet(host="http://127.0.0.1:8888")
+
+    async def ids():
+        rows = net.scan_table("user2", "t", "user2", partitions=3, limit=4)
+        return [r["id"] async for r in rows]
+
+    assert asyncio.run(ids()) == list(range(50))
+
+
+def test_key_ranges_split_name_bounds():
+    lower = eospyo.types.Name.string_to_uint64("a")
+    upper = eospyo.types.Name.string_to_uint64("b")
+    ranges = eospyo.net._key_ranges("a", "b", 2, "name")
+    assert ranges[0][0] == lower
+    assert ranges[-1][1] == upper
+    assert ranges[0][1] + 1 == ranges[1][0]
+
+
+def test_key_ranges_read_digit_bounds_as_names_for_name_keys():
+    ranges = eospyo.net._key_ranges("12345", "12345", 1, "name")
+    key = eospyo.types.Name.string_to_uint64("12345")
+    assert ranges == [(key, key)]
+    assert eospyo.net._key_ranges("12345", "12345", 1, None) == [
+        (12345, 12345)
+    ]
+
+
+def test_key_ranges_cover_the_whole_table_by_default():
+    ranges = eospyo.net._key_ranges(None, None, 3, None)
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == 2**64 - 1
+    assert len(ranges) == 3
+
+
+def test_key_ranges_of_unsupported_key_type_raise_value_error():
+    with pytest.raises(ValueError):
+        eospyo.net._key_ranges(None, None, 3, "sha256")
+
+
+def fake_blocks(calls, failures=()):
+    """Return a get_block that fails once for the block numbers given."""
+    lock = threading.Lock()
+    state = {"in_flight": 0, "max_in_flight": 0, "failed": set()}
+
+    def get_block(self, *, block_num_or_id):
+        block_num = int(block_num_or_id)
+        with lock:
+            calls.append(block_num)
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(
+                state["max_in_flight"], state["in_flight"]
+            )
+        time.sleep(0.01 * (block_num % 3))  # out of order answers
+        with lock:
+            state["in_flight"] -= 1
+        if block_num in failures and block_num not in state["failed"]:
+            state["failed"].add(block_num)
+            raise eospyo.exc.ConnectionError(
+                response=None, url="", payload={}, error="down"
+            )
+        return {"id": f"{block_num:08x}", "block_num": block_num}
+
+    return get_block, state
+
+
+def test_fetch_blocks_yields_blocks_in_order(monkeypatch):
+    get_block, state = fake_blocks([])
+    monkeypatch.setattr(eospyo.Net, "get_block", get_block)
+    net = eospyo.Local()
+    blocks = net.fetch_blocks(1, 30, concurrency=4)
+    assert [b["block_num"] for b in blocks] == list(range(1, 31))
+    assert 1 < state["max_in_flight"] <= 4
+
+
+def test_fetch_blocks_does_not_request_past_the_window(monkeypatch):
+    calls = []
+    get_block, _ = fake_blocks(calls)
+    monkeypatch.setattr(eospyo.Net, "get_block", get_block)
+    net = eospyo.Local()
+    blocks = net.fetch_blocks(1, 1000, concurrency=4)
+    assert next(blocks)["block_num"] == 1
+    blocks.close()
+    assert max(calls) <= 5
+
+
+def test_fetch_blocks_retries_failed_blocks(monkeypatch):
+    calls = []
+    get_block, _ = fake_blocks(calls, failures={3})
+    monkeypatch.setattr(eospyo.Net, "get_block", get_block)
+    net = eospyo.Local()
+    blocks = net.fetch_blocks(1, 5, concurrency=2, retry_delay=0)
+    assert [b["block_num"] for b in blocks] == [1, 2, 3, 4, 5]
+    assert calls.count(3) == 2
+
+
+def test_fetch_blocks_raises_value_error_after_retries(monkeypatch):
+    monkeypatch.setattr(
+        eospyo.Net, "get_block", lambda self, **kwargs: {"code": 500}
+    )
+    net = eospyo.Local()
+    with pytest.raises(ValueError):
+        list(net.fetch_blocks(1, 5, retries=1, retry_delay=0))
+
+
+def test_fetch_blocks_raises_connection_error_after_retries(monkeypatch):
+    calls = []
+
+    def failing_get_block(self, **kwargs):
+        calls.append(kwargs)
+        raise eospyo.exc.ConnectionError(
+            response=None, url="", payload={}, error="down"
+        )
+
+    monkeypatch.setattr(eospyo.Net, "get_block", failing_get_block)
+    net = eospyo.Local()
+    with pytest.raises(eospyo.exc.ConnectionError):
+        list(net.fetch_blocks(1, 1, retries=2, retry_delay=0))
+    assert len(calls) == 3
+
+
+def test_async_fetch_blocks_yields_blocks_in_order(monkeypatch):
+    get_block, _ = fake_blocks([], failures={2})
+
+    async def async_get_block(self, **kwargs):
+        return get_block(self, **kwargs)
+
+    monkeypatch.setattr(eospyo.AsyncNet, "get_block", async_get_block)
+    net = eospyo.AsyncNet(host="http://127.0.0.1:8888")
+
+    async def block_nums():
+        blocks = net.fetch_blocks(1, 20, concurrency=3, retry_delay=0)
+        return [b["block_num"] async for b in blocks]
+
+    assert asyncio.run(block_nums()) == list(range(1, 21))
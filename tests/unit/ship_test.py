@@ -0,0 +1,254 @@
+import asyncio
+import json
+import pathlib
+import sys
+
+import pytest
+
+import eospyo
+from eospyo import types
+
+# state history abi of leap 3.1 and its get_status and get_blocks messages
+# for blocks 1000 to 1002 (an empty block, a transfer and an updateauth),
+# as written by sample_contract/record_ship.py
+DATA = pathlib.Path(__file__).parent / "data"
+SHIP_ABI = json.loads((DATA / "ship.abi").read_text())
+FRAMES = json.loads((DATA / "ship_frames.json").read_text())
+STATUS = bytes.fromhex(FRAMES["get_status"])
+BLOCKS = [bytes.fromhex(frame) for frame in FRAMES["get_blocks"]]
+CHAIN_ID = "8a34ec7df1b8cd06ff4a8abbaa7cc50300823350cadc59ab296cb00d104d2b8f"
+
+
+@pytest.fixture(scope="module")
+def ship_abi():
+    yield eospyo.ship.ShipAbi(SHIP_ABI)
+
+
+def test_get_status_result_is_decoded(ship_abi):
+    type_, result = ship_abi.decode_result(STATUS)
+    assert type_ == "get_status_result_v0"
+    assert result["head"]["block_num"] == 1004
+    assert result["chain_state_begin_block"] == 2
+    assert result["chain_id"] == CHAIN_ID
+
+
+def test_get_blocks_results_are_decoded(ship_abi):
+    results = [ship_abi.decode_result(block) for block in BLOCKS]
+    assert {type_ for type_, _ in results} == {"get_blocks_result_v0"}
+    blocks = [r["block"] for _, r in results]
+    assert [r["this_block"]["block_num"] for _, r in results] == [
+        1000,
+        1001,
+        1002,
+    ]
+    assert [r["prev_block"] for _, r in results[1:]] == [
+        r["this_block"] for _, r in results[:-1]
+    ]
+    assert blocks[1]["timestamp"] == "2022-10-03T14:07:13.000"
+    assert blocks[1]["producer"] == "eosio"
+    assert blocks[1]["producer_signature"].startswith("SIG_K1_")
+    assert [len(b["transactions"]) for b in blocks] == [0, 1, 1]
+
+
+def test_packed_transactions_of_blocks_are_readable(ship_abi):
+    _, result = ship_abi.decode_result(BLOCKS[1])
+    receipt = result["block"]["transactions"][0]
+    assert receipt["status"] == 0
+    trx_type, packed = receipt["trx"]
+    assert trx_type == "packed_transaction"
+    assert packed["compression"] == 0
+    trx = ship_abi.abi.unpack(type_="transaction", bytes_=packed["packed_trx"])
+    assert trx["actions"][0]["account"] == "eosio.token"
+    assert trx["actions"][0]["name"] == "transfer"
+
+
+def test_action_traces_are_decoded(ship_abi):
+    _, result = ship_abi.decode_result(BLOCKS[1])
+    onblock, transfer = [trace for _, trace in result["traces"]]
+    assert onblock["action_traces"][0][1]["act"]["name"] == "onblock"
+    action_traces = transfer["action_traces"]
+    assert {type_ for type_, _ in action_traces} == {"action_trace_v1"}
+    assert [t["receiver"] for _, t in action_traces] == [
+        "eosio.token",
+        "user2",
+        "user1",
+    ]
+    assert [t["creator_action_ordinal"] for _, t in action_traces] == [0, 1, 1]
+    _, receipt = action_traces[0][1]["receipt"]
+    assert receipt["auth_sequence"] == [{"account": "user2", "sequence": 12}]
+
+
+def test_account_ram_deltas_are_decoded(ship_abi):
+    _, result = ship_abi.decode_result(BLOCKS[2])
+    _, updateauth = result["traces"][1]
+    _, action_trace = updateauth["action_traces"][0]
+    assert action_trace["act"]["name"] == "updateauth"
+    assert action_trace["account_ram_deltas"] == [
+        {"account": "user1", "delta": 306}
+    ]
+
+
+def test_bytes_are_memoryviews_of_the_message(ship_abi):
+    _, result = ship_abi.decode_result(BLOCKS[1])
+    _, trace = result["traces"][1]
+    _, action_trace = trace["action_traces"][0]
+    data = action_trace["act"]["data"]
+    assert isinstance(data, memoryview)
+    assert isinstance(action_trace["return_value"], memoryview)
+    token_abi = eospyo.abi.Abi.from_file(
+        pathlib.Path(__file__).parents[2] / "sample_contract/eosio_token.abi"
+    )
+    transfer = token_abi.abi_bin_to_json(action="transfer", bytes=data)
+    assert transfer["quantity"] == "1.0000 EOS"
+
+
+def test_delta_rows_are_decoded_with_table_type(ship_abi):
+    _, result = ship_abi.decode_result(BLOCKS[1])
+    deltas = {d["name"]: d["rows"] for _, d in result["deltas"]}
+    assert list(deltas) == [
+        "contract_row",
+        "resource_usage",
+        "resource_limits_state",
+    ]
+    rows = [row["data"] for row in deltas["contract_row"]]
+    assert [(r["scope"], r["table"]) for _, r in rows] == [
+        ("user2", "accounts"),
+        ("user1", "accounts"),
+    ]
+    _, usage = deltas["resource_usage"][0]["data"]
+    assert usage["owner"] == "user2"
+
+
+def test_permission_keys_are_decoded(ship_abi):
+    _, result = ship_abi.decode_result(BLOCKS[2])
+    _, delta = result["deltas"][0]
+    assert delta["name"] == "permission"
+    _, permission = delta["rows"][0]["data"]
+    assert (permission["owner"], permission["name"]) == ("user1", "transfer")
+    key = permission["auth"]["keys"][0]["key"]
+    assert key == "PUB_K1_8EN2WjAsysGmagNmorihtv4wj5Mfzg1vvCQA1L6q4sN2TPswQa"
+
+
+def test_delta_rows_are_left_as_bytes_on_demand(ship_abi):
+    _, result = ship_abi.decode_result(BLOCKS[1], decode_rows=False)
+    _, delta = result["deltas"][0]
+    assert isinstance(delta["rows"][0]["data"], memoryview)
+
+
+def raw_result(ship_abi, message):
+    """Return a get_blocks result with its binary fields left as bytes."""
+    _, result = ship_abi.abi.unpack(type_="result", bytes_=message)
+    return result
+
+
+def pack_result(ship_abi, result):
+    value = ["get_blocks_result_v0", result]
+    return ship_abi.abi.pack(type_="result", value=value)
+
+
+def test_rows_that_cannot_be_decoded_are_left_as_bytes(ship_abi):
+    _, result = ship_abi.decode_result(BLOCKS[2], decode_rows=False)
+    permission_row = bytes(result["deltas"][0][1]["rows"][0]["data"])
+    usage_row = bytes(result["deltas"][1][1]["rows"][0]["data"])
+    key = "PUB_K1_8EN2WjAsysGmagNmorihtv4wj5Mfzg1vvCQA1L6q4sN2TPswQa"
+    # the same key as a WebAuthn key (type 2), which PublicKey cannot read
+    k1_key = bytes(types.PublicKey(key))
+    webauthn_key = b"\x02" + k1_key[1:] + b"\x01\x09localhost"
+    webauthn_row = permission_row.replace(k1_key, webauthn_key)
+    truncated_row = usage_row[:-3]
+    deltas = [
+        ["table_delta_v0", {"name": name, "rows": [row]}]
+        for name, row in [
+            ("permission", {"present": True, "data": webauthn_row}),
+            ("resource_usage", {"present": True, "data": truncated_row}),
+            ("resource_usage", {"present": True, "data": usage_row}),
+        ]
+    ]
+    raw = raw_result(ship_abi, BLOCKS[2])
+    raw["deltas"] = ship_abi.abi.pack(type_="table_delta[]", value=deltas)
+
+    _, result = ship_abi.decode_result(pack_result(ship_abi, raw))
+    rows = [d["rows"][0]["data"] for _, d in result["deltas"]]
+    assert bytes(rows[0]) == webauthn_row
+    assert bytes(rows[1]) == truncated_row
+    assert rows[2][1]["owner"] == "user1"
+
+
+def test_blocks_that_cannot_be_decoded_are_left_as_bytes(ship_abi):
+    _, result = ship_abi.decode_result(BLOCKS[1])
+    signature = result["block"]["producer_signature"]
+    # the block signed with a WebAuthn signature (type 2)
+    k1_signature = bytes(types.Signature(signature))
+    webauthn_signature = b"\x02" + k1_signature[1:] + b"\x00\x00"
+    raw = raw_result(ship_abi, BLOCKS[1])
+    block = bytes(raw["block"]).replace(k1_signature, webauthn_signature)
+    raw["block"] = block
+
+    _, result = ship_abi.decode_result(pack_result(ship_abi, raw))
+    assert bytes(result["block"]) == block
+    assert len(result["traces"]) == 2
+
+
+def test_request_is_serialized_as_request_variant(ship_abi):
+    bytes_ = ship_abi.pack_request(
+        "get_blocks_ack_request_v0", {"num_messages": 3}
+    )
+    assert bytes_ == b"\x02\x03\x00\x00\x00"
+
+
+def replay_server(websockets, messages, requests):
+    """Serve the recorded messages to get_blocks requests, as nodeos."""
+    abi = eospyo.abi.Abi(SHIP_ABI)
+    responses = {
+        "get_status_request_v0": [STATUS],
+        "get_blocks_request_v0": messages,
+    }
+
+    async def handler(ws, *args):
+        await ws.send(json.dumps(SHIP_ABI))
+        async for message in ws:
+            request = abi.unpack(type_="request", bytes_=message)
+            requests.append(request)
+            for result in responses.get(request[0], []):
+                await ws.send(result)
+
+    return websockets.serve(handler, "127.0.0.1", 0)
+
+
+def test_client_reads_blocks_from_replay_server():
+    websockets = pytest.importorskip("websockets")
+    requests = []
+
+    async def read_blocks():
+        server = await replay_server(websockets, BLOCKS, requests)
+        port = list(server.sockets)[0].getsockname()[1]
+        url = f"ws://127.0.0.1:{port}"
+        try:
+            async with eospyo.ship.ShipClient(
+                url, max_messages_in_flight=2
+            ) as ship:
+                status = await ship.get_status()
+                blocks = ship.get_blocks(
+                    start_block_num=1000, end_block_num=1003
+                )
+                block_nums = [
+                    r["this_block"]["block_num"] async for r in blocks
+                ]
+                return status, block_nums
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    status, block_nums = asyncio.run(read_blocks())
+    assert status["chain_id"] == CHAIN_ID
+    assert block_nums == [1000, 1001, 1002]
+    assert requests[1][0] == "get_blocks_request_v0"
+    assert requests[1][1]["max_messages_in_flight"] == 2
+    assert requests[2] == ["get_blocks_ack_request_v0", {"num_messages": 1}]
+
+
+def test_client_requires_websockets(monkeypatch):
+    monkeypatch.setitem(sys.modules, "websockets", None)
+    client = eospyo.ship.ShipClient("ws://127.0.0.1:8080")
+    with pytest.raises(ImportError):
+        asyncio.run(client.connect())
@@ -0,0 +1,207 @@
+import datetime
+import itertools
+
+import pytest
+
+import eospyo
+
+
+def transfer(account="eosio.token", name="transfer"):
+    return {"account": account, "name": name, "data": {}}
+
+
+class FakeChain:
+    """Blocks by number, with head and lib, that forks on demand."""
+
+    def __init__(self, blocks=5, lib=2):
+        self.blocks = {}
+        self.lib = lib
+        for _ in range(blocks):
+            self.produce()
+
+    @property
+    def head(self):
+        return max(self.blocks)
+
+    def produce(self, actions=(), branch="a", block_num=None):
+        block_num = block_num or len(self.blocks) + 1
+        previous = self.blocks.get(block_num - 1, {"id": ""})["id"]
+        now = datetime.datetime.now(datetime.timezone.utc)
+        timestamp = now.replace(tzinfo=None).isoformat(timespec="milliseconds")
+        self.blocks[block_num] = {
+            "id": f"{block_num:08x}{branch * 56}",
+            "block_num": block_num,
+            "previous": previous,
+            "timestamp": timestamp,
+            "transactions": [
+                {"trx": {"transaction": {"actions": list(actions)}}},
+                {"trx": "ab" * 32},  # deferred
+            ],
+        }
+
+    def fork(self, block_num):
+        """Replace the blocks from block_num to head by branch b."""
+        for n in range(block_num, self.head + 1):
+            self.produce(branch="b", block_num=n)
+
+    def get_info(self):
+        return {
+            "head_block_num": self.head,
+            "last_irreversible_block_num": self.lib,
+        }
+
+    def get_block(self, *, block_num_or_id):
+        block = self.blocks.get(int(block_num_or_id))
+        return {"code": 500} if block is None else block
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(eospyo.stream.time, "sleep", sleeps.append)
+    yield sleeps
+
+
+def take(stream, count):
+    events = []
+    for event in stream:
+        events.append(event)
+        if len(events) == count:
+            stream.stop()
+    return events
+
+
+def test_stream_starts_at_head_and_waits_for_new_blocks(sleeps):
+    chain = FakeChain()
+    stream = eospyo.stream.BlockStream(chain)
+    events = iter(stream)
+    assert next(events).block_num == 5
+    chain.produce()
+    assert next(events).block_num == 6
+    assert len(sleeps) == 1
+    assert 0 < sleeps[0] <= 0.5
+
+
+def test_stream_follows_last_irreversible_block(sleeps):
+    chain = FakeChain(lib=4)
+    stream = eospyo.stream.BlockStream(chain, start=3, irreversible=True)
+    events = iter(stream)
+    assert [next(events).block_num for _ in range(2)] == [3, 4]
+    chain.lib = 5
+    assert next(events).block_num == 5
+
+
+def test_empty_polls_double_the_interval(sleeps):
+    chain = FakeChain()
+    stream = eospyo.stream.BlockStream(chain, start=6, max_interval=2)
+    events = iter(stream)
+    original_get_info = chain.get_info
+
+    def get_info():
+        if len(sleeps) == 5:
+            chain.produce()
+        return original_get_info()
+
+    chain.get_info = get_info
+    assert next(events).block_num == 6
+    assert sleeps == [0.5, 1, 2, 2, 2]
+
+
+def test_micro_fork_yields_undo_events(sleeps):
+    chain = FakeChain()
+    stream = eospyo.stream.BlockStream(chain, start=3)
+    events = iter(stream)
+    assert [next(events).block_id[8] for _ in range(3)] == ["a"] * 3
+    chain.fork(4)
+    chain.produce(branch="b")
+    events = [next(events) for _ in range(5)]
+    assert [(e.type, e.block_num) for e in events] == [
+        ("undo", 5),
+        ("undo", 4),
+        ("block", 4),
+        ("block", 5),
+        ("block", 6),
+    ]
+    assert events[2].block_id[8] == "b"
+
+
+def test_fork_back_to_last_irreversible_block_is_undone(sleeps):
+    chain = FakeChain(lib=2)
+    stream = eospyo.stream.BlockStream(chain, start=2)
+    events = iter(stream)
+    assert [next(events).block_num for _ in range(4)] == [2, 3, 4, 5]
+    chain.fork(3)
+    chain.produce(branch="b")
+    events = [next(events) for _ in range(7)]
+    assert [(e.type, e.block_num) for e in events] == [
+        ("undo", 5),
+        ("undo", 4),
+        ("undo", 3),
+        ("block", 3),
+        ("block", 4),
+        ("block", 5),
+        ("block", 6),
+    ]
+
+
+def test_fork_older_than_last_irreversible_block_raises(sleeps):
+    chain = FakeChain(lib=2)
+    stream = eospyo.stream.BlockStream(chain, start=2)
+    events = iter(stream)
+    assert [next(events).block_num for _ in range(4)] == [2, 3, 4, 5]
+    chain.fork(2)
+    chain.produce(branch="b")
+    assert [(e.type, e.block_num) for e in itertools.islice(events, 3)] == [
+        ("undo", 5),
+        ("undo", 4),
+        ("undo", 3),
+    ]
+    with pytest.raises(ValueError):
+        next(events)
+
+
+def test_connection_errors_are_retried(sleeps):
+    chain = FakeChain()
+    stream = eospyo.stream.BlockStream(chain, start=4)
+    original_get_block = chain.get_block
+
+    def get_block(*, block_num_or_id):
+        if not sleeps:
+            raise eospyo.exc.ConnectionError(
+                response=None, url="", payload={}, error="unknown block"
+            )
+        return original_get_block(block_num_or_id=block_num_or_id)
+
+    chain.get_block = get_block
+    assert [e.block_num for e in take(stream, 2)] == [4, 5]
+    assert sleeps == [0.5]
+
+
+def test_filters_keep_matching_actions_and_blocks(sleeps):
+    chain = FakeChain(blocks=0)
+    chain.produce([transfer(), transfer(name="issue")])
+    chain.produce([transfer("eosio", "buyram")])
+    chain.produce([transfer("atomicassets", "mintasset")])
+    stream = eospyo.stream.BlockStream(
+        chain, start=1, filters=[("eosio.token", "transfer"), ("eosio", None)]
+    )
+    events = take(stream, 2)
+    assert [e.block_num for e in events] == [1, 2]
+    assert events[0].actions == [transfer()]
+
+
+def test_run_measures_latency(sleeps):
+    chain = FakeChain()
+    stream = eospyo.stream.BlockStream(chain, start=1)
+    events = []
+
+    def callback(event):
+        events.append(event)
+        if len(events) == 5:
+            stream.stop()
+
+    stream.run(callback)
+    assert len(events) == 5
+    assert 0 <= stream.latency < 5
+    assert 0 <= stream.average_latency < 5
+    assert stream.next_block_num == 6
@@ -1,3 +1,4 @@
+import asyncio
 import datetime as dt
 import json
 
@@ -214,6 +215,45 @@ def test_when_link_raw_transaction_then_returns_linked_transaction(
     assert isinstance(linked_trans, eospyo.LinkedTransaction)
 
 
+def test_link_uses_the_tapos_cache_of_net(action_clear):
+    net = eospyo.Local()
+    tapos = net.use_tapos_cache()
+    block_id = (
+        "0000a1b2c3d4e5f60708090a0b0c0d0e0f101112131415161718191a1b1c1d1e"
+    )
+    tapos.update(
+        {"chain_id": "ab" * 32, "last_irreversible_block_id": block_id}
+    )
+    raw_trans = eospyo.Transaction(actions=[action_clear])
+    for _ in range(2):  # would call the (offline) net without the cache
+        linked_trans = raw_trans.link(net=net)
+        assert linked_trans.chain_id == "ab" * 32
+        assert int(linked_trans.ref_block_num) == 0xA1B2
+        assert int(linked_trans.ref_block_prefix) == 0x0A090807
+
+
+def test_link_and_send_with_async_net(action_clear, httpx_mock):
+    httpx_mock.add_response(json={"transaction_id": "01"})
+    net = eospyo.AsyncNet(host="http://127.0.0.1:8888")
+    net.use_tapos_cache().update(
+        {"chain_id": "ab" * 32, "last_irreversible_block_id": "00" * 32}
+    )
+    raw_trans = eospyo.Transaction(actions=[action_clear])
+
+    async def link_and_send():
+        linked_trans = await raw_trans.link_async(net=net)
+        signed_trans = linked_trans.sign(
+            key="5HsVgxhxdL9gvgcAAyCZSWNgtLxAhGfEX2YU98w6QSkePoVvPNK"
+        )
+        async with net:
+            return signed_trans, await signed_trans.send_async()
+
+    signed_trans, resp = asyncio.run(link_and_send())
+    assert resp == {"transaction_id": "01"}
+    request = json.loads(httpx_mock.get_requests()[0].content)
+    assert request["packed_trx"] == signed_trans.pack()
+
+
 def test_when_sign_linked_transaction_then_return_signed_transaction(
     action_clear, net
 ):
@@ -268,6 +308,62 @@ def test_example_transaction_pack(example_transaction):
     assert bytes(example_transaction).hex() == expected
 
 
+def test_example_transaction_write_appends_to_buffer(example_transaction):
+    buffer = bytearray(b"prefix")
+    example_transaction.write(buffer)
+    assert buffer == b"prefix" + bytes(example_transaction)
+
+
+def test_action_data_length_prefix_is_a_varuint32(example_transaction):
+    action = example_transaction.actions[0].copy(
+        update={
+            "data": [
+                eospyo.Data(name="message", value=eospyo.types.String("a"))
+            ]
+            * 100
+        }
+    )
+    data = bytes(action)[33:]  # account, name and one authorization
+    assert data == b"\xc8\x01" + b"\x01a" * 100
+
+
+def test_action_with_packed_data_serializes_as_data_list(
+    example_transaction,
+):
+    action = example_transaction.actions[0]
+    data = b"".join(bytes(d) for d in action.data)
+    packed_action = action.copy(update={"data": data})
+    assert bytes(packed_action) == bytes(action)
+
+
+def test_action_accepts_data_packed_by_abi(net):
+    abi = eospyo.abi.Abi(
+        {"actions": [{"name": "sendmsg", "type": "string"}], "structs": []}
+    )
+    action = eospyo.Action(
+        account="user2",
+        name="sendmsg",
+        data=abi.abi_json_to_bin(action="sendmsg", json="x" * 1000),
+        authorization=[
+            eospyo.Authorization(actor="user2", permission="active")
+        ],
+    )
+    bytes_ = bytes(action.link(net))
+    assert bytes_[33:] == b"\xea\x07\xe8\x07" + b"x" * 1000
+
+
+def test_action_data_must_not_be_a_string():
+    with pytest.raises(pydantic.ValidationError):
+        eospyo.Action(
+            account="user2",
+            name="sendmsg",
+            data="not packed",
+            authorization=[
+                eospyo.Authorization(actor="user2", permission="active")
+            ],
+        )
+
+
 def test_example_transaction_id(example_transaction):
     expected = "1a634bb62717cb1a94f5312c7d369b95fe7ea3f1f955a8c1907a74cf0d4153d6"  # NOQA: E501
     assert example_transaction.id() == expected
@@ -280,6 +376,213 @@ def test_example_transaction_has_expected_signature(example_transaction):
     assert signed_transaction.signatures[0] == expected
 
 
+def test_example_transaction_signed_with_private_key_object(
+    example_transaction,
+):
+    key = eospyo.utils.PrivateKey(
+        "5K5UHY2LjHw2QQFJKCd2PdF7hxPJnknMfQLhxbEguJJttr1DFdp"
+    )
+    signed_transaction = example_transaction.sign(key=key)
+    expected = "SIG_K1_HMzTApq6UiSA7Ldr6mCKqPKQkrsmUknHiZi4HZt7HMz3ktHHMv4MuRTEUx9Za8VbB6NzcUFh35EBj4Y9wtVjw9qL3t4xYX"  # NOQA: E501
+    assert signed_transaction.signatures[0] == expected
+
+
+def test_sign_batch_returns_signed_transactions_in_order(
+    example_transaction,
+):
+    key = "5K5UHY2LjHw2QQFJKCd2PdF7hxPJnknMfQLhxbEguJJttr1DFdp"
+    transactions = [
+        example_transaction,
+        example_transaction.copy(update={"delay_sec": 1}),
+    ]
+    signed = eospyo.LinkedTransaction.sign_batch(
+        transactions, key=key, workers=2
+    )
+    assert [s.signatures for s in signed] == [
+        t.sign(key=key).signatures for t in transactions
+    ]
+
+
+def test_signed_transaction_public_keys_recovers_signer(example_transaction):
+    key = eospyo.utils.PrivateKey(
+        "5K5UHY2LjHw2QQFJKCd2PdF7hxPJnknMfQLhxbEguJJttr1DFdp"
+    )
+    signed_transaction = example_transaction.sign(key=key)
+    assert signed_transaction.public_keys() == [key.public_key]
+
+
+def test_signed_transaction_verify_with_signer_key(example_transaction):
+    key = eospyo.utils.PrivateKey(
+        "5K5UHY2LjHw2QQFJKCd2PdF7hxPJnknMfQLhxbEguJJttr1DFdp"
+    )
+    signed_transaction = example_transaction.sign(key=key)
+    assert signed_transaction.verify()
+    assert signed_transaction.verify(public_keys=[key.public_key])
+
+
+def test_signed_transaction_verify_with_wrong_key(example_transaction):
+    key = "5K5UHY2LjHw2QQFJKCd2PdF7hxPJnknMfQLhxbEguJJttr1DFdp"
+    wrong_key = eospyo.utils.PrivateKey(
+        "5Je7woBXuxQBkpxit35SHZMap9SdKZLoeVBRKxntoMq2NuuN1rL"
+    )
+    signed_transaction = example_transaction.sign(key=key)
+    assert not signed_transaction.verify(public_keys=[wrong_key.public_key])
+
+
+def test_multisig_transaction_is_serialized_once(
+    example_transaction, monkeypatch
+):
+    calls = []
+    write_fields = eospyo.LinkedTransaction._write_fields
+
+    def counting_write_fields(self, buffer):
+        calls.append(self)
+        write_fields(self, buffer)
+
+    monkeypatch.setattr(
+        eospyo.LinkedTransaction, "_write_fields", counting_write_fields
+    )
+    keys = [
+        "5K5UHY2LjHw2QQFJKCd2PdF7hxPJnknMfQLhxbEguJJttr1DFdp",
+        "5Je7woBXuxQBkpxit35SHZMap9SdKZLoeVBRKxntoMq2NuuN1rL",
+        "5HsVgxhxdL9gvgcAAyCZSWNgtLxAhGfEX2YU98w6QSkePoVvPNK",
+    ]
+    trans = example_transaction
+    for key in keys:
+        trans = trans.sign(key=key)
+    trans.pack()
+    trans.id()
+    assert trans.verify(
+        public_keys=[eospyo.utils.PrivateKey(k).public_key for k in keys]
+    )
+    assert len(calls) == 1
+
+
+def test_signed_transaction_shares_validated_fields(example_transaction):
+    key = "5K5UHY2LjHw2QQFJKCd2PdF7hxPJnknMfQLhxbEguJJttr1DFdp"
+    signed = example_transaction.sign(key=key)
+    assert signed.actions is example_transaction.actions
+    fields = {k: getattr(signed, k) for k in signed.__fields__}
+    validated = eospyo.SignedTransaction(**fields)
+    assert validated.signatures == signed.signatures
+    assert bytes(validated) == bytes(signed)
+
+
+def test_transaction_with_10_signatures_can_not_be_signed_again(
+    example_transaction,
+):
+    key = "5K5UHY2LjHw2QQFJKCd2PdF7hxPJnknMfQLhxbEguJJttr1DFdp"
+    signed = example_transaction._add_signature("SIG")
+    signed = signed.copy(update={"signatures": ("SIG",) * 10})
+    with pytest.raises(ValueError):
+        signed.sign(key=key)
+
+
+def test_updated_copy_of_transaction_has_its_own_id(example_transaction):
+    example_transaction.id()
+    updated = example_transaction.copy(update={"delay_sec": 1})
+    assert updated.id() != example_transaction.id()
+
+
+# transaction templates
+
+
+@pytest.fixture
+def tapos_net():
+    net = eospyo.Local()
+    tapos = net.use_tapos_cache()
+    tapos.update(
+        {
+            "chain_id": "ab" * 32,
+            "last_irreversible_block_id": "0000a1b2" + "cd" * 28,
+        }
+    )
+    yield net
+
+
+@pytest.fixture
+def template(example_transaction):
+    action = example_transaction.actions[0]
+    raw_trans = eospyo.Transaction(
+        actions=[
+            eospyo.Action(
+                account=action.account,
+                name=action.name,
+                authorization=action.authorization,
+                data=action.data,
+            )
+        ],
+        delay_sec=3,
+        max_cpu_usage_ms=5,
+        max_net_usage_words=200,
+    )
+    yield eospyo.TransactionTemplate(raw_trans)
+
+
+def packed_as_linked_transaction(trans):
+    """Pack trans without the bytes packed by the template."""
+    fields = {k: getattr(trans, k) for k in trans.__fields__}
+    fields["actions"] = [
+        eospyo.LinkedAction(**a.__dict__) for a in trans.actions
+    ]
+    return bytes(eospyo.LinkedTransaction(**fields))
+
+
+def test_template_link_packs_as_linked_transaction(template, tapos_net):
+    data = [eospyo.Data(name="message", value=eospyo.types.String("hey"))]
+    for new_data in [None, data, b"\x01\x02"]:
+        trans = template.link(net=tapos_net, data=[new_data])
+        assert bytes(trans) == packed_as_linked_transaction(trans)
+
+
+def test_template_link_uses_net_tapos(template, tapos_net):
+    trans = template.link(net=tapos_net)
+    assert trans.chain_id == "ab" * 32
+    assert trans.ref_block_num == str(0xA1B2)
+    template_data = template.transaction.actions[0].data
+    assert trans.actions[0].data == b"".join(bytes(d) for d in template_data)
+
+
+def test_template_link_requires_one_data_per_action(template, tapos_net):
+    with pytest.raises(ValueError):
+        template.link(net=tapos_net, data=[None, None])
+
+
+def test_template_transaction_signature_matches_linked_transaction(
+    template, tapos_net
+):
+    key = "5K5UHY2LjHw2QQFJKCd2PdF7hxPJnknMfQLhxbEguJJttr1DFdp"
+    trans = template.link(net=tapos_net, data=[b"\x01"])
+    signed = trans.sign(key=key)
+    assert bytes(signed) == bytes(trans)
+    assert signed.verify(public_keys=[eospyo.utils.PrivateKey(key).public_key])
+
+
+def test_updated_copy_of_template_transaction_is_packed_again(
+    template, tapos_net
+):
+    trans = template.link(net=tapos_net)
+    updated = trans.copy(update={"delay_sec": 9})
+    assert bytes(updated) != bytes(trans)
+    assert bytes(updated) == packed_as_linked_transaction(updated)
+
+
+def test_template_link_async_uses_async_net_tapos(template, tapos_net):
+    net = eospyo.AsyncNet(host="http://127.0.0.1:8888")
+    net.use_tapos_cache().update(
+        {
+            "chain_id": "ab" * 32,
+            "last_irreversible_block_id": "0000a1b2" + "cd" * 28,
+        }
+    )
+    data = [b"\x01"]
+    trans = asyncio.run(template.link_async(net=net, data=data))
+    assert trans.net is net
+    assert trans.ref_block_num == str(0xA1B2)
+    synced = template.link(net=tapos_net, data=data)
+    assert bytes(trans)[4:] == bytes(synced)[4:]  # but the expiration
+
+
 @pytest.fixture
 def trans_signed(action_clear, net):
     raw_trans = eospyo.Transaction(actions=[action_clear])
@@ -5,7 +5,7 @@ import datetime as dt
 import eospyo
 import pydantic
 import pytest
-from eospyo import types
+from eospyo import types, utils
 
 values = [
     (types.Bool, True, b"\x01"),
@@ -93,6 +93,45 @@ values = [
         "99 WAX",
         b"c\x00\x00\x00\x00\x00\x00\x00\x00WAX\x00\x00\x00\x00",
     ),
+    (types.Int16, -32768, b"\x00\x80"),
+    (types.Int16, -1, b"\xFF\xFF"),
+    (types.Int16, 32767, b"\xFF\x7F"),
+    (types.Int32, -2 ** 31, b"\x00\x00\x00\x80"),
+    (types.Int32, 2 ** 31 - 1, b"\xFF\xFF\xFF\x7F"),
+    (types.Int64, -1, b"\xFF" * 8),
+    (types.Int64, 2 ** 63 - 1, b"\xFF" * 7 + b"\x7F"),
+    (types.Uint128, 2 ** 128 - 1, b"\xFF" * 16),
+    (types.Uint128, 1, b"\x01" + b"\x00" * 15),
+    (types.Int128, -1, b"\xFF" * 16),
+    (types.Float32, 1.5, b"\x00\x00\xc0\x3f"),
+    (types.Float64, -2.0, b"\x00" * 7 + b"\xc0"),
+    (types.Checksum160, "ab" * 20, b"\xab" * 20),
+    (types.Checksum256, "ab" * 32, b"\xab" * 32),
+    (types.Checksum512, "ab" * 64, b"\xab" * 64),
+    (types.Float128, "00" * 14 + "ff3f", b"\x00" * 14 + b"\xff\x3f"),
+    (types.Varint32, 0, b"\x00"),
+    (types.Varint32, -1, b"\x01"),
+    (types.Varint32, 1, b"\x02"),
+    (types.Varint32, -(2**31), b"\xff\xff\xff\xff\x0f"),
+    (types.Varint32, 2**31 - 1, b"\xfe\xff\xff\xff\x0f"),
+    (
+        types.TimePoint,
+        dt.datetime(2021, 8, 26, 14, 1, 47, 500000),
+        b"\xe0\xa9\xc4\xce\x76\xca\x05\x00",
+    ),
+    (types.SymbolCode, "WAX", b"WAX\x00\x00\x00\x00\x00"),
+    (
+        types.BlockTimestamp,
+        dt.datetime(2021, 8, 30, 13, 3, 31, 500000),
+        b"G'\x7fQ",
+    ),
+    (
+        types.PublicKey,
+        "PUB_K1_6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5BoDq63",
+        b"\x00"
+        + bytes.fromhex("02c0ded2bc1f1305fb0faac5e6c03ee3a1")
+        + bytes.fromhex("924234985427b6167ca569d13df435cf"),
+    ),
 ]
 
 
@@ -112,6 +151,14 @@ def test_bytes_to_type(class_, input_, expected_output):
     assert new_instance == instance
 
 
+@pytest.mark.parametrize("class_,input_,expected_output", values)
+def test_from_buffer_reads_at_offset(class_, input_, expected_output):
+    buffer = memoryview(b"\xaa\xbb" + expected_output + b"\xcc")
+    instance, offset = class_.from_buffer(buffer, 2)
+    assert instance == class_(input_)
+    assert offset == 2 + len(expected_output)
+
+
 @pytest.mark.parametrize("class_,input_,expected_output", values)
 def test_size(class_, input_, expected_output):
     has_len = {
@@ -200,6 +247,9 @@ error_values = [
     (types.Name, "............z"),
     (types.Varuint32, -1),
     (types.Varuint32, 20989371980),
+    (types.Varint32, -(2**31) - 1),
+    (types.Varint32, 2**31),
+    (types.Checksum160, "ab" * 32),
     # utf 2 byte char
     (types.String, "µ"),
     (types.String, "aµ"),
@@ -272,6 +322,33 @@ def test_bytes_to_array(type_, input_, expected_output):
     assert array_from_bytes == array, f"{array=}; {array_from_bytes=}"
 
 
+@pytest.mark.parametrize("type_,input_,expected_output", array_values)
+def test_array_from_buffer_reads_at_offset(type_, input_, expected_output):
+    buffer = memoryview(b"\xaa" + expected_output + b"\xbb")
+    array, offset = types.Array.from_buffer(buffer, 1, type_)
+    assert array == types.Array(type_=type_, values=input_)
+    assert offset == 1 + len(expected_output)
+
+
+def test_array_of_strings_from_buffer():
+    array = types.Array(type_=types.String, values=["a", "", "bcd"])
+    array_from_bytes = types.Array.from_bytes(bytes(array), types.String)
+    assert array_from_bytes == array
+
+
+asset_values = [
+    ("0.0005 WAX", "0.0005 WAX"),
+    ("12.345 WAX", "12.345 WAX"),
+    ("1.00000000 WAX", "1.00000000 WAX"),
+]
+
+
+@pytest.mark.parametrize("input_,expected", asset_values)
+def test_asset_from_bytes_keeps_precision(input_, expected):
+    asset = types.Asset.from_bytes(bytes(types.Asset(input_)))
+    assert asset.value == expected
+
+
 @pytest.mark.parametrize("class_,input_", error_values)
 def test_array_validation_errors(class_, input_):
     with pytest.raises(pydantic.ValidationError):
@@ -313,6 +390,40 @@ def test_eosio_type_cannot_be_instantiated():
         types.EosioType()
 
 
+class LegacyUint16(types.EosioType):
+    """A type written before write and from_buffer existed."""
+
+    value: int
+
+    def __bytes__(self):
+        return self.value.to_bytes(2, "little")
+
+    @classmethod
+    def from_bytes(cls, bytes_):
+        return cls(int.from_bytes(bytes_[:2], "little"))
+
+
+def test_type_with_bytes_and_from_bytes_only_is_complete():
+    buffer = bytearray(b"\xff")
+    LegacyUint16(7).write(buffer)
+    assert buffer == b"\xff\x07\x00"
+    assert LegacyUint16.from_buffer(memoryview(buffer), 1) == (
+        LegacyUint16(7),
+        3,
+    )
+    array = types.Array(type_=LegacyUint16, values=[1, 2])
+    assert bytes(array) == b"\x02\x01\x00\x02\x00"
+    assert types.Array.from_bytes(bytes(array), LegacyUint16) == array
+
+
+def test_type_without_serialization_cannot_be_instantiated():
+    class Incomplete(types.EosioType):
+        value: int
+
+    with pytest.raises(TypeError):
+        Incomplete(1)
+
+
 def test_array_can_be_sliced_1():
     arr_full = types.Array(values=range(10), type_=types.Int8)
     arr_slice = types.Array(values=range(10)[1:4], type_=types.Int8)
@@ -323,3 +434,61 @@ def test_array_can_be_sliced_2():
     arr_full = types.Array(values=range(10), type_=types.Int8)
     arr_slice = types.Array(values=range(10)[8:3:-2], type_=types.Int8)
     assert arr_full[8:3:-2] == arr_slice
+
+
+@pytest.mark.parametrize("class_,input_,expected_output", values)
+def test_trusted_instance_serializes_as_validated(
+    class_, input_, expected_output
+):
+    validated = class_(input_)
+    trusted = class_.trusted(validated.value)
+    assert trusted == validated
+    assert bytes(trusted) == expected_output
+
+
+def test_trusted_skips_validation():
+    name = types.Name.trusted("A")
+    assert name.value == "A"
+
+
+@pytest.mark.parametrize("type_,input_,expected_output", array_values)
+def test_array_of_trusted_serializes_as_validated(
+    type_, input_, expected_output
+):
+    array = types.Array.of_trusted(type_, input_)
+    assert array == types.Array(type_=type_, values=input_)
+    assert bytes(array) == expected_output
+
+
+@pytest.mark.parametrize("class_,input_,expected_output", values)
+def test_write_appends_to_buffer(class_, input_, expected_output):
+    buffer = bytearray(b"\xAA")
+    class_(input_).write(buffer)
+    assert buffer == b"\xAA" + expected_output
+
+
+@pytest.mark.parametrize("value", [0, 127, 128, 2**14, 2**32, 20989371979])
+def test_write_varuint32_matches_varuint32_bytes(value):
+    buffer = bytearray()
+    types.write_varuint32(buffer, value)
+    assert buffer == bytes(types.Varuint32(value))
+
+
+def test_legacy_public_key_serializes_as_pub_k1():
+    legacy = "EOS6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV"
+    pub_k1 = "PUB_K1_6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5BoDq63"
+    assert bytes(types.PublicKey(legacy)) == bytes(types.PublicKey(pub_k1))
+
+
+def test_signature_round_trip():
+    key = utils.PrivateKey.from_scalar(12345)
+    signature = utils.sign_bytes(bytes_=b"x", key=key)
+    bytes_ = bytes(types.Signature(signature))
+    assert len(bytes_) == 66
+    assert types.Signature.from_bytes(bytes_).value == signature
+
+
+def test_public_key_with_wrong_checksum_raises_value_error():
+    key = "PUB_K1_6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5BoDq64"
+    with pytest.raises(ValueError):
+        bytes(types.PublicKey(key))
@@ -1,3 +1,5 @@
+import hashlib
+
 import pytest
 
 import eospyo
@@ -37,3 +39,162 @@ bogus_private_key = ["", "a", "a" * 100, "a" * 1000]
 def test_sign_bytes_with_improper_key_format(key):
     with pytest.raises(ValueError):
         eospyo.utils.sign_bytes(bytes_=b"a", key=key)
+
+
+scalars = [1, 2, 15, 16, 17, 2**128 + 1, eospyo.utils.N - 1, eospyo.utils.N]
+
+
+@pytest.mark.parametrize("scalar", scalars)
+def test_fixed_base_multiply_matches_double_and_add(scalar):
+    expected = eospyo.utils._fast_multiply(eospyo.utils.G, scalar)
+    assert eospyo.utils._fixed_base_multiply(scalar) == expected
+
+
+def test_private_key_derives_public_key():
+    key = eospyo.utils.PrivateKey(
+        "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+    )
+    expected = "EOS6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV"
+    assert key.public_key == expected
+
+
+def test_private_key_repr_does_not_show_the_secret():
+    wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+    key = eospyo.utils.PrivateKey(wif)
+    assert wif not in repr(key)
+
+
+@pytest.mark.parametrize("input_,key,expected", input_key_expected)
+def test_sign_bytes_with_private_key_object(input_, key, expected):
+    private_key = eospyo.utils.PrivateKey(key)
+    output = eospyo.utils.sign_bytes(bytes_=input_, key=private_key)
+    assert output == expected
+
+
+@pytest.mark.parametrize("key", bogus_private_key)
+def test_private_key_with_improper_key_format(key):
+    with pytest.raises(ValueError):
+        eospyo.utils.PrivateKey(key)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sign_many_returns_signatures_in_input_order(workers):
+    key = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+    bytes_list = [input_ for input_, k, _ in input_key_expected if k == key]
+    expected = [e for _, k, e in input_key_expected if k == key]
+    output = eospyo.utils.sign_many(
+        bytes_list=bytes_list, key=key, workers=workers
+    )
+    assert output == expected
+
+
+def test_signer_pool_is_reused_across_batches():
+    key = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+    bytes_list = [input_ for input_, k, _ in input_key_expected if k == key]
+    expected = [e for _, k, e in input_key_expected if k == key]
+    with eospyo.utils.SignerPool(key, workers=2) as pool:
+        executor = pool._executor
+        assert pool.sign_many(bytes_list) == expected
+        output = eospyo.utils.sign_many(bytes_list=bytes_list, key=pool)
+        assert output == expected
+        assert pool._executor is executor
+    assert pool._executor is None
+
+
+def test_sign_many_with_empty_message_raise_value_error():
+    key = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+    with pytest.raises(ValueError):
+        eospyo.utils.sign_many(bytes_list=[b"a", b""], key=key, workers=2)
+
+
+codec_values = [
+    (0, 256, 0, b""),
+    (0, 256, 4, b"\x00\x00\x00\x00"),
+    (1, 256, 0, b"\x01"),
+    (2**64 - 1, 256, 10, b"\x00\x00" + b"\xff" * 8),
+    (0, 58, 0, ""),
+    (57, 58, 3, "11z"),
+    (58, 58, 0, "21"),
+    (255, 16, 4, "00ff"),
+    (5, 2, 0, "101"),
+]
+
+
+@pytest.mark.parametrize("value,base,minlen,encoded", codec_values)
+def test_encode(value, base, minlen, encoded):
+    assert eospyo.utils._encode(value, base, minlen) == encoded
+
+
+@pytest.mark.parametrize("value,base,minlen,encoded", codec_values)
+def test_decode(value, base, minlen, encoded):
+    assert eospyo.utils._decode(encoded, base) == value
+
+
+def test_decode_with_invalid_character_raises_value_error():
+    with pytest.raises(ValueError):
+        eospyo.utils._decode("0OIl", 58)
+
+
+@pytest.mark.parametrize("key", [k for _, k, _ in input_key_expected])
+def test_b58check_round_trip(key):
+    bin_ = eospyo.utils._b58check_to_bin(key)
+    assert eospyo.utils._bin_to_b58check(bin_, magicbyte=0x80) == key
+
+
+@pytest.mark.parametrize("input_,key,signature", input_key_expected)
+def test_recover_public_key(input_, key, signature):
+    digest = hashlib.sha256(input_).digest()
+    public_key = eospyo.utils.recover_public_key(
+        digest=digest, signature=signature
+    )
+    assert public_key == eospyo.utils.PrivateKey(key).public_key
+
+
+@pytest.mark.parametrize("input_,key,signature", input_key_expected)
+def test_verify(input_, key, signature):
+    digest = hashlib.sha256(input_).digest()
+    public_key = eospyo.utils.PrivateKey(key).public_key
+    assert eospyo.utils.verify(
+        digest=digest, signature=signature, public_key=public_key
+    )
+
+
+@pytest.mark.parametrize("input_,key,signature", input_key_expected)
+def test_verify_with_other_digest_is_false(input_, key, signature):
+    digest = hashlib.sha256(input_ + b"x").digest()
+    public_key = eospyo.utils.PrivateKey(key).public_key
+    assert not eospyo.utils.verify(
+        digest=digest, signature=signature, public_key=public_key
+    )
+
+
+def test_verify_with_pub_k1_public_key():
+    digest = hashlib.sha256(b"a").digest()
+    signature = input_key_expected[0][2]
+    public_key = "PUB_K1_6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5BoDq63"
+    assert eospyo.utils.verify(
+        digest=digest, signature=signature, public_key=public_key
+    )
+
+
+bogus_signatures = ["", "SIG_K1_", "SIG_R1_abc", input_key_expected[0][2][:-1]]
+
+
+@pytest.mark.parametrize("signature", bogus_signatures)
+def test_recover_public_key_with_bogus_signature(signature):
+    digest = hashlib.sha256(b"a").digest()
+    with pytest.raises(ValueError):
+        eospyo.utils.recover_public_key(digest=digest, signature=signature)
+
+
+def test_sign_digest_matches_sign_bytes():
+    key = "5HsVgxhxdL9gvgcAAyCZSWNgtLxAhGfEX2YU98w6QSkePoVvPNK"
+    digest = hashlib.sha256(b"a").digest()
+    signature = eospyo.utils.sign_digest(digest=digest, key=key)
+    assert signature == eospyo.utils.sign_bytes(bytes_=b"a", key=key)
+
+
+def test_sign_digest_requires_32_bytes():
+    key = "5HsVgxhxdL9gvgcAAyCZSWNgtLxAhGfEX2YU98w6QSkePoVvPNK"
+    with pytest.raises(ValueError):
+        eospyo.utils.sign_digest(digest=b"a", key=key)